@@ -7,9 +7,12 @@ import numpy as np
 from pupil_apriltags import Detector
 
 from src.apriltags.utils.fmap_parser import load_fmap_file
+from src.object_detection.src.devices.utils.cameras.frame import Frame
+from src.object_detection.src.devices.utils.frame_bus import FrameBusReader
 from src.webui.web_server import EagleEyeInterface
 
 VIDEO_PATH = "E:/Ceph-Mirror/Python-Files/Projects/FIRST-Note-Detection/src/apriltags/pre-processing/ai_accelleration/test.mp4"  # Set your video file path here
+FRAME_BUS_CAMERA_NAME = None  # Set to a camera name to share its published frames
 
 
 def load_camera_parameters(json_path: str) -> tuple[np.ndarray, np.ndarray]:
@@ -50,24 +53,49 @@ def main() -> None:
 
     detector = Detector(families="tag36h11")
 
-    video_capture = cv2.VideoCapture(video_path)
-    if not video_capture.isOpened():
-        raise RuntimeError(f"Could not open video: {video_path}")
-
-    fps = video_capture.get(cv2.CAP_PROP_FPS)
-    if not fps or fps <= 0:
-        fps = 30.0
-    frame_interval = 1.0 / fps
-
+    frame_bus_reader = None
+    video_capture = None
+    if FRAME_BUS_CAMERA_NAME is not None:
+        frame_bus_reader = FrameBusReader.connect(FRAME_BUS_CAMERA_NAME)
+        if frame_bus_reader is None:
+            raise RuntimeError(f"No frame bus for camera: {FRAME_BUS_CAMERA_NAME}")
+        frame_interval = 0.0
+    else:
+        video_capture = cv2.VideoCapture(video_path)
+        if not video_capture.isOpened():
+            raise RuntimeError(f"Could not open video: {video_path}")
+
+        fps = video_capture.get(cv2.CAP_PROP_FPS)
+        if not fps or fps <= 0:
+            fps = 30.0
+        frame_interval = 1.0 / fps
+
+    last_sequence_number = 0
     try:
         while True:
-            ret, frame = video_capture.read()
-            if not ret:
-                video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                continue
+            if frame_bus_reader is not None:
+                if frame_bus_reader.is_closed():
+                    frame_bus_reader.close()
+                    frame_bus_reader = FrameBusReader.connect(FRAME_BUS_CAMERA_NAME)
+                    if frame_bus_reader is None:
+                        raise RuntimeError(
+                            f"No frame bus for camera: {FRAME_BUS_CAMERA_NAME}"
+                        )
+                    last_sequence_number = 0
+                current_frame = frame_bus_reader.wait_for_frame(last_sequence_number)
+                if current_frame is None:
+                    continue
+            else:
+                ret, image = video_capture.read()
+                if not ret:
+                    video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                current_frame = Frame(image, video_path, last_sequence_number + 1)
+            last_sequence_number = current_frame.sequence_number
+            frame = current_frame.image
             start_time = time.time()
 
-            gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            gray_frame = current_frame.get_grayscale()
             detected_tags = detector.detect(gray_frame)
 
             display_frame = frame.copy()
@@ -140,7 +168,10 @@ def main() -> None:
     except KeyboardInterrupt:
         print("Exiting EagleEye Apriltag runner.")
     finally:
-        video_capture.release()
+        if frame_bus_reader is not None:
+            frame_bus_reader.close()
+        if video_capture is not None:
+            video_capture.release()
         cv2.destroyAllWindows()
 
 
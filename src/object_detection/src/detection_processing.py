@@ -0,0 +1,160 @@
+import struct
+
+import numpy as np
+from networktables import NetworkTable
+from ultralytics.engine.results import Results
+
+from src.constants.constants import constants
+from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.cameras.frame import Frame
+from src.math_conversions import (
+    calculate_local_position,
+    calculate_local_positions_from_normalized,
+    convert_to_global_position,
+    pixels_to_degrees,
+    rotate_boxes,
+    undistort_points,
+)
+
+
+def get_robot_pose(advantage_kit_nt: NetworkTable) -> np.ndarray:
+    """
+    Reads the robot's odometry pose published by AdvantageKit.
+
+    Args:
+        advantage_kit_nt (NetworkTable): The AdvantageKit table.
+
+    Returns:
+        np.ndarray: The robot pose as [x, y, rotation].
+    """
+    return np.array(
+        struct.unpack(
+            "ddd",
+            advantage_kit_nt.getValue(
+                "RealOutputs/Odometry/Robot", np.array([0, 0, 0])
+            ),
+        )
+    )
+
+
+def calculate_undistorted_geometry(
+    camera: Camera, frame: Frame, boxes_xyxy: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes yaw angles and ground positions of all boxes using the camera's lens calibration.
+
+    Args:
+        camera (Camera): The calibrated camera the frame came from.
+        frame (Frame): The frame the boxes were detected in.
+        boxes_xyxy (np.ndarray): Upright boxes with shape (N, 4) as [x1, y1, x2, y2].
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Yaw angles in degrees with shape (N,) and
+            local positions with shape (N, 2).
+    """
+    bottom_center_points = np.stack(
+        [(boxes_xyxy[:, 0] + boxes_xyxy[:, 2]) / 2, boxes_xyxy[:, 3]], axis=1
+    )
+    normalized_points = undistort_points(
+        bottom_center_points,
+        frame.source_resolution,
+        camera.frame_rotation,
+        camera.get_camera_matrix(frame.source_resolution),
+        camera.get_distortion_coefficients(),
+    )
+    yaw_angles = np.degrees(np.arctan(normalized_points[:, 0]))
+    local_positions = calculate_local_positions_from_normalized(
+        normalized_points, camera.get_camera_offset_pos()
+    )
+    return yaw_angles, local_positions
+
+
+def process_detections(
+    results: Results,
+    frame_size: tuple[int, int],
+    frame: Frame,
+    camera: Camera,
+    class_names: dict[int, str],
+    robot_pose: np.ndarray,
+    log: callable,
+) -> list[dict]:
+    """
+    Turns a detection result into positioned game piece detections.
+
+    Args:
+        results (Results): The detection result for the frame.
+        frame_size (tuple[int, int]): The (width, height) the boxes refer to.
+        frame (Frame): The frame the boxes were detected in.
+        camera (Camera): The camera the frame came from.
+        class_names (dict[int, str]): Class IDs to class names.
+        robot_pose (np.ndarray): The robot pose as [x, y, rotation].
+        log (callable): A callable logger function.
+
+    Returns:
+        list[dict]: One dictionary per detection within the maximum distance.
+    """
+    boxes_xyxy = results.boxes.xyxy.cpu().numpy()
+    if frame.rotation:
+        boxes_xyxy, frame_size = rotate_boxes(boxes_xyxy, frame_size, frame.rotation)
+
+    undistorted_yaw_angles, undistorted_local_positions = (
+        calculate_undistorted_geometry(camera, frame, boxes_xyxy)
+        if camera.has_intrinsics()
+        else (None, None)
+    )
+
+    detections = []
+    for box_index, (box, box_xyxy) in enumerate(zip(results.boxes, boxes_xyxy)):
+        box_class = class_names[int(box.cls[0])]
+        box_confidence = box.conf.tolist()[0]
+        box_lx, box_top_y, box_rx, box_bottom_center_y = box_xyxy.tolist()
+
+        box_width = box_rx - box_lx
+        box_height = box_bottom_center_y - box_top_y
+        box_ratio = box_width / box_height
+
+        box_bottom_center_x = (box_lx + box_rx) / 2
+
+        if undistorted_local_positions is not None:
+            yaw_angle = float(undistorted_yaw_angles[box_index])
+            object_local_position = undistorted_local_positions[box_index]
+        else:
+            # make pixel positions relative to the center
+            box_bottom_center_x -= frame_size[0] // 2
+            box_bottom_center_y -= frame_size[1] // 2
+            box_bottom_center_y = -box_bottom_center_y
+
+            yaw_angle = pixels_to_degrees(
+                box_bottom_center_x,
+                frame_size[0],
+                float(camera.get_fov()[0]),
+                log,
+            )
+            object_local_position = calculate_local_position(
+                np.array([box_bottom_center_x, box_bottom_center_y]),
+                frame_size,
+                camera.get_fov(),
+                camera.get_camera_offset_pos(),
+                log,
+            )
+        object_global_position = convert_to_global_position(
+            object_local_position, robot_pose
+        )
+
+        distance = np.linalg.norm(object_local_position)
+        if distance > constants["ObjectDetectionConstants.max_distance"]:
+            continue
+
+        detections.append(
+            {
+                "class": box_class,
+                "confidence": box_confidence,
+                "yaw_angle": yaw_angle,
+                "local_position": object_local_position,
+                "global_position": object_global_position,
+                "distance": distance,
+                "ratio": box_ratio,
+                "box": box_xyxy,
+            }
+        )
+    return detections
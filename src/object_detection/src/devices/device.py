@@ -3,6 +3,29 @@ from importlib import import_module
 from networktables import NetworkTable
 from src.devices.utils.cameras.camera import Camera
 
+
+def create_camera(camera_data: dict, log: callable) -> Camera:
+    """
+    Instantiates the Camera subclass named by the camera data's "camera_type"
+
+    Args:
+        camera_data (dict): A dictionary containing camera data.
+            Must contain the key "camera_type", e.g. "physical_camera".
+        log (callable): A callable logger function.
+
+    returns:
+        Camera: The started camera object.
+    """
+    camera_type = camera_data["camera_type"]
+
+    module_path = f"src.devices.utils.cameras.{camera_type}"
+    module = import_module(module_path)
+    class_name = "".join(part.capitalize() for part in camera_type.split("_"))
+    camera_class = getattr(module, class_name)
+
+    return camera_class(camera_data, log)
+
+
 class Device:
     def __init__(
         self,
@@ -49,14 +72,7 @@ class Device:
         returns:
             Camera: The camera object that was added.
         """
-        camera_type = camera_data["camera_type"]
-
-        module_path = f"src.devices.utils.cameras.{camera_type}"
-        module = import_module(module_path)
-        class_name = "".join(part.capitalize() for part in camera_type.split("_"))
-        camera_class = getattr(module, class_name)
-
-        camera_object = camera_class(camera_data, self.log)
+        camera_object = create_camera(camera_data, self.log)
 
         self.log(f"Adding camera {camera_data['name']} of type: {camera_object.type}")
 
@@ -88,7 +104,7 @@ class Device:
         """
         return self.cameras
 
-    def detect(self) -> tuple:
+    def detect(self, robot_pose=None) -> tuple:
         """
         This should be overridden by any subclass that implements
         actual detection logic.
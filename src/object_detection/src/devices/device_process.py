@@ -0,0 +1,459 @@
+import multiprocessing
+import queue
+from multiprocessing.synchronize import Event
+from time import sleep, time
+
+import numpy as np
+from networktables import NetworkTables
+
+from src.constants.constants import constants
+from src.detection_processing import get_robot_pose, process_detections
+from src.devices.simple_device import SimpleDevice
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.frame_bus import FrameBusReader, FrameBusWriter
+from src.math_conversions import get_rotation_matrix
+from src.utils.latency_governor import create_latency_governor
+from src.utils.power_mode_manager import PowerModeManager
+from src.utils.annotation_renderer import AnnotationRenderer
+
+MESSAGE_QUEUE_SIZE = 32
+READY_TIMEOUT = 120.0
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+MAX_RESTARTS = 10
+STABLE_RUN_TIME = 60.0
+
+
+def _create_queue_log(message_queue: multiprocessing.Queue) -> callable:
+    """
+    Build a log function that forwards messages to the parent process.
+
+    Messages are dropped while the queue is full, so logging never stalls
+    the detection loop behind a busy parent.
+
+    Args:
+        message_queue (multiprocessing.Queue): The worker's outgoing message queue.
+
+    Returns:
+        callable: A function with the same signature as `Logger.log`.
+    """
+
+    def log(message, force_log=False, force_no_log=False) -> None:
+        if force_no_log:
+            return
+        try:
+            message_queue.put_nowait(("log", str(message), force_log))
+        except queue.Full:
+            pass
+
+    return log
+
+
+def _get_preview_bus_name(camera_name: str) -> str:
+    """
+    Returns the name of the frame bus carrying a camera's annotated previews.
+
+    Args:
+        camera_name (str): The name of the camera.
+    """
+    return f"preview {camera_name}"
+
+
+def _publish_preview(
+    preview_writers: dict[str, FrameBusWriter],
+    camera_name: str,
+    image: np.ndarray,
+    sequence_number: int,
+) -> None:
+    """
+    Publish an annotated preview on its camera's frame bus, creating the bus first.
+
+    Args:
+        preview_writers (dict[str, FrameBusWriter]): The worker's buses per camera.
+        camera_name (str): The name of the camera.
+        image (np.ndarray): The annotated preview.
+        sequence_number (int): The sequence number of the previewed frame.
+    """
+    preview_writer = preview_writers.get(camera_name)
+    if preview_writer is None:
+        preview_writer = FrameBusWriter(
+            _get_preview_bus_name(camera_name), image.nbytes
+        )
+        preview_writers[camera_name] = preview_writer
+    preview_writer.publish(
+        Frame(
+            image=image,
+            camera_name=camera_name,
+            sequence_number=sequence_number,
+            source_resolution=(image.shape[1], image.shape[0]),
+        )
+    )
+
+
+def run_device_worker(
+    device_type: str,
+    model_path: str,
+    camera_list: list[dict],
+    device_index: int,
+    message_queue: multiprocessing.Queue,
+    stop_event: Event,
+    frame_wanted_event: Event,
+    client_overlays_event: Event,
+) -> None:
+    """
+    Run one device's detection loop and send its detections to the parent process.
+
+    The worker connects to NetworkTables itself so it can read odometry, follow
+    active camera changes and power mode changes without going through the parent.
+    Annotated previews are published on a frame bus per camera, so the detections
+    message only flags that a new one is there instead of pickling the image.
+
+    Args:
+        device_type (str): The type of device ("gpu", "cpu", or "tpu").
+        model_path (str): The path to the YOLO model file.
+        camera_list (list[dict]): Camera data of every camera on this device.
+        device_index (int): The index of the device.
+        message_queue (multiprocessing.Queue): Where logs and detections are sent.
+        stop_event (Event): Set by the parent to stop the worker.
+        frame_wanted_event (Event): Set by the parent while a web client waits for a
+            new annotated frame; cleared by the worker once it sent one.
+        client_overlays_event (Event): Set by the parent while the web interface
+            draws overlays in the browser, so the worker sends raw frames.
+    """
+    log = _create_queue_log(message_queue)
+    NetworkTables.initialize(server=constants["NetworkTableConstants.server_address"])
+    eagle_eye_nt = NetworkTables.getTable("EagleEye")
+    advantage_kit_nt = NetworkTables.getTable("AdvantageKit")
+
+    device = SimpleDevice(device_type, model_path, log, eagle_eye_nt, device_index)
+    for camera_data in camera_list:
+        device.add_camera(camera_data)
+    power_mode_manager = None
+    if constants["PowerModeConstants.power_modes"]:
+        power_mode_manager = PowerModeManager(
+            NetworkTables.getTable("FMSInfo"),
+            constants["PowerModeConstants.profiles"] or {},
+            log,
+        )
+        power_mode_manager.add_listener(
+            lambda _, profile: device.apply_power_profile(profile)
+        )
+    latency_governor = create_latency_governor(
+        constants["LatencyGovernorConstants"],
+        constants["ObjectDetectionConstants.input_size"],
+        log,
+        eagle_eye_nt,
+        device_index,
+        device.has_dynamic_input_size(),
+    )
+    if latency_governor is not None:
+        device.use_latency_governor(latency_governor)
+    message_queue.put(("ready", dict(device.get_class_names())))
+
+    run_web_server = constants["DisplayConstants.run_web_server"]
+    estimated_fps = 0.0
+    start_time = 0.0
+    annotation_renderer = AnnotationRenderer()
+    preview_writers: dict[str, FrameBusWriter] = {}
+    try:
+        while not stop_event.is_set():
+            if power_mode_manager is not None:
+                power_mode_manager.wait_for_next_frame(start_time)
+            start_time = time()
+            robot_pose = get_robot_pose(advantage_kit_nt)
+            results, frame_size, frame = device.detect(robot_pose)
+            if results is None:
+                sleep(0.002)
+                continue
+
+            camera = device.get_current_camera()
+            detections = (
+                process_detections(
+                    results,
+                    frame_size,
+                    frame,
+                    camera,
+                    device.get_class_names(),
+                    robot_pose,
+                    log,
+                )
+                if results.boxes
+                else []
+            )
+            has_preview = False
+            if run_web_server and frame_wanted_event.is_set():
+                frame_wanted_event.clear()
+                annotated_image = (
+                    annotation_renderer.render_raw(frame, frame.rotation)
+                    if client_overlays_event.is_set()
+                    else annotation_renderer.render(
+                        frame=frame,
+                        results=results,
+                        fps=estimated_fps,
+                        detections=detections,
+                        rotation=frame.rotation,
+                    )
+                )
+                _publish_preview(
+                    preview_writers,
+                    camera.get_name(),
+                    annotated_image,
+                    frame.sequence_number,
+                )
+                has_preview = True
+
+            try:
+                message_queue.put_nowait(
+                    (
+                        "detections",
+                        camera.get_name(),
+                        detections,
+                        has_preview,
+                        (
+                            frame.sequence_number,
+                            get_rotation_matrix(frame_size, frame.rotation)[1],
+                            estimated_fps,
+                        ),
+                    )
+                )
+            except queue.Full:
+                log(f"Dropped detections of {camera.get_name()}, parent is behind")
+
+            latency_ms = (time() - start_time) * 1000
+            estimated_fps = 1000 / max(latency_ms, 1e-3)
+
+    finally:
+        for preview_writer in preview_writers.values():
+            preview_writer.close()
+
+
+class DeviceProcess:
+    """Runs a SimpleDevice and its cameras in a dedicated worker process."""
+
+    def __init__(
+        self,
+        device_type: str,
+        model_path: str,
+        camera_list: list[dict],
+        log: callable,
+        device_index: int = 0,
+    ):
+        """
+        Initializes the DeviceProcess without starting it.
+
+        :param device_type: The type of device ("gpu", "cpu", or "tpu").
+        :param model_path: The path to the YOLO model file.
+        :param camera_list: Camera data of every camera on this device.
+        :param log: A callable logger function.
+        :param device_index: The index of the device, in case of multiple devices.
+        """
+        self.device_type = device_type
+        self.model_path = model_path
+        self.camera_list = camera_list
+        self.log = log
+        self.device_index = device_index
+
+        self.context = multiprocessing.get_context("spawn")
+        self.process: multiprocessing.Process | None = None
+        self.message_queue: multiprocessing.Queue | None = None
+        self.stop_event = self.context.Event()
+        self.frame_wanted_event = self.context.Event()
+        self.client_overlays_event = self.context.Event()
+        self.class_names: dict[int, str] = {}
+        self.preview_readers: dict[str, FrameBusReader] = {}
+        self.restart_count = 0
+        self.start_time = 0.0
+        self.given_up = False
+        self.stopping = False
+
+    def start(self) -> None:
+        """Start the worker process."""
+        self.stop_event.clear()
+        self.message_queue = self.context.Queue(MESSAGE_QUEUE_SIZE)
+        self.process = self.context.Process(
+            target=run_device_worker,
+            args=(
+                self.device_type,
+                self.model_path,
+                self.camera_list,
+                self.device_index,
+                self.message_queue,
+                self.stop_event,
+                self.frame_wanted_event,
+                self.client_overlays_event,
+            ),
+            name=f"device_{self.device_index}",
+            daemon=True,
+        )
+        self.process.start()
+        self.start_time = time()
+        self.log(f"Started device:{self.device_index} worker process")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Ask the worker to stop, terminating it if it does not exit in time.
+
+        Args:
+            timeout (float): Seconds to wait for a clean exit.
+        """
+        self.stopping = True
+        self.stop_event.set()
+        if self.process is None:
+            return
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.log(f"Device:{self.device_index} worker did not stop, terminating")
+            self.process.terminate()
+            self.process.join()
+        for preview_reader in self.preview_readers.values():
+            preview_reader.close()
+        self.preview_readers.clear()
+
+    def restart(self) -> bool:
+        """
+        Replace a crashed worker with a fresh one.
+
+        The delay doubles with every restart in a row, up to `MAX_RESTART_DELAY`,
+        and after `MAX_RESTARTS` the worker is given up on. A worker that ran
+        for `STABLE_RUN_TIME` before crashing starts a new series.
+
+        Returns:
+            bool: True if the worker was restarted.
+        """
+        if self.given_up:
+            return False
+        if time() - self.start_time >= STABLE_RUN_TIME:
+            self.restart_count = 0
+        if self.restart_count >= MAX_RESTARTS:
+            self.given_up = True
+            self.log(
+                f"Device:{self.device_index} worker crashed {MAX_RESTARTS} times in "
+                "a row, not restarting it again"
+            )
+            return False
+        self.restart_count += 1
+        self.log(
+            f"Device:{self.device_index} worker exited with code "
+            f"{self.process.exitcode}, restarting (restart {self.restart_count})"
+        )
+        sleep(min(RESTART_DELAY * 2 ** (self.restart_count - 1), MAX_RESTART_DELAY))
+        self.start()
+        return True
+
+    def is_alive(self) -> bool:
+        """
+        Returns whether the worker process is running
+        """
+        return self.process is not None and self.process.is_alive()
+
+    def wait_until_ready(self, timeout: float = READY_TIMEOUT) -> bool:
+        """
+        Wait until the worker has loaded its model and cameras.
+
+        Args:
+            timeout (float): Seconds to wait.
+
+        Returns:
+            bool: True if the worker reported ready in time.
+        """
+        deadline = time() + timeout
+        while not self.class_names and time() < deadline:
+            self.receive(timeout=0.1)
+        return bool(self.class_names)
+
+    def receive(
+        self, timeout: float = 1.0
+    ) -> tuple[str, list[dict], np.ndarray | None, tuple] | None:
+        """
+        Receive the next detections from the worker, handling logs along the way.
+
+        A worker that died unexpectedly is restarted, with a growing delay and
+        only up to `MAX_RESTARTS` times in a row.
+
+        Args:
+            timeout (float): Seconds to wait for a message.
+
+        Returns:
+            tuple | None: The camera name, its detections, the annotated image
+                (None when no web client wants one) and the frame's sequence number,
+                upright (width, height) and detection rate, or None if nothing arrived.
+        """
+        if not self.is_alive() and not self.stopping and not self.restart():
+            sleep(timeout)
+            return None
+
+        try:
+            message = self.message_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        message_type = message[0]
+        if message_type == "log":
+            self.log(message[1], force_log=message[2])
+            return None
+        if message_type == "ready":
+            self.class_names = message[1]
+            self.log(f"Device:{self.device_index} worker ready")
+            return None
+        camera_name = message[1]
+        annotated_image = self._read_preview(camera_name) if message[3] else None
+        return camera_name, message[2], annotated_image, message[4]
+
+    def _read_preview(self, camera_name: str) -> np.ndarray | None:
+        """
+        Read a camera's newest annotated preview from the worker's frame bus.
+
+        The worker creates the bus with its first preview and replaces it when
+        previews grow or the worker restarts, so a closed bus is reattached.
+
+        Args:
+            camera_name (str): The name of the camera.
+
+        Returns:
+            np.ndarray | None: A copy of the preview, or None if there is none.
+        """
+        preview_reader = self.preview_readers.get(camera_name)
+        if preview_reader is not None and preview_reader.is_closed():
+            self.preview_readers.pop(camera_name).close()
+            preview_reader = None
+        if preview_reader is None:
+            try:
+                preview_reader = FrameBusReader(
+                    _get_preview_bus_name(camera_name), shares_resource_tracker=True
+                )
+            except FileNotFoundError:
+                return None
+            self.preview_readers[camera_name] = preview_reader
+
+        preview = preview_reader.read_latest(copy=True)
+        return preview.image if preview is not None else None
+
+    def set_frame_wanted(self, frame_wanted: bool) -> None:
+        """
+        Tell the worker whether the web interface wants a new annotated frame.
+
+        Args:
+            frame_wanted (bool): True to have the next detections carry an image.
+        """
+        if frame_wanted:
+            self.frame_wanted_event.set()
+        else:
+            self.frame_wanted_event.clear()
+
+    def set_client_overlays(self, client_overlays: bool) -> None:
+        """
+        Tell the worker whether the web interface draws overlays in the browser.
+
+        Args:
+            client_overlays (bool): True to have the worker send raw frames.
+        """
+        if client_overlays:
+            self.client_overlays_event.set()
+        else:
+            self.client_overlays_event.clear()
+
+    def get_class_names(self) -> dict[int, str]:
+        """
+        Returns the class IDs to names mapping reported by the worker.
+        """
+        return self.class_names
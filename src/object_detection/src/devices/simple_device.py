@@ -1,13 +1,29 @@
+import threading
+from time import time
+
+import numpy as np
 from line_profiler import profile
-from numpy import ndarray
 from ultralytics import YOLO
 from networktables import NetworkTable
 from ultralytics.engine.results import Results
 
 from src.constants.constants import constants
 from src.devices.device import Device
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.grid_gate import GridGate
+from src.devices.utils.model_cascade import ModelCascade
+from src.devices.utils.motion_gate import MotionGate
+from src.utils.latency_governor import LatencyGovernor
+from src.utils.results_merging import (
+    create_empty_results,
+    merge_results,
+    remove_cut_boxes,
+    shift_results,
+)
 
 ObjectDetectionConstants = constants["ObjectDetectionConstants"]
+DYNAMIC_MODEL_SUFFIXES = (".pt", ".yaml", ".yml")
 
 
 class SimpleDevice(Device):
@@ -45,6 +61,47 @@ class SimpleDevice(Device):
         self.log(f"Loading model from {model_path} on device {self.device_type}")
         self.model = YOLO(model_path, task="detect")
         self.log(f"Model loaded from {model_path}")
+        self.model_path = model_path
+        self.active_model_path = model_path
+        self.models: dict[str, YOLO] = {model_path: self.model}
+
+        self.last_sequence_numbers: dict[str, int] = {}
+        self.motion_gate: MotionGate | None = None
+        if ObjectDetectionConstants.get("motion_gating", False):
+            self.motion_gate = MotionGate(
+                ObjectDetectionConstants.get("motion_threshold", 4.0),
+                ObjectDetectionConstants.get("motion_pose_threshold", 0.02),
+                ObjectDetectionConstants.get("motion_rotation_threshold", 1.0),
+                ObjectDetectionConstants.get("motion_refresh_interval", 1.0),
+            )
+        self.last_detections: dict[str, tuple[Results, tuple[int, int]]] = {}
+        self.model_cascade: ModelCascade | None = None
+        if ObjectDetectionConstants.get("cascade_model_path"):
+            self.model_cascade = ModelCascade(
+                ObjectDetectionConstants["cascade_model_path"],
+                ObjectDetectionConstants.get(
+                    "cascade_thresholds", {"default": {"low": 0.2, "high": 0.5}}
+                ),
+                self.log,
+                ObjectDetectionConstants.get("cascade_crop_padding", 0.5),
+                ObjectDetectionConstants.get("cascade_min_crop_size", 64),
+                ObjectDetectionConstants.get("cascade_input_size", 256),
+                ObjectDetectionConstants.get("cascade_lost_frames", 3),
+            )
+        self.grid_gate: GridGate | None = None
+        if ObjectDetectionConstants.get("grid_gate_model_path"):
+            self.grid_gate = GridGate(
+                ObjectDetectionConstants["grid_gate_model_path"],
+                ObjectDetectionConstants.get("grid_gate_threshold", 0.3),
+                ObjectDetectionConstants.get("grid_gate_padding", 16),
+                ObjectDetectionConstants.get("grid_gate_min_region_size", 96),
+            )
+        self.input_size: int | None = None
+        self.governor_input_size: int | None = None
+        self.confidence_threshold: float | None = None
+        self.power_profile_lock = threading.Lock()
+        self.pending_power_profile: dict | None = None
+        self.latency_governor: LatencyGovernor | None = None
 
     def _change_camera(self, table, key, value, _) -> None:
         """
@@ -55,20 +112,56 @@ class SimpleDevice(Device):
             self.set_camera(value)
 
     @profile
-    def detect(self) -> tuple[None, None, None] | tuple[Results, tuple[int, int], ndarray]:
+    def detect(
+        self, robot_pose: np.ndarray | None = None
+    ) -> tuple[None, None, None] | tuple[Results, tuple[int, int], Frame]:
         """
         Captures a frame from the active camera and runs YOLO detection using the configured device.
 
+        Frames whose sequence number has already been processed are skipped so
+        that sources which repeat their latest frame are not re-inferred. Cameras
+        with a horizon crop only send the rows that can contain a piece in range,
+        and cameras with far field tiling add native resolution tiles of the
+        distant floor to the same batch. Tile boxes cut by a tile's inner edge are
+        dropped, boxes are moved back to full frame coordinates and duplicates
+        across passes are suppressed.
+
+        With motion gating enabled, a frame that barely differs from the last
+        inferred one while the robot stands still reuses that frame's result.
+
+        With a cascade model configured, the model runs at the cascade's lowest
+        confidence and only uncertain, ambiguous or recently lost boxes are
+        re-scored by the larger model.
+
+        With a grid gate configured, a small occupancy CNN picks the regions the
+        model runs on, and frames without any occupied cell skip the model.
+
+        With a latency governor in use, every frame the model ran on reports the
+        time from receiving the frame to the final result, and the governor's
+        rung changes are applied right away. Reused results report nothing.
+
+        :param robot_pose: The robot pose as [x, y, rotation], used by motion gating.
+
         Returns:
             tuple: A tuple containing:
                 - detection_result: The first element of the YOLO prediction output.
                 - frame_size (tuple): A tuple (width, height) representing the frame size.
-                - frame (numpy.ndarray): The captured frame.
+                - frame (Frame): The captured frame and its metadata.
         """
+        self._apply_pending_power_profile()
         camera = self.get_current_camera()
         frame = camera.get_frame()
-        if frame is None:
+        if frame is None or not self._is_new_frame(frame):
             return None, None, None
+        start_time = time()
+
+        if (
+            self.motion_gate is not None
+            and frame.camera_name in self.last_detections
+            and not self.motion_gate.should_infer(frame, robot_pose)
+        ):
+            last_result, last_frame_size = self.last_detections[frame.camera_name]
+            return last_result, last_frame_size, frame
 
         # Determine the inference device string based on the device type
         if self.device_type == "gpu":
@@ -80,19 +173,282 @@ class SimpleDevice(Device):
         else:
             raise ValueError(f"Unsupported device type: {self.device_type}")
 
-        results = self.model.predict(
-            frame,
-            show=False,
-            device=infer_device,
-            conf=ObjectDetectionConstants["confidence_threshold"],
-            imgsz=ObjectDetectionConstants["input_size"],
-            verbose=False,
-            iou=0.5,
+        inference_regions, far_field_flags = self._get_inference_regions(camera, frame)
+        if inference_regions:
+            inference_images = [
+                self._crop_image(frame.image, inference_region)
+                for inference_region in inference_regions
+            ]
+
+            results = self.model.predict(
+                inference_images if len(inference_images) > 1 else inference_images[0],
+                show=False,
+                device=infer_device,
+                conf=(
+                    self.get_confidence_threshold()
+                    if self.model_cascade is None
+                    else self.model_cascade.get_min_confidence(
+                        self.confidence_threshold
+                    )
+                ),
+                imgsz=self.get_input_size(),
+                verbose=False,
+                iou=0.5,
+            )
+
+            shifted_results = [
+                (
+                    result
+                    if inference_region is None
+                    else shift_results(
+                        (
+                            remove_cut_boxes(result, inference_region, frame.get_size())
+                            if is_far_field_tile
+                            else result
+                        ),
+                        inference_region[:2],
+                        frame.image,
+                    )
+                )
+                for result, inference_region, is_far_field_tile in zip(
+                    results, inference_regions, far_field_flags
+                )
+            ]
+            detection_result = (
+                shifted_results[0]
+                if len(shifted_results) == 1
+                else merge_results(shifted_results, frame.image, 0.5)
+            )
+        else:
+            detection_result = create_empty_results(frame.image, self.model.names)
+        if self.model_cascade is not None:
+            detection_result = self.model_cascade.refine(
+                detection_result, frame, infer_device, self.confidence_threshold
+            )
+        if self.motion_gate is not None:
+            self.last_detections[frame.camera_name] = (
+                detection_result,
+                frame.get_size(),
+            )
+        if inference_regions:
+            self._update_latency_governor((time() - start_time) * 1000)
+        return detection_result, frame.get_size(), frame
+
+    def _get_inference_regions(
+        self, camera: Camera, frame: Frame
+    ) -> tuple[list[tuple[int, int, int, int] | None], list[bool]]:
+        """
+        Chooses the parts of a frame the model runs on.
+
+        With a grid gate, only the parts of the camera's inference region that its
+        occupancy grid marks are searched, and far field tiles are not used.
+        Otherwise the camera's inference region is searched together with its far
+        field tiles.
+
+        Args:
+            camera (Camera): The camera the frame came from.
+            frame (Frame): The frame to search.
+
+        Returns:
+            tuple[list[tuple[int, int, int, int] | None], list[bool]]: Regions as
+                (x1, y1, x2, y2), None for the whole frame, and whether each region
+                is a far field tile. Empty if the frame has nothing to detect.
+        """
+        inference_region = camera.get_inference_region(
+            frame, ObjectDetectionConstants["max_distance"]
+        )
+        if self.grid_gate is not None:
+            clipped_regions = [
+                self._clip_region(region, inference_region)
+                for region in self.grid_gate.get_regions(frame)
+            ]
+            gate_regions = [region for region in clipped_regions if region is not None]
+            return gate_regions, [False] * len(gate_regions)
+        far_field_tiles = camera.get_far_field_tiles(
+            frame, ObjectDetectionConstants["max_distance"], self.get_input_size()
         )
+        far_field_flags = [False] + [True] * len(far_field_tiles)
+        return [inference_region] + far_field_tiles, far_field_flags
+
+    @staticmethod
+    def _clip_region(
+        region: tuple[int, int, int, int],
+        bounds: tuple[int, int, int, int] | None,
+    ) -> tuple[int, int, int, int] | None:
+        """
+        Intersects a region with the bounds it has to stay within.
+
+        Args:
+            region (tuple[int, int, int, int]): The region as (x1, y1, x2, y2).
+            bounds (tuple[int, int, int, int] | None): The bounds as (x1, y1, x2, y2),
+                or None for the whole frame.
+
+        Returns:
+            tuple[int, int, int, int] | None: The clipped region, or None if the
+                region lies outside the bounds.
+        """
+        if bounds is None:
+            return region
+        left, top = max(region[0], bounds[0]), max(region[1], bounds[1])
+        right, bottom = min(region[2], bounds[2]), min(region[3], bounds[3])
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right, bottom
+
+    @staticmethod
+    def _crop_image(
+        image: np.ndarray, region: tuple[int, int, int, int] | None
+    ) -> np.ndarray:
+        """
+        Cuts a region out of an image for inference.
+
+        Args:
+            image (np.ndarray): The full image.
+            region (tuple[int, int, int, int] | None): The region as (x1, y1, x2, y2),
+                or None for the whole image.
+
+        Returns:
+            np.ndarray: A contiguous image of the region.
+        """
+        if region is None:
+            return image
+        region_left, region_top, region_right, region_bottom = region
+        return np.ascontiguousarray(
+            image[region_top:region_bottom, region_left:region_right]
+        )
+
+    def _is_new_frame(self, frame: Frame) -> bool:
+        """
+        Records the frame's sequence number and reports whether it advanced.
+
+        Args:
+            frame (Frame): The frame returned by the active camera.
+
+        Returns:
+            bool: True if this frame has not been processed before.
+        """
+        last_sequence_number = self.last_sequence_numbers.get(frame.camera_name, 0)
+        if frame.sequence_number == last_sequence_number:
+            return False
+        self.last_sequence_numbers[frame.camera_name] = frame.sequence_number
+        return True
 
-        frame_height, frame_width = frame.shape[0], frame.shape[1]
-        frame_size = (frame_width, frame_height)
-        return results[0], frame_size, frame
+    def get_input_size(self) -> int:
+        """
+        Returns the model input size currently used for inference.
+
+        The latency governor's size replaces the configured one, and a power
+        mode's size caps either as long as the active model runs at any size.
+        """
+        input_size = self.governor_input_size or ObjectDetectionConstants["input_size"]
+        if self.input_size is not None and self.has_dynamic_input_size(
+            self.active_model_path
+        ):
+            input_size = min(input_size, self.input_size)
+        return input_size
+
+    def has_dynamic_input_size(self, model_path: str | None = None) -> bool:
+        """
+        Returns whether a model runs at any input size.
+
+        PyTorch checkpoints do, while exported models (ONNX, TensorRT, TFLite,
+        Edge TPU, ...) are built for the one input size they were exported at.
+
+        :param model_path: The model to check, the device's own model when None.
+        """
+        return (model_path or self.model_path).lower().endswith(DYNAMIC_MODEL_SUFFIXES)
+
+    def get_confidence_threshold(self) -> float:
+        """
+        Returns the confidence threshold currently used for inference.
+        """
+        if self.confidence_threshold is not None:
+            return self.confidence_threshold
+        return ObjectDetectionConstants["confidence_threshold"]
+
+    def load_model(self, model_path: str) -> YOLO:
+        """
+        Loads a model variant once and keeps it for later switches.
+
+        :param model_path: The path to the YOLO model file.
+        """
+        if model_path not in self.models:
+            self.log(f"Loading model variant from {model_path}")
+            self.models[model_path] = YOLO(model_path, task="detect")
+        return self.models[model_path]
+
+    def apply_governor_rung(self, rung: dict) -> None:
+        """
+        Switches to a latency governor rung's input size, model and confidence.
+
+        :param rung: A rung from `LatencyGovernor`, with an 'input_size' and
+            optionally a 'model_path' and a 'confidence_threshold'.
+        """
+        self.governor_input_size = rung["input_size"]
+        self.confidence_threshold = rung.get("confidence_threshold")
+        self.active_model_path = rung.get("model_path") or self.model_path
+        self.model = self.load_model(self.active_model_path)
+
+    def use_latency_governor(self, latency_governor: LatencyGovernor) -> None:
+        """
+        Preloads every model variant on the governor's ladder and applies its current rung.
+
+        :param latency_governor: The governor controlling this device.
+        """
+        for rung in latency_governor.ladder:
+            if rung.get("model_path"):
+                self.load_model(rung["model_path"])
+        self.latency_governor = latency_governor
+        self.apply_governor_rung(latency_governor.get_rung())
+
+    def _update_latency_governor(self, latency_ms: float) -> None:
+        """
+        Reports a frame's detection latency and switches rung if the governor steps.
+
+        :param latency_ms: The time from receiving the frame to its final result.
+        """
+        if self.latency_governor is None:
+            return
+        rung = self.latency_governor.update(latency_ms)
+        if rung is not None:
+            self.apply_governor_rung(rung)
+
+    def set_input_size(self, input_size: int | None) -> None:
+        """
+        Overrides the configured model input size, or restores it when None.
+        """
+        self.input_size = input_size
+
+    def apply_power_profile(self, profile: dict) -> None:
+        """
+        Queues a power mode profile's input size and capture rate.
+
+        Mode changes arrive on the NetworkTables thread, so the profile is only
+        applied by `detect`, before it reads the next frame; cameras are never
+        reconfigured while a frame is being read.
+
+        :param profile: A profile from `PowerModeManager`.
+        """
+        with self.power_profile_lock:
+            self.pending_power_profile = profile
+
+    def _apply_pending_power_profile(self) -> None:
+        """
+        Applies the power mode profile queued since the last frame, if any.
+        """
+        with self.power_profile_lock:
+            profile = self.pending_power_profile
+            self.pending_power_profile = None
+        if profile is None:
+            return
+        if not self.has_dynamic_input_size(self.active_model_path):
+            self.log(
+                f"{self.active_model_path} has a fixed input size, the power mode "
+                f"input size {profile['input_size']} only applies to .pt models"
+            )
+        self.set_input_size(profile["input_size"])
+        for camera in self.cameras:
+            camera.set_capture_fps(profile["capture_fps"])
 
     def get_class_names(self) -> dict[int, str]:
         """
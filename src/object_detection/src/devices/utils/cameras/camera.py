@@ -1,7 +1,43 @@
 import abc
+import json
+from time import time
 from typing import Callable, Optional
+import imutils
 import numpy as np
 
+from src.devices.utils.cameras.frame import Frame
+from src.math_conversions import (
+    calculate_horizon_crop_row,
+    calculate_tile_regions,
+    get_rotation_matrix,
+    unrotate_region,
+)
+
+
+def load_camera_intrinsics(
+    json_path: str,
+) -> tuple[np.ndarray, np.ndarray, Optional[tuple[int, int]]]:
+    """
+    Load the output of `utils/camera_calibration/calibrate_camera.py`.
+
+    Args:
+        json_path: Path to the camera intrinsics JSON file.
+
+    Returns:
+        The camera matrix, the distortion coefficients and the (width, height)
+        the calibration was performed at, if recorded.
+    """
+    with open(json_path, "r") as file:
+        data = json.load(file)
+    camera_matrix = np.array(data["camera_matrix"], dtype=np.float64)
+    distortion_coefficients = np.array(
+        data["distortion_coefficients"], dtype=np.float64
+    )
+    image_size = data.get("image_size")
+    if image_size is not None:
+        image_size = (int(image_size[0]), int(image_size[1]))
+    return camera_matrix, distortion_coefficients, image_size
+
 
 class Camera(abc.ABC):
     """Abstract base class defining a common camera interface."""
@@ -14,6 +50,17 @@ class Camera(abc.ABC):
             camera_data: Dict containing at least the keys
                 'name', 'fov', 'camera_offset_pos', 'camera_pitch',
                 'camera_yaw', 'processing_device', 'frame_rotation'.
+                The optional 'rotate_boxes' key runs inference on the native
+                sensor orientation and rotates detections instead of pixels.
+                The optional 'intrinsics_path' key points to a calibration JSON
+                used to undistort detections.
+                The optional 'horizon_crop' key skips the rows above where a piece
+                within range can appear, keeping 'horizon_crop_margin' (a fraction
+                of the frame height, default 0.05) above that row.
+                The optional 'far_field_tiling' key additionally runs the band of
+                rows showing the floor beyond 'far_field_distance' (meters, default
+                5) as native resolution tiles overlapping by 'tile_overlap'
+                (default 0.2).
             log: Logging function, e.g. `print` or logger.
         """
         self.name: str = camera_data["name"]
@@ -23,8 +70,29 @@ class Camera(abc.ABC):
         self.camera_yaw: float = camera_data["camera_yaw"]
         self.processing_device: str = camera_data["processing_device"]
         self.frame_rotation: int = camera_data["frame_rotation"]
+        self.rotate_boxes: bool = camera_data.get("rotate_boxes", False)
+        self.horizon_crop: bool = camera_data.get("horizon_crop", False)
+        self.horizon_crop_margin: float = camera_data.get("horizon_crop_margin", 0.05)
+        self.inference_regions: dict[tuple, Optional[tuple[int, int, int, int]]] = {}
+        self.far_field_tiling: bool = camera_data.get("far_field_tiling", False)
+        self.far_field_distance: float = camera_data.get("far_field_distance", 5.0)
+        self.tile_overlap: float = camera_data.get("tile_overlap", 0.2)
+        self.far_field_tiles: dict[tuple, list[tuple[int, int, int, int]]] = {}
         self.log = log
         self.cap = None
+        self.sequence_number: int = 0
+
+        self.camera_matrix: Optional[np.ndarray] = None
+        self.distortion_coefficients: Optional[np.ndarray] = None
+        self.calibration_resolution: Optional[tuple[int, int]] = None
+        self.scaled_camera_matrices: dict[tuple[int, int], np.ndarray] = {}
+        if camera_data.get("intrinsics_path"):
+            (
+                self.camera_matrix,
+                self.distortion_coefficients,
+                self.calibration_resolution,
+            ) = load_camera_intrinsics(camera_data["intrinsics_path"])
+            self.log(f"Loaded intrinsics for {self.name}")
 
         self._start_camera()
 
@@ -34,15 +102,68 @@ class Camera(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def get_frame(self) -> Optional[np.ndarray]:
+    def get_frame(self) -> Optional[Frame]:
         """
-        Retrieve a frame (rotated by `frame_rotation`) or None.
+        Retrieve a frame (rotated by `frame_rotation` unless `rotate_boxes` is set) or None.
 
         Returns:
             The latest frame, or None on failure/end-of-stream.
         """
         pass
 
+    def _rotate_image(self, image: np.ndarray) -> np.ndarray:
+        """
+        Apply `frame_rotation` to the pixels unless detections are rotated instead.
+
+        Args:
+            image: The image in native sensor orientation.
+
+        Returns:
+            The image that should be handed to the detector.
+        """
+        if self.rotate_boxes or self.frame_rotation == 0:
+            return image
+        return imutils.rotate_bound(image, self.frame_rotation)
+
+    def _create_frame(
+        self,
+        image: np.ndarray,
+        source_resolution: tuple[int, int],
+        capture_timestamp: Optional[float] = None,
+    ) -> Frame:
+        """
+        Wrap a newly captured image in a Frame with the next sequence number.
+
+        Args:
+            image: The image that will be handed to consumers.
+            source_resolution: The (width, height) the source delivered.
+            capture_timestamp: When the image was captured, defaults to now.
+
+        Returns:
+            The frame describing the captured image.
+        """
+        if capture_timestamp is None:
+            capture_timestamp = time()
+        self.sequence_number += 1
+        return Frame(
+            image=image,
+            camera_name=self.name,
+            sequence_number=self.sequence_number,
+            capture_timestamp=capture_timestamp,
+            source_resolution=source_resolution,
+            rotation=self.frame_rotation if self.rotate_boxes else 0,
+        )
+
+    def set_capture_fps(self, capture_fps: float) -> None:
+        """
+        Ask the source to capture at a different rate. Sources without rate
+        control ignore this.
+
+        Args:
+            capture_fps: The frames per second to capture at.
+        """
+        pass
+
     def get_processing_device(self) -> str:
         """Returns which device (CPU/GPU/TPU) this camera will use."""
         return self.processing_device
@@ -63,6 +184,190 @@ class Camera(abc.ABC):
         """Returns the (width, height) resolution this camera is set to."""
         return self.fov
 
+    def has_intrinsics(self) -> bool:
+        """Returns whether calibrated intrinsics were loaded for this camera."""
+        return self.camera_matrix is not None
+
+    def get_camera_matrix(self, source_resolution: tuple[int, int]) -> np.ndarray:
+        """
+        Returns the camera matrix scaled to the resolution the source delivers.
+
+        Args:
+            source_resolution: The (width, height) of the unrotated source image.
+
+        Returns:
+            The 3x3 camera matrix for that resolution.
+        """
+        if self.calibration_resolution is None:
+            return self.camera_matrix
+        if source_resolution not in self.scaled_camera_matrices:
+            scale_x = source_resolution[0] / self.calibration_resolution[0]
+            scale_y = source_resolution[1] / self.calibration_resolution[1]
+            scaled_camera_matrix = self.camera_matrix.copy()
+            scaled_camera_matrix[0] *= scale_x
+            scaled_camera_matrix[1] *= scale_y
+            self.scaled_camera_matrices[source_resolution] = scaled_camera_matrix
+        return self.scaled_camera_matrices[source_resolution]
+
+    def get_distortion_coefficients(self) -> Optional[np.ndarray]:
+        """Returns the lens distortion coefficients, if calibrated."""
+        return self.distortion_coefficients
+
+    def get_inference_region(
+        self, frame: Frame, max_distance: float
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Returns the part of the frame that can contain a piece within range.
+
+        Args:
+            frame: The frame that will be handed to the detector.
+            max_distance: The furthest distance in meters a piece is reported at.
+
+        Returns:
+            The region of `frame.image` as (x1, y1, x2, y2), or None when the whole
+            frame has to be searched.
+        """
+        if not self.horizon_crop:
+            return None
+
+        region_key = (frame.get_size(), frame.rotation, max_distance)
+        if region_key not in self.inference_regions:
+            self.inference_regions[region_key] = self._calculate_inference_region(
+                frame.get_size(), frame.rotation, max_distance
+            )
+        return self.inference_regions[region_key]
+
+    def _calculate_inference_region(
+        self, frame_size: tuple[int, int], rotation: float, max_distance: float
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Derive the inference region from the camera height, pitch and vertical FOV.
+
+        Args:
+            frame_size: The (width, height) of the frame handed to the detector.
+            rotation: Clockwise rotation in degrees still pending on that frame.
+            max_distance: The furthest distance in meters a piece is reported at.
+
+        Returns:
+            The region as (x1, y1, x2, y2), or None if nothing can be cropped.
+        """
+        upright_size = self._get_upright_size(frame_size, rotation)
+        crop_row = int(
+            self._get_floor_row(upright_size[1], max_distance)
+            - self.horizon_crop_margin * upright_size[1]
+        )
+        if crop_row <= 0 or crop_row >= upright_size[1]:
+            return None
+
+        region = (0, crop_row, upright_size[0], upright_size[1])
+        if rotation:
+            region = unrotate_region(region, frame_size, rotation)
+        self.log(f"Camera {self.name} inference region: {region} of {frame_size}")
+        return region
+
+    def get_far_field_tiles(
+        self, frame: Frame, max_distance: float, tile_size: int
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Returns the tiles covering the part of the frame where distant pieces appear.
+
+        Args:
+            frame: The frame that will be handed to the detector.
+            max_distance: The furthest distance in meters a piece is reported at.
+            tile_size: The side length of a tile in pixels, normally the model's
+                input size so tiles are inferred without downscaling.
+
+        Returns:
+            The tiles of `frame.image` as (x1, y1, x2, y2), empty when tiling is off.
+        """
+        if not self.far_field_tiling:
+            return []
+
+        tiles_key = (frame.get_size(), frame.rotation, max_distance, tile_size)
+        if tiles_key not in self.far_field_tiles:
+            self.far_field_tiles[tiles_key] = self._calculate_far_field_tiles(
+                frame.get_size(), frame.rotation, max_distance, tile_size
+            )
+        return self.far_field_tiles[tiles_key]
+
+    def _calculate_far_field_tiles(
+        self,
+        frame_size: tuple[int, int],
+        rotation: float,
+        max_distance: float,
+        tile_size: int,
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Tile the band between the rows of `max_distance` and `far_field_distance`.
+
+        A band shorter than a tile grows towards the bottom of the frame, so every
+        tile is a full `tile_size` square and fixed-shape models run it without
+        resizing. Only a frame narrower or shorter than a tile gives smaller tiles.
+
+        Args:
+            frame_size: The (width, height) of the frame handed to the detector.
+            rotation: Clockwise rotation in degrees still pending on that frame.
+            max_distance: The furthest distance in meters a piece is reported at.
+            tile_size: The side length of a tile in pixels.
+
+        Returns:
+            The tiles as (x1, y1, x2, y2).
+        """
+        upright_size = self._get_upright_size(frame_size, rotation)
+        band_top = max(
+            int(
+                self._get_floor_row(upright_size[1], max_distance)
+                - self.horizon_crop_margin * upright_size[1]
+            ),
+            0,
+        )
+        band_bottom = self._get_floor_row(upright_size[1], self.far_field_distance)
+        if band_bottom <= band_top:
+            return []
+        if band_bottom - band_top < tile_size:
+            band_bottom = min(band_top + tile_size, upright_size[1])
+            band_top = max(band_bottom - tile_size, 0)
+
+        band = (0, band_top, upright_size[0], band_bottom)
+        if rotation:
+            band = unrotate_region(band, frame_size, rotation)
+        tiles = calculate_tile_regions(band, tile_size, self.tile_overlap)
+        self.log(
+            f"Camera {self.name} far field band {band} split into {len(tiles)} tiles"
+        )
+        return tiles
+
+    @staticmethod
+    def _get_upright_size(
+        frame_size: tuple[int, int], rotation: float
+    ) -> tuple[int, int]:
+        """
+        Returns the (width, height) a frame has once its pending rotation is applied.
+        """
+        if not rotation:
+            return frame_size
+        return get_rotation_matrix(frame_size, rotation)[1]
+
+    def _get_floor_row(self, upright_height: int, distance: float) -> int:
+        """
+        Returns the upright image row showing the floor `distance` meters from the robot.
+
+        Args:
+            upright_height: The height of the upright frame in pixels.
+            distance: The distance from the robot in meters.
+
+        Returns:
+            The row counted from the top, clipped to the frame.
+        """
+        camera_distance = distance + float(np.linalg.norm(self.camera_offset_pos[:2]))
+        return calculate_horizon_crop_row(
+            upright_height,
+            float(self.fov[1]),
+            self.camera_offset_pos[2],
+            self.camera_pitch,
+            camera_distance,
+        )
+
     def get_name(self) -> str:
         """Returns the human‐readable name of this camera."""
         return self.name
@@ -0,0 +1,187 @@
+import threading
+from dataclasses import dataclass, field
+from time import time
+from typing import Callable, Hashable
+
+import cv2
+import numpy as np
+
+
+def _letterbox(image: np.ndarray, target_size: tuple[int, int]) -> np.ndarray:
+    """
+    Resize an image to fit a target size, keeping its aspect ratio, and pad it with black.
+
+    Args:
+        image (np.ndarray): The image to letterbox, color or grayscale.
+        target_size (tuple[int, int]): The (width, height) of the result.
+
+    Returns:
+        np.ndarray: The centered, padded image.
+    """
+    image_height, image_width = image.shape[:2]
+    target_width, target_height = target_size
+    scale = min(target_width / image_width, target_height / image_height)
+    resized_width = int(image_width * scale)
+    resized_height = int(image_height * scale)
+    resized = cv2.resize(
+        image, (resized_width, resized_height), interpolation=cv2.INTER_LINEAR
+    )
+
+    letterboxed = np.zeros(
+        (target_height, target_width) + image.shape[2:], dtype=image.dtype
+    )
+    top = (target_height - resized_height) // 2
+    left = (target_width - resized_width) // 2
+    letterboxed[top : top + resized_height, left : left + resized_width] = resized
+    return letterboxed
+
+
+@dataclass
+class Frame:
+    """A captured image together with the metadata describing where it came from.
+
+    Derived images (grayscale, resized, letterboxed and pyramid levels) are computed
+    at most once per frame and shared by every consumer. They are read-only and are
+    freed together with the frame or by `release`.
+
+    Attributes:
+        image: The image data in BGR order.
+        camera_name: The name of the camera that produced the image.
+        sequence_number: Monotonically increasing capture counter for the camera.
+        capture_timestamp: Wall clock time in seconds when the image was captured.
+        source_resolution: The (width, height) of the image as delivered by the source.
+        rotation: Clockwise rotation in degrees that still has to be applied to the
+            image and to anything detected in it to make it upright.
+    """
+
+    image: np.ndarray
+    camera_name: str
+    sequence_number: int
+    capture_timestamp: float = field(default_factory=time)
+    source_resolution: tuple[int, int] = (0, 0)
+    rotation: float = 0
+    _derived_images: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _derived_images_lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    def get_size(self) -> tuple[int, int]:
+        """Returns the (width, height) of the image held by this frame."""
+        return self.image.shape[1], self.image.shape[0]
+
+    def get_age_ms(self) -> float:
+        """Returns how long ago this frame was captured, in milliseconds."""
+        return (time() - self.capture_timestamp) * 1000
+
+    def _get_derived_image(
+        self, key: Hashable, create: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns a memoized derived image, creating it on first request.
+
+        Args:
+            key (Hashable): Identifies the derived image.
+            create (Callable[[], np.ndarray]): Builds the image when it is not cached.
+
+        Returns:
+            np.ndarray: The read-only derived image.
+        """
+        with self._derived_images_lock:
+            if key not in self._derived_images:
+                derived_image = create()
+                derived_image.flags.writeable = False
+                self._derived_images[key] = derived_image
+            return self._derived_images[key]
+
+    def get_grayscale(self) -> np.ndarray:
+        """Returns the image converted to grayscale."""
+        if self.image.ndim == 2:
+            return self.image
+        return self._get_derived_image(
+            "grayscale", lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        )
+
+    def get_resized(self, size: tuple[int, int], grayscale: bool = False) -> np.ndarray:
+        """
+        Returns the image resized to an exact size.
+
+        Args:
+            size (tuple[int, int]): The (width, height) of the result.
+            grayscale (bool): Whether to resize the grayscale image instead.
+
+        Returns:
+            np.ndarray: The resized image.
+        """
+        size = (int(size[0]), int(size[1]))
+        if size == self.get_size():
+            return self.get_grayscale() if grayscale else self.image
+        return self._get_derived_image(
+            ("resized", size, grayscale),
+            lambda: cv2.resize(
+                self.get_grayscale() if grayscale else self.image,
+                size,
+                interpolation=cv2.INTER_AREA,
+            ),
+        )
+
+    def get_scaled(self, scale: float, grayscale: bool = False) -> np.ndarray:
+        """
+        Returns the image scaled by a factor.
+
+        Args:
+            scale (float): The factor applied to both dimensions.
+            grayscale (bool): Whether to scale the grayscale image instead.
+
+        Returns:
+            np.ndarray: The scaled image.
+        """
+        width, height = self.get_size()
+        return self.get_resized(
+            (max(int(width * scale), 1), max(int(height * scale), 1)), grayscale
+        )
+
+    def get_letterbox(
+        self, target_size: tuple[int, int], grayscale: bool = True
+    ) -> np.ndarray:
+        """
+        Returns the image fitted into a target size with black padding.
+
+        Args:
+            target_size (tuple[int, int]): The (width, height) of the result.
+            grayscale (bool): Whether to letterbox the grayscale image.
+
+        Returns:
+            np.ndarray: The letterboxed image.
+        """
+        target_size = (int(target_size[0]), int(target_size[1]))
+        return self._get_derived_image(
+            ("letterbox", target_size, grayscale),
+            lambda: _letterbox(
+                self.get_grayscale() if grayscale else self.image, target_size
+            ),
+        )
+
+    def get_pyramid_level(self, level: int, grayscale: bool = False) -> np.ndarray:
+        """
+        Returns a Gaussian pyramid level, halving the size once per level.
+
+        Args:
+            level (int): The pyramid level, 0 being the full image.
+            grayscale (bool): Whether to build the pyramid from the grayscale image.
+
+        Returns:
+            np.ndarray: The pyramid level.
+        """
+        if level <= 0:
+            return self.get_grayscale() if grayscale else self.image
+        return self._get_derived_image(
+            ("pyramid", level, grayscale),
+            lambda: cv2.pyrDown(self.get_pyramid_level(level - 1, grayscale)),
+        )
+
+    def release(self) -> None:
+        """Frees every derived image held by this frame."""
+        with self._derived_images_lock:
+            self._derived_images.clear()
@@ -0,0 +1,130 @@
+import multiprocessing
+from multiprocessing.synchronize import Event
+from time import sleep
+from typing import Callable
+
+from src.devices.device import create_camera
+from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.frame_bus import FrameBusReader, FrameBusWriter
+
+
+def run_frame_bus_publisher(source_camera_data: dict, stop_event: Event) -> None:
+    """
+    Capture frames from a camera and publish every new one to its frame bus.
+
+    Runs in its own process so a single capture serves every consumer.
+
+    Args:
+        source_camera_data (dict): Camera data describing the real camera.
+        stop_event (Event): Set to stop publishing.
+    """
+    camera = create_camera(source_camera_data, print)
+    writer = None
+    last_sequence_number = 0
+    try:
+        while not stop_event.is_set():
+            frame = camera.get_frame()
+            if frame is None or frame.sequence_number == last_sequence_number:
+                sleep(0.001)
+                continue
+            last_sequence_number = frame.sequence_number
+            if writer is None:
+                writer = FrameBusWriter(
+                    frame.camera_name,
+                    source_camera_data.get("max_frame_bytes", frame.image.nbytes),
+                )
+            writer.publish(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+class FrameBusCamera(Camera):
+    """Concrete Camera that reads frames published to a shared memory frame bus."""
+
+    def __init__(self, camera_data: dict, log: Callable[[str], None]) -> None:
+        """
+        Args:
+            camera_data: Must include 'source_camera_type', the camera type that
+                captures frames, plus that type's own keys. Optional keys:
+                'start_publisher' (default True, launch the capture process here)
+                and 'max_frame_bytes' (slot size, defaults to the first frame's size).
+            log: Logging function.
+        """
+        self.type = camera_data["camera_type"]
+        self.source_camera_data = dict(
+            camera_data, camera_type=camera_data["source_camera_type"]
+        )
+        self.start_publisher: bool = camera_data.get("start_publisher", True)
+        self.publisher_process: multiprocessing.Process | None = None
+        self.stop_event = multiprocessing.get_context("spawn").Event()
+        self.reader: FrameBusReader | None = None
+        self.latest_frame: Frame | None = None
+        super().__init__(camera_data, log)
+
+    def _start_camera(self) -> None:
+        """Launch the capture process if configured and attach to the bus."""
+        if self.start_publisher:
+            self._start_publisher()
+        self.reader = FrameBusReader.connect(self.name)
+        if self.reader is None:
+            self.log(f"Frame bus for {self.name} is not available yet")
+
+    def _start_publisher(self) -> None:
+        """Start (or restart) the process that captures and publishes frames."""
+        self.publisher_process = multiprocessing.get_context("spawn").Process(
+            target=run_frame_bus_publisher,
+            args=(self.source_camera_data, self.stop_event),
+            name=f"frame_bus_{self.name}",
+            daemon=True,
+        )
+        self.publisher_process.start()
+        self.log(f"Started frame bus publisher for {self.name}")
+
+    def get_frame(self) -> Frame | None:
+        """
+        Return a copy of the latest published frame, or None if unavailable.
+
+        The image is copied out of the ring, as the publisher would overwrite a
+        view while the frame is still being inferred on and annotated. Repeated
+        calls return the same Frame until a new one is published, so its derived
+        images are shared, and a replaced Frame releases them. Restarts the capture process if it died and reconnects
+        when the publisher replaced the bus.
+        """
+        if self.publisher_process is not None and not self.publisher_process.is_alive():
+            self.log(f"Frame bus publisher for {self.name} stopped, restarting")
+            if self.reader is not None:
+                self.reader.close()
+                self.reader = None
+            self.latest_frame = None
+            self._start_publisher()
+
+        if self.reader is not None and self.reader.is_closed():
+            self.reader.close()
+            self.reader = None
+            self.latest_frame = None
+
+        if self.reader is None:
+            self.reader = FrameBusReader.connect(self.name, timeout=0)
+            if self.reader is None:
+                return None
+
+        if (
+            self.latest_frame is not None
+            and self.reader.get_latest_sequence_number()
+            == self.latest_frame.sequence_number
+        ):
+            return self.latest_frame
+        frame = self.reader.read_latest(copy=True)
+        if frame is not None:
+            if self.latest_frame is not None:
+                self.latest_frame.release()
+            self.latest_frame = frame
+        return self.latest_frame
+
+    def __del__(self):
+        """Stop the capture process."""
+        if getattr(self, "publisher_process", None) is not None:
+            self.stop_event.set()
+            self.publisher_process.join(timeout=2)
@@ -1,8 +1,21 @@
 import cv2
-import imutils
-import numpy as np
 from typing import Callable
+from src.constants.constants import constants
 from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.get_camera_modes import (
+    WEB_PREVIEW_MAX_RESOLUTION,
+    WEB_PREVIEW_MIN_RESOLUTION,
+    CameraMode,
+    apply_camera_mode,
+    get_negotiated_mode,
+    load_cached_mode,
+    probe_camera_modes,
+    save_cached_mode,
+    select_capture_mode,
+)
+
+ObjectDetectionConstants = constants["ObjectDetectionConstants"]
 
 
 class PhysicalCamera(Camera):
@@ -12,26 +25,131 @@ class PhysicalCamera(Camera):
         """
         Args:
             camera_data: Must include 'camera_id' (int or str that OpenCV accepts).
+                Optional keys: 'resolution' ([width, height]), 'target_fps',
+                'pixel_format', 'auto_capture_mode' (probe the device and pick
+                the cheapest sufficient mode) and 'min_resolution'. While the web
+                server runs, automatic modes also stay within the web preview's
+                resolution floor and ceiling.
             log: Logging function.
         """
         self.camera_id: int = camera_data["camera_id"]
         self.type = camera_data["camera_type"]
+        self.resolution: list[int] = camera_data.get("resolution", camera_data["fov"])
+        self.target_fps: float = camera_data.get("target_fps", 60)
+        self.pixel_format: str = camera_data.get("pixel_format", "MJPG")
+        self.auto_capture_mode: bool = camera_data.get("auto_capture_mode", False)
+        input_size = ObjectDetectionConstants["input_size"]
+        self.min_resolution: list[int] = camera_data.get(
+            "min_resolution", [input_size, input_size * 3 // 4]
+        )
+        self.max_resolution: list[int] | None = None
+        if constants["DisplayConstants.run_web_server"]:
+            self.min_resolution = [
+                max(min_size, web_min_size)
+                for min_size, web_min_size in zip(
+                    self.min_resolution, WEB_PREVIEW_MIN_RESOLUTION
+                )
+            ]
+            self.max_resolution = [
+                max(min_size, web_max_size)
+                for min_size, web_max_size in zip(
+                    self.min_resolution, WEB_PREVIEW_MAX_RESOLUTION
+                )
+            ]
+        self.capture_mode: CameraMode | None = None
         super().__init__(camera_data, log)
 
     def _start_camera(self) -> None:
-        """Open the physical camera and apply settings."""
+        """Open the physical camera, apply the capture mode and report what was negotiated."""
+        requested_mode = self._get_requested_mode()
         self.cap = cv2.VideoCapture(self.camera_id)
         self.cap.set(cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY)
-        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.fov[0])
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.fov[1])
-        self.cap.set(cv2.CAP_PROP_FPS, 60)
+        apply_camera_mode(self.cap, requested_mode)
         if not self.cap.isOpened():
             raise RuntimeError(f"Error opening camera {self.camera_id}")
 
-    def get_frame(self) -> np.ndarray | None:
+        self.capture_mode = get_negotiated_mode(self.cap)
+        self.log(
+            f"Camera {self.name} requested {requested_mode}, negotiated {self.capture_mode}"
+        )
+
+    def _get_requested_mode(self) -> CameraMode:
+        """
+        Decide which capture mode to request from the device.
+
+        Returns:
+            CameraMode: The configured mode, or the cheapest sufficient mode when
+                'auto_capture_mode' is enabled.
+        """
+        configured_mode = CameraMode(
+            self.pixel_format,
+            int(self.resolution[0]),
+            int(self.resolution[1]),
+            float(self.target_fps),
+        )
+        if not self.auto_capture_mode:
+            return configured_mode
+
+        cached_mode = load_cached_mode(self.name)
+        if cached_mode is not None and self._satisfies_requirements(cached_mode):
+            return cached_mode
+
+        max_width, max_height = self.max_resolution or (None, None)
+        selected_mode = select_capture_mode(
+            probe_camera_modes(self.camera_id),
+            self.min_resolution[0],
+            self.min_resolution[1],
+            self.target_fps,
+            max_width=max_width,
+            max_height=max_height,
+        )
+        if selected_mode is None:
+            self.log(f"No capture modes found for {self.name}, using configured mode")
+            return configured_mode
+
+        save_cached_mode(self.name, selected_mode)
+        return selected_mode
+
+    def _satisfies_requirements(self, camera_mode: CameraMode) -> bool:
+        """
+        Check whether a mode still meets the current resolution and frame rate needs.
+
+        Args:
+            camera_mode (CameraMode): The mode to check.
+
+        Returns:
+            bool: True if the mode is large and fast enough, and not too large.
+        """
+        return (
+            camera_mode.width >= self.min_resolution[0]
+            and camera_mode.height >= self.min_resolution[1]
+            and camera_mode.fps >= self.target_fps
+            and (
+                self.max_resolution is None
+                or (
+                    camera_mode.width <= self.max_resolution[0]
+                    and camera_mode.height <= self.max_resolution[1]
+                )
+            )
+        )
+
+    def set_capture_fps(self, capture_fps: float) -> None:
+        """Request a new frame rate from the device, never above the configured target."""
+        capture_fps = min(float(capture_fps), float(self.target_fps))
+        self.cap.set(cv2.CAP_PROP_FPS, capture_fps)
+        self.log(
+            f"Camera {self.name} capture rate set to {capture_fps}, "
+            f"device reports {self.cap.get(cv2.CAP_PROP_FPS)}"
+        )
+
+    def get_capture_mode(self) -> CameraMode | None:
+        """Returns the capture mode the device negotiated."""
+        return self.capture_mode
+
+    def get_frame(self) -> Frame | None:
         """Grab the next frame and apply rotation."""
         ret, frame = self.cap.read()
         if not ret:
             return None
-        return imutils.rotate_bound(frame, self.frame_rotation)
+        source_resolution = (frame.shape[1], frame.shape[0])
+        return self._create_frame(self._rotate_image(frame), source_resolution)
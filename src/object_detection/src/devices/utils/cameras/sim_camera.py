@@ -3,11 +3,11 @@ from typing import Callable
 from urllib.request import urlopen
 
 import cv2
-import imutils
 import numpy as np
 
 from src.constants.constants import constants
 from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.cameras.frame import Frame
 
 NetworkTableConstants = constants["NetworkTableConstants"]
 
@@ -57,7 +57,7 @@ class SimCamera(Camera):
             log: Logging function.
         """
         self.camera_id: str = camera_data["camera_id"]
-        self.latest_frame: np.ndarray | None = None
+        self.latest_frame: Frame | None = None
         self.frame_lock = threading.Lock()
         self.type = camera_data["camera_type"]
         super().__init__(camera_data, log)
@@ -73,14 +73,19 @@ class SimCamera(Camera):
             target=sim_frame_reader, args=(url, self._set_frame), daemon=True
         ).start()
 
-    def get_frame(self) -> np.ndarray | None:
-        """Return the most recent frame (rotated), or None if not yet available."""
+    def get_frame(self) -> Frame | None:
+        """
+        Return the most recent frame, or None if not yet available.
+
+        The same Frame (with the same sequence number) is returned until the
+        stream delivers a new image.
+        """
         with self.frame_lock:
-            if self.latest_frame is None:
-                return None
-            return imutils.rotate_bound(self.latest_frame, self.frame_rotation)
+            return self.latest_frame
 
     def _set_frame(self, frame: np.ndarray) -> None:
-        """Internal: thread-safe update of the latest frame."""
+        """Internal: rotate a newly received image once and publish it."""
+        source_resolution = (frame.shape[1], frame.shape[0])
+        rotated_frame = self._rotate_image(frame)
         with self.frame_lock:
-            self.latest_frame = frame
+            self.latest_frame = self._create_frame(rotated_frame, source_resolution)
@@ -0,0 +1,374 @@
+import threading
+from time import time
+from typing import Callable
+
+import cv2
+import imutils
+import numpy as np
+
+from src.constants.constants import constants
+from src.devices.utils.cameras.camera import Camera
+from src.devices.utils.cameras.frame import Frame
+from src.math_conversions import FOV_CORRECTION_FACTOR, rotate2d
+
+ObjectDetectionConstants = constants["ObjectDetectionConstants"]
+
+DEFAULT_PIECE_COLORS = [[0, 140, 255], [200, 220, 40], [60, 60, 220]]
+SKY_COLOR = (90, 70, 60)
+FLOOR_NEAR_COLOR = np.array([110, 110, 110], dtype=np.float32)
+FLOOR_FAR_COLOR = np.array([60, 60, 60], dtype=np.float32)
+
+
+class SyntheticCamera(Camera):
+    """Concrete Camera that renders moving game pieces procedurally with known positions.
+
+    Pieces are projected with OpenCV's pinhole model, through the camera's
+    calibrated intrinsics if it has any and otherwise through an ideal lens
+    with the field of view the linear detection geometry assumes. The ground
+    truth is therefore independent of the geometry detections are positioned
+    with.
+    """
+
+    def __init__(self, camera_data: dict, log: Callable[[str], None]) -> None:
+        """
+        Args:
+            camera_data: Optional keys: 'resolution' ([width, height]), 'fps',
+                'piece_count', 'piece_radius' (meters), 'piece_speed' (meters per
+                second), 'piece_colors' (BGR lists), 'sprite_paths' (images pasted
+                instead of coloured blobs), 'min_distance', 'max_distance' and 'seed'.
+                Pieces never come closer than the nearest floor point in view.
+                Intrinsics from 'intrinsics_path' need a 'frame_rotation' of 0,
+                as pieces are projected in the upright image.
+            log: Logging function.
+        """
+        self.type = camera_data["camera_type"]
+        self.resolution: tuple[int, int] = tuple(
+            camera_data.get("resolution", [640, 480])
+        )
+        self.fps: float = camera_data.get("fps", 30)
+        self.piece_count: int = camera_data.get("piece_count", 3)
+        self.piece_radius: float = camera_data.get("piece_radius", 0.18)
+        self.piece_speed: float = camera_data.get("piece_speed", 1.0)
+        self.piece_colors: list[list[int]] = camera_data.get(
+            "piece_colors", DEFAULT_PIECE_COLORS
+        )
+        self.sprite_paths: list[str] = camera_data.get("sprite_paths", [])
+        self.min_distance: float = camera_data.get("min_distance", 0.75)
+        self.max_distance: float = camera_data.get(
+            "max_distance", ObjectDetectionConstants["max_distance"]
+        )
+        self.random_generator = np.random.default_rng(camera_data.get("seed"))
+
+        self.frame_lock = threading.Lock()
+        self.latest_frame: Frame | None = None
+        self.latest_ground_truth: list[dict] = []
+        self.last_render_time = 0.0
+        super().__init__(camera_data, log)
+
+    def _start_camera(self) -> None:
+        """Prepare the lens, static background, sprites and initial piece states."""
+        if self.has_intrinsics() and self.frame_rotation:
+            raise ValueError(
+                f"Synthetic camera {self.name} cannot combine intrinsics with a frame rotation"
+            )
+        self.render_camera_matrix, self.render_distortion_coefficients = (
+            self._get_render_lens()
+        )
+        self.background = self._render_background()
+        self.sprites = [
+            cv2.imread(sprite_path, cv2.IMREAD_UNCHANGED)
+            for sprite_path in self.sprite_paths
+        ]
+        focal_length_x, focal_length_y = np.diag(self.render_camera_matrix)[:2]
+        center_x, center_y = self.render_camera_matrix[:2, 2]
+        self.max_bearing = (
+            np.degrees(
+                np.arctan(min(center_x, self.resolution[0] - center_x) / focal_length_x)
+            )
+            * 0.9
+        )
+        lowest_visible_angle = np.degrees(
+            np.arctan((self.resolution[1] - center_y) / focal_length_y)
+        )
+        nearest_visible_distance = self.camera_offset_pos[2] / np.tan(
+            np.radians(lowest_visible_angle)
+        )
+        self.min_distance = max(self.min_distance, nearest_visible_distance * 1.1)
+        self.piece_distances = self.random_generator.uniform(
+            self.min_distance, self.max_distance, self.piece_count
+        )
+        self.piece_bearings = self.random_generator.uniform(
+            -self.max_bearing, self.max_bearing, self.piece_count
+        )
+        self.piece_distance_speeds = self.random_generator.uniform(
+            -self.piece_speed, self.piece_speed, self.piece_count
+        )
+        self.piece_bearing_speeds = self.random_generator.uniform(
+            -self.piece_speed, self.piece_speed, self.piece_count
+        ) * (self.max_bearing / self.max_distance)
+        self.log(
+            f"Synthetic camera {self.name} rendering {self.piece_count} pieces at "
+            f"{self.resolution[0]}x{self.resolution[1]}@{self.fps}"
+        )
+
+    def _get_render_lens(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Choose the lens pieces are projected through.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The camera matrix at the rendered
+                resolution and the distortion coefficients.
+        """
+        if self.has_intrinsics():
+            return (
+                self.get_camera_matrix(self.resolution),
+                self.get_distortion_coefficients(),
+            )
+        width, height = self.resolution
+        focal_length_x = (width / 2) / np.tan(
+            np.radians(float(self.fov[0]) / 2 * FOV_CORRECTION_FACTOR)
+        )
+        focal_length_y = (height / 2) / np.tan(
+            np.radians(float(self.fov[1]) / 2 * FOV_CORRECTION_FACTOR)
+        )
+        camera_matrix = np.array(
+            [
+                [focal_length_x, 0, width / 2],
+                [0, focal_length_y, height / 2],
+                [0, 0, 1],
+            ]
+        )
+        return camera_matrix, np.zeros(5)
+
+    def _render_background(self) -> np.ndarray:
+        """
+        Render the sky and a floor that darkens towards the horizon.
+
+        The horizon of the level camera sits on the row of the principal point.
+
+        Returns:
+            np.ndarray: The background image.
+        """
+        width, height = self.resolution
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:] = SKY_COLOR
+        horizon_row = int(np.clip(self.render_camera_matrix[1, 2], 0, height - 1))
+        floor_rows = height - horizon_row
+        blend = np.linspace(0, 1, floor_rows, dtype=np.float32)[:, None]
+        floor_colors = FLOOR_FAR_COLOR * (1 - blend) + FLOOR_NEAR_COLOR * blend
+        background[horizon_row:] = floor_colors[:, None, :].astype(np.uint8)
+        return background
+
+    def _advance_pieces(self, elapsed_seconds: float) -> None:
+        """
+        Move every piece and bounce it off the distance and bearing limits.
+
+        Args:
+            elapsed_seconds (float): Simulated time since the previous frame.
+        """
+        self.piece_distances += self.piece_distance_speeds * elapsed_seconds
+        self.piece_bearings += self.piece_bearing_speeds * elapsed_seconds
+
+        outside_distance = (self.piece_distances < self.min_distance) | (
+            self.piece_distances > self.max_distance
+        )
+        self.piece_distance_speeds[outside_distance] *= -1
+        self.piece_distances = np.clip(
+            self.piece_distances, self.min_distance, self.max_distance
+        )
+
+        outside_bearing = np.abs(self.piece_bearings) > self.max_bearing
+        self.piece_bearing_speeds[outside_bearing] *= -1
+        self.piece_bearings = np.clip(
+            self.piece_bearings, -self.max_bearing, self.max_bearing
+        )
+
+    def _render_pieces(self, image: np.ndarray) -> list[dict]:
+        """
+        Draw every piece, far to near, and record where it was drawn.
+
+        Args:
+            image (np.ndarray): The image to draw on.
+
+        Returns:
+            list[dict]: Per piece ground truth with its local position and box.
+        """
+        focal_length = self.render_camera_matrix[0, 0]
+        ground_truth = []
+        for piece_index in np.argsort(-self.piece_distances):
+            relative_position = np.array(
+                rotate2d(
+                    [self.piece_distances[piece_index], 0],
+                    np.radians(-self.piece_bearings[piece_index]),
+                )
+            )
+            local_position = relative_position + np.array(self.camera_offset_pos[:2])
+            contact_point = np.array(
+                [
+                    [
+                        -relative_position[1],
+                        self.camera_offset_pos[2],
+                        relative_position[0],
+                    ]
+                ]
+            )
+            (bottom_center,), _ = cv2.projectPoints(
+                contact_point,
+                np.zeros(3),
+                np.zeros(3),
+                self.render_camera_matrix,
+                self.render_distortion_coefficients,
+            )
+            bottom_center_x, bottom_center_y = np.round(bottom_center[0]).astype(int)
+            radius = max(
+                int(self.piece_radius * focal_length / relative_position[0]), 1
+            )
+            box = self._draw_piece(
+                image, piece_index, bottom_center_x, bottom_center_y, radius
+            )
+            ground_truth.append(
+                {
+                    "piece_index": int(piece_index),
+                    "local_position": local_position,
+                    "box": box,
+                }
+            )
+        return ground_truth
+
+    def _draw_piece(
+        self,
+        image: np.ndarray,
+        piece_index: int,
+        bottom_center_x: int,
+        bottom_center_y: int,
+        radius: int,
+    ) -> tuple[int, int, int, int]:
+        """
+        Draw a single piece as a sprite or a coloured blob resting on the floor.
+
+        Args:
+            image (np.ndarray): The image to draw on.
+            piece_index (int): Which piece is drawn.
+            bottom_center_x (int): The column where the piece touches the floor.
+            bottom_center_y (int): The row where the piece touches the floor.
+            radius (int): Half the apparent width of the piece in pixels.
+
+        Returns:
+            tuple[int, int, int, int]: The drawn box as (x1, y1, x2, y2).
+        """
+        if self.sprites:
+            sprite = self.sprites[piece_index % len(self.sprites)]
+            return self._paste_sprite(
+                image, sprite, bottom_center_x, bottom_center_y, radius
+            )
+
+        vertical_radius = max(int(radius * 0.6), 1)
+        color = self.piece_colors[piece_index % len(self.piece_colors)]
+        cv2.ellipse(
+            image,
+            (bottom_center_x, bottom_center_y - vertical_radius),
+            (radius, vertical_radius),
+            0,
+            0,
+            360,
+            color,
+            -1,
+        )
+        return (
+            bottom_center_x - radius,
+            bottom_center_y - 2 * vertical_radius,
+            bottom_center_x + radius,
+            bottom_center_y,
+        )
+
+    @staticmethod
+    def _paste_sprite(
+        image: np.ndarray,
+        sprite: np.ndarray,
+        bottom_center_x: int,
+        bottom_center_y: int,
+        radius: int,
+    ) -> tuple[int, int, int, int]:
+        """
+        Scale a sprite to the piece's apparent width and alpha blend it onto the image.
+
+        Args:
+            image (np.ndarray): The image to draw on.
+            sprite (np.ndarray): A BGR or BGRA sprite image.
+            bottom_center_x (int): The column where the piece touches the floor.
+            bottom_center_y (int): The row where the piece touches the floor.
+            radius (int): Half the apparent width of the piece in pixels.
+
+        Returns:
+            tuple[int, int, int, int]: The drawn box as (x1, y1, x2, y2).
+        """
+        sprite_width = 2 * radius
+        sprite_height = max(int(sprite.shape[0] * sprite_width / sprite.shape[1]), 1)
+        scaled_sprite = cv2.resize(sprite, (sprite_width, sprite_height))
+        box = (
+            bottom_center_x - radius,
+            bottom_center_y - sprite_height,
+            bottom_center_x + radius,
+            bottom_center_y,
+        )
+
+        image_height, image_width = image.shape[:2]
+        left, top = max(box[0], 0), max(box[1], 0)
+        right, bottom = min(box[2], image_width), min(box[3], image_height)
+        if left >= right or top >= bottom:
+            return box
+
+        sprite_region = scaled_sprite[
+            top - box[1] : bottom - box[1], left - box[0] : right - box[0]
+        ]
+        if sprite_region.shape[2] == 4:
+            alpha = sprite_region[:, :, 3:4].astype(np.float32) / 255
+            image_region = image[top:bottom, left:right].astype(np.float32)
+            blended = sprite_region[:, :, :3] * alpha + image_region * (1 - alpha)
+            image[top:bottom, left:right] = blended.astype(np.uint8)
+        else:
+            image[top:bottom, left:right] = sprite_region
+        return box
+
+    def get_frame(self) -> Frame | None:
+        """
+        Render a new frame when the configured frame interval has elapsed.
+
+        Between intervals the previous Frame is returned with the same sequence number.
+        """
+        with self.frame_lock:
+            now = time()
+            if self.latest_frame is not None and now - self.last_render_time < (
+                1 / self.fps
+            ):
+                return self.latest_frame
+
+            elapsed_seconds = (
+                1 / self.fps
+                if self.latest_frame is None
+                else now - self.last_render_time
+            )
+            self.last_render_time = now
+            self._advance_pieces(elapsed_seconds)
+
+            image = self.background.copy()
+            self.latest_ground_truth = self._render_pieces(image)
+            if self.frame_rotation:
+                image = imutils.rotate_bound(image, -self.frame_rotation)
+
+            source_resolution = (image.shape[1], image.shape[0])
+            self.latest_frame = self._create_frame(
+                self._rotate_image(image), source_resolution, capture_timestamp=now
+            )
+            return self.latest_frame
+
+    def get_ground_truth(self) -> tuple[int, list[dict]]:
+        """
+        Returns the ground truth of the most recently rendered frame.
+
+        Returns:
+            tuple[int, list[dict]]: The frame's sequence number and, for every piece,
+                its local position and upright box as (x1, y1, x2, y2).
+        """
+        with self.frame_lock:
+            return self.sequence_number, list(self.latest_ground_truth)
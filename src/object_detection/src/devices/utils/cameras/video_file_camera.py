@@ -2,7 +2,7 @@ import cv2
 import numpy as np
 from typing import Callable
 from src.devices.utils.cameras.camera import Camera
-import imutils
+from src.devices.utils.cameras.frame import Frame
 
 
 class VideoFileCamera(Camera):
@@ -20,6 +20,10 @@ class VideoFileCamera(Camera):
         self.type = camera_data["camera_type"]
         super().__init__(camera_data, log)
 
+        self.source_resolution = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
         self.frames = self.load_frames()
         self.current_frame_index = 0
 
@@ -32,7 +36,7 @@ class VideoFileCamera(Camera):
             ret, frame = self.cap.read()
             if not ret:
                 break
-            frames.append(imutils.rotate_bound(frame, angle=self.frame_rotation))
+            frames.append(self._rotate_image(frame))
         print("Frames loaded.")
         return frames
 
@@ -42,7 +46,7 @@ class VideoFileCamera(Camera):
         if not self.cap.isOpened():
             raise RuntimeError(f"Error opening video file {self.video_path}")
 
-    def get_frame(self) -> np.ndarray | None:
+    def get_frame(self) -> Frame | None:
         """
         Read the next frame, rotate it, and return.
         Returns None when the video ends unless looping is enabled.
@@ -55,7 +59,7 @@ class VideoFileCamera(Camera):
 
         frame = self.frames[self.current_frame_index]
         self.current_frame_index += 1
-        return frame
+        return self._create_frame(frame, self.source_resolution)
 
     def __del__(self):
         """Release the video capture object."""
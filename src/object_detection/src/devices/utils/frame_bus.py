@@ -0,0 +1,411 @@
+import multiprocessing
+import re
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from time import sleep, time
+
+import numpy as np
+
+from .cameras.frame import Frame
+
+BUS_HEADER_DTYPE = np.dtype(
+    [
+        ("slot_count", np.uint64),
+        ("slot_capacity", np.uint64),
+        ("latest_sequence_number", np.uint64),
+        ("writer_heartbeat", np.float64),
+        ("closed", np.uint64),
+    ]
+)
+SLOT_HEADER_DTYPE = np.dtype(
+    [
+        ("sequence_number", np.uint64),
+        ("capture_timestamp", np.float64),
+        ("rotation", np.float64),
+        ("height", np.uint32),
+        ("width", np.uint32),
+        ("channels", np.uint32),
+        ("source_width", np.uint32),
+        ("source_height", np.uint32),
+        ("padding", np.uint32),
+    ]
+)
+DEFAULT_SLOT_COUNT = 4
+_published_bus_names: set[str] = set()
+
+
+def get_bus_name(camera_name: str) -> str:
+    """
+    Build the shared memory name used for a camera's frame bus.
+
+    Args:
+        camera_name (str): The name of the camera.
+
+    Returns:
+        str: A shared memory name that is valid on every platform.
+    """
+    return "eagleeye_" + re.sub(r"[^A-Za-z0-9]", "_", camera_name)
+
+
+def _attach_shared_memory(
+    bus_name: str, shares_resource_tracker: bool = False
+) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory block without taking ownership of it.
+
+    Python's resource tracker would otherwise unlink the block when a reader exits.
+    Blocks published by this process are left registered to their writer, and so
+    are blocks attached by a multiprocessing child, which shares the resource
+    tracker of its parent, or by a parent reading a child's block.
+
+    Args:
+        bus_name (str): The shared memory name.
+        shares_resource_tracker (bool): Whether the writer is a multiprocessing
+            child of this process.
+
+    Returns:
+        shared_memory.SharedMemory: The attached block.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=bus_name, track=False)
+    memory = shared_memory.SharedMemory(name=bus_name)
+    if (
+        bus_name in _published_bus_names
+        or shares_resource_tracker
+        or multiprocessing.parent_process()
+    ):
+        return memory
+    resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+def _mark_closed(memory: shared_memory.SharedMemory) -> None:
+    """
+    Tell the readers of a frame bus that its publisher closed or replaced it.
+
+    Args:
+        memory (shared_memory.SharedMemory): The block of the bus.
+    """
+    header = np.ndarray(1, dtype=BUS_HEADER_DTYPE, buffer=memory.buf)
+    header[0]["closed"] = 1
+    del header
+
+
+class _FrameBusLayout:
+    """Structured views over a frame bus shared memory block."""
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        """
+        Map the bus header, slot headers and slot data of a shared memory block.
+
+        Args:
+            memory (shared_memory.SharedMemory): The block to map.
+        """
+        self.memory = memory
+        self.header = np.ndarray(1, dtype=BUS_HEADER_DTYPE, buffer=memory.buf)[0]
+        self.slot_count = int(self.header["slot_count"])
+        self.slot_capacity = int(self.header["slot_capacity"])
+        self.slot_headers = np.ndarray(
+            self.slot_count,
+            dtype=SLOT_HEADER_DTYPE,
+            buffer=memory.buf,
+            offset=BUS_HEADER_DTYPE.itemsize,
+        )
+        self.data_offset = (
+            BUS_HEADER_DTYPE.itemsize + self.slot_count * SLOT_HEADER_DTYPE.itemsize
+        )
+
+    def get_slot_data(self, slot_index: int, byte_count: int) -> np.ndarray:
+        """
+        Returns a byte view of a slot's data region.
+
+        Args:
+            slot_index (int): The slot to view.
+            byte_count (int): How many bytes of the slot to view.
+
+        Returns:
+            np.ndarray: A uint8 view into shared memory.
+        """
+        return np.ndarray(
+            byte_count,
+            dtype=np.uint8,
+            buffer=self.memory.buf,
+            offset=self.data_offset + slot_index * self.slot_capacity,
+        )
+
+    @staticmethod
+    def get_size(slot_count: int, slot_capacity: int) -> int:
+        """
+        Returns the number of bytes a bus with the given geometry needs.
+
+        Args:
+            slot_count (int): The number of ring buffer slots.
+            slot_capacity (int): The maximum image size in bytes per slot.
+
+        Returns:
+            int: The shared memory size in bytes.
+        """
+        return (
+            BUS_HEADER_DTYPE.itemsize
+            + slot_count * SLOT_HEADER_DTYPE.itemsize
+            + slot_count * slot_capacity
+        )
+
+
+class FrameBusWriter:
+    """Publishes one camera's frames into a shared memory ring buffer."""
+
+    def __init__(
+        self,
+        camera_name: str,
+        slot_capacity: int,
+        slot_count: int = DEFAULT_SLOT_COUNT,
+    ) -> None:
+        """
+        Create the shared memory ring buffer for a camera.
+
+        Args:
+            camera_name (str): The name of the camera whose frames are published.
+            slot_capacity (int): The largest image, in bytes, a slot can hold.
+            slot_count (int): The number of frames kept in the ring.
+        """
+        self.camera_name = camera_name
+        self.slot_count = slot_count
+        self._create_bus(slot_capacity)
+
+    def _create_bus(self, slot_capacity: int) -> None:
+        """
+        Create the shared memory block, replacing a stale one of a dead publisher.
+
+        Args:
+            slot_capacity (int): The largest image, in bytes, a slot can hold.
+        """
+        bus_name = get_bus_name(self.camera_name)
+        size = _FrameBusLayout.get_size(self.slot_count, slot_capacity)
+        try:
+            self.memory = shared_memory.SharedMemory(
+                name=bus_name, create=True, size=size
+            )
+        except FileExistsError:
+            stale_memory = shared_memory.SharedMemory(name=bus_name)
+            _mark_closed(stale_memory)
+            stale_memory.close()
+            stale_memory.unlink()
+            self.memory = shared_memory.SharedMemory(
+                name=bus_name, create=True, size=size
+            )
+
+        _published_bus_names.add(bus_name)
+
+        header = np.ndarray(1, dtype=BUS_HEADER_DTYPE, buffer=self.memory.buf)[0]
+        header["slot_count"] = self.slot_count
+        header["slot_capacity"] = slot_capacity
+        header["latest_sequence_number"] = 0
+        header["writer_heartbeat"] = time()
+        header["closed"] = 0
+        self.layout = _FrameBusLayout(self.memory)
+
+    def publish(self, frame: Frame) -> None:
+        """
+        Copy a frame into the next ring slot and make it the latest frame.
+
+        A frame larger than the slots, e.g. after a resolution change, replaces the
+        bus with one that fits it. Readers see the old bus closed and reconnect.
+
+        Args:
+            frame (Frame): The frame to publish.
+        """
+        image = np.ascontiguousarray(frame.image)
+        if image.nbytes > self.layout.slot_capacity:
+            self._release()
+            self._create_bus(image.nbytes)
+
+        slot_index = frame.sequence_number % self.layout.slot_count
+        slot_header = self.layout.slot_headers[slot_index]
+        slot_header["sequence_number"] = 0
+        self.layout.get_slot_data(slot_index, image.nbytes)[:] = image.reshape(-1)
+        slot_header["capture_timestamp"] = frame.capture_timestamp
+        slot_header["rotation"] = frame.rotation
+        slot_header["height"] = image.shape[0]
+        slot_header["width"] = image.shape[1]
+        slot_header["channels"] = 1 if image.ndim == 2 else image.shape[2]
+        slot_header["source_width"] = frame.source_resolution[0]
+        slot_header["source_height"] = frame.source_resolution[1]
+        slot_header["sequence_number"] = frame.sequence_number
+        self.layout.header["latest_sequence_number"] = frame.sequence_number
+        self.layout.header["writer_heartbeat"] = time()
+
+    def close(self) -> None:
+        """Release and remove the shared memory block."""
+        self._release()
+
+    def _release(self) -> None:
+        """Mark the bus closed for its readers, then release and remove it."""
+        self.layout.header["closed"] = 1
+        self.layout = None
+        _published_bus_names.discard(self.memory.name)
+        self.memory.close()
+        self.memory.unlink()
+
+
+class FrameBusReader:
+    """Reads the latest frames of one camera from its shared memory ring buffer."""
+
+    def __init__(self, camera_name: str, shares_resource_tracker: bool = False) -> None:
+        """
+        Attach to a camera's frame bus.
+
+        Args:
+            camera_name (str): The name of the camera to read.
+            shares_resource_tracker (bool): Whether the publisher is a
+                multiprocessing child of this process.
+
+        Raises:
+            FileNotFoundError: If no publisher has created the bus yet.
+        """
+        self.camera_name = camera_name
+        self.memory = _attach_shared_memory(
+            get_bus_name(camera_name), shares_resource_tracker
+        )
+        self.layout = _FrameBusLayout(self.memory)
+
+    @classmethod
+    def connect(
+        cls, camera_name: str, timeout: float = 10.0
+    ) -> "FrameBusReader | None":
+        """
+        Attach to a camera's frame bus, waiting for the publisher to create it.
+
+        Args:
+            camera_name (str): The name of the camera to read.
+            timeout (float): How long to wait in seconds.
+
+        Returns:
+            FrameBusReader | None: The reader, or None if the bus never appeared.
+        """
+        deadline = time() + timeout
+        while True:
+            try:
+                return cls(camera_name)
+            except FileNotFoundError:
+                if time() >= deadline:
+                    return None
+                sleep(0.05)
+
+    def get_latest_sequence_number(self) -> int:
+        """Returns the sequence number of the most recently published frame."""
+        return int(self.layout.header["latest_sequence_number"])
+
+    def is_closed(self) -> bool:
+        """
+        Returns whether the publisher closed or replaced the bus, so the reader
+        has to reconnect to get new frames.
+        """
+        return bool(self.layout.header["closed"])
+
+    def get_writer_age(self) -> float:
+        """Returns the seconds since the publisher last wrote a frame."""
+        return time() - float(self.layout.header["writer_heartbeat"])
+
+    def read_latest(self, copy: bool = False) -> Frame | None:
+        """
+        Read the most recently published frame.
+
+        Without `copy` the image is a zero-copy view into shared memory that stays
+        valid until the publisher wraps around the ring; check it with `is_valid`.
+
+        Args:
+            copy (bool): Whether to copy the image out of shared memory.
+
+        Returns:
+            Frame | None: The latest frame, or None if nothing was published yet.
+        """
+        for _ in range(self.layout.slot_count):
+            sequence_number = self.get_latest_sequence_number()
+            if sequence_number == 0:
+                return None
+            frame = self._read_slot(sequence_number, copy)
+            if frame is not None:
+                return frame
+        return None
+
+    def wait_for_frame(
+        self, last_sequence_number: int, timeout: float = 1.0, copy: bool = False
+    ) -> Frame | None:
+        """
+        Wait until a frame newer than `last_sequence_number` is published.
+
+        Returns early with None when the bus is closed.
+
+        Args:
+            last_sequence_number (int): The newest sequence number already consumed.
+            timeout (float): How long to wait in seconds.
+            copy (bool): Whether to copy the image out of shared memory.
+
+        Returns:
+            Frame | None: The new frame, or None on timeout.
+        """
+        deadline = time() + timeout
+        while self.get_latest_sequence_number() <= last_sequence_number:
+            if time() >= deadline or self.is_closed():
+                return None
+            sleep(0.001)
+        return self.read_latest(copy)
+
+    def is_valid(self, frame: Frame) -> bool:
+        """
+        Check that a zero-copy frame has not been overwritten by the publisher.
+
+        Args:
+            frame (Frame): A frame returned by this reader.
+
+        Returns:
+            bool: True while the frame's slot still holds that frame.
+        """
+        slot_index = frame.sequence_number % self.layout.slot_count
+        slot_sequence_number = self.layout.slot_headers[slot_index]["sequence_number"]
+        return int(slot_sequence_number) == frame.sequence_number
+
+    def _read_slot(self, sequence_number: int, copy: bool) -> Frame | None:
+        """
+        Build a Frame from the slot holding `sequence_number`.
+
+        Args:
+            sequence_number (int): The sequence number to read.
+            copy (bool): Whether to copy the image out of shared memory.
+
+        Returns:
+            Frame | None: The frame, or None if the slot was overwritten while reading.
+        """
+        slot_index = sequence_number % self.layout.slot_count
+        slot_header = self.layout.slot_headers[slot_index].copy()
+        if int(slot_header["sequence_number"]) != sequence_number:
+            return None
+
+        height, width = int(slot_header["height"]), int(slot_header["width"])
+        channels = int(slot_header["channels"])
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        image = self.layout.get_slot_data(slot_index, height * width * channels)
+        image = image.reshape(shape)
+        if copy:
+            image = image.copy()
+
+        frame = Frame(
+            image=image,
+            camera_name=self.camera_name,
+            sequence_number=sequence_number,
+            capture_timestamp=float(slot_header["capture_timestamp"]),
+            source_resolution=(
+                int(slot_header["source_width"]),
+                int(slot_header["source_height"]),
+            ),
+            rotation=float(slot_header["rotation"]),
+        )
+        if not self.is_valid(frame):
+            return None
+        return frame
+
+    def close(self) -> None:
+        """Detach from the shared memory block."""
+        self.layout = None
+        self.memory.close()
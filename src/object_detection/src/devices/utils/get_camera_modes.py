@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+
+import cv2
+
+current_folder = os.path.dirname(os.path.abspath(__file__))
+CAMERA_MODE_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(current_folder)), "constants", "camera_modes.json"
+)
+
+PIXEL_FORMAT_COSTS = {"YUYV": 1.0, "MJPG": 1.5}
+UNKNOWN_PIXEL_FORMAT_COST = 2.0
+OPENCV_PROBE_RESOLUTIONS = [
+    (320, 240),
+    (640, 480),
+    (800, 600),
+    (1280, 720),
+    (1920, 1080),
+]
+OPENCV_PROBE_PIXEL_FORMATS = ["MJPG", "YUYV"]
+WEB_PREVIEW_MIN_RESOLUTION = (640, 360)
+WEB_PREVIEW_MAX_RESOLUTION = (1280, 720)
+
+V4L2_FORMAT_PATTERN = re.compile(r"\[\d+\]:\s+'(\w+)'")
+V4L2_SIZE_PATTERN = re.compile(r"Size:\s+\w+\s+(\d+)x(\d+)")
+V4L2_INTERVAL_PATTERN = re.compile(r"Interval:.*\(([\d.]+)\s+fps\)")
+
+
+@dataclass(frozen=True)
+class CameraMode:
+    """A capture format a camera can deliver.
+
+    Attributes:
+        pixel_format: The FOURCC code of the pixel format, e.g. "MJPG".
+        width: The frame width in pixels.
+        height: The frame height in pixels.
+        fps: The frame rate in frames per second.
+    """
+
+    pixel_format: str
+    width: int
+    height: int
+    fps: float
+
+    def get_capture_cost(self) -> float:
+        """Returns the relative capture and decode cost of this mode."""
+        format_cost = PIXEL_FORMAT_COSTS.get(
+            self.pixel_format, UNKNOWN_PIXEL_FORMAT_COST
+        )
+        return self.width * self.height * self.fps * format_cost
+
+    def __str__(self) -> str:
+        return f"{self.pixel_format} {self.width}x{self.height}@{self.fps:g}"
+
+
+def parse_v4l2_formats(v4l2_output: str) -> list[CameraMode]:
+    """
+    Parse the output of `v4l2-ctl --list-formats-ext` into camera modes.
+
+    Args:
+        v4l2_output (str): The text printed by v4l2-ctl.
+
+    Returns:
+        list[CameraMode]: Every pixel format, size and frame rate combination listed.
+    """
+    modes = []
+    pixel_format = None
+    size = None
+    for line in v4l2_output.splitlines():
+        format_match = V4L2_FORMAT_PATTERN.search(line)
+        if format_match:
+            pixel_format = format_match.group(1)
+            size = None
+            continue
+        size_match = V4L2_SIZE_PATTERN.search(line)
+        if size_match:
+            size = (int(size_match.group(1)), int(size_match.group(2)))
+            continue
+        interval_match = V4L2_INTERVAL_PATTERN.search(line)
+        if interval_match and pixel_format is not None and size is not None:
+            modes.append(
+                CameraMode(
+                    pixel_format, size[0], size[1], float(interval_match.group(1))
+                )
+            )
+    return modes
+
+
+def probe_v4l2_modes(camera_id: int) -> list[CameraMode]:
+    """
+    Enumerate the capture modes of a V4L2 device with v4l2-ctl.
+
+    Args:
+        camera_id (int): The index of the /dev/video device.
+
+    Returns:
+        list[CameraMode]: The supported modes, empty if v4l2-ctl is unavailable.
+    """
+    try:
+        output = subprocess.check_output(
+            ["v4l2-ctl", "--device", f"/dev/video{camera_id}", "--list-formats-ext"],
+            universal_newlines=True,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    return parse_v4l2_formats(output)
+
+
+def apply_camera_mode(capture: cv2.VideoCapture, camera_mode: CameraMode) -> None:
+    """
+    Request a capture mode on an open OpenCV capture.
+
+    Args:
+        capture (cv2.VideoCapture): The capture to configure.
+        camera_mode (CameraMode): The mode to request.
+    """
+    capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*camera_mode.pixel_format))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, camera_mode.width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, camera_mode.height)
+    capture.set(cv2.CAP_PROP_FPS, camera_mode.fps)
+
+
+def get_negotiated_mode(capture: cv2.VideoCapture) -> CameraMode:
+    """
+    Read back the capture mode the driver actually negotiated.
+
+    Args:
+        capture (cv2.VideoCapture): An open capture.
+
+    Returns:
+        CameraMode: The mode reported by the capture backend.
+    """
+    fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+    pixel_format = "".join(chr((fourcc >> (8 * index)) & 0xFF) for index in range(4))
+    return CameraMode(
+        pixel_format.strip("\x00"),
+        int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        float(capture.get(cv2.CAP_PROP_FPS)),
+    )
+
+
+def probe_opencv_modes(camera_id: int, requested_fps: float = 60) -> list[CameraMode]:
+    """
+    Discover capture modes by requesting common modes and reading back the result.
+
+    Args:
+        camera_id (int): The index OpenCV uses to open the camera.
+        requested_fps (float): The frame rate to request for every mode.
+
+    Returns:
+        list[CameraMode]: The distinct modes the driver accepted.
+    """
+    capture = cv2.VideoCapture(camera_id)
+    if not capture.isOpened():
+        return []
+    modes = set()
+    try:
+        for pixel_format in OPENCV_PROBE_PIXEL_FORMATS:
+            for width, height in OPENCV_PROBE_RESOLUTIONS:
+                apply_camera_mode(
+                    capture, CameraMode(pixel_format, width, height, requested_fps)
+                )
+                negotiated_mode = get_negotiated_mode(capture)
+                if negotiated_mode.width > 0 and negotiated_mode.fps > 0:
+                    modes.add(negotiated_mode)
+    finally:
+        capture.release()
+    return sorted(modes, key=lambda mode: mode.get_capture_cost())
+
+
+def probe_camera_modes(camera_id: int) -> list[CameraMode]:
+    """
+    Enumerate the capture modes of a camera using the best method for this platform.
+
+    Args:
+        camera_id (int): The index of the camera.
+
+    Returns:
+        list[CameraMode]: The supported modes.
+    """
+    if platform.system() == "Linux":
+        modes = probe_v4l2_modes(camera_id)
+        if modes:
+            return modes
+    return probe_opencv_modes(camera_id)
+
+
+def select_capture_mode(
+    modes: list[CameraMode],
+    min_width: int,
+    min_height: int,
+    min_fps: float,
+    max_width: int | None = None,
+    max_height: int | None = None,
+) -> CameraMode | None:
+    """
+    Pick the cheapest mode that satisfies the resolution and frame rate requirements.
+
+    When no mode satisfies every requirement, the fastest mode that still satisfies
+    the resolution is used, then the largest mode available. Modes above the
+    maximum resolution are only considered if the camera has no smaller modes.
+
+    Args:
+        modes (list[CameraMode]): The modes the camera supports.
+        min_width (int): The minimum acceptable frame width.
+        min_height (int): The minimum acceptable frame height.
+        min_fps (float): The minimum acceptable frame rate.
+        max_width (int | None): The maximum frame width, e.g. for the web preview.
+        max_height (int | None): The maximum frame height.
+
+    Returns:
+        CameraMode | None: The selected mode, or None if no modes were given.
+    """
+    if not modes:
+        return None
+    if max_width is not None and max_height is not None:
+        modes = [
+            mode
+            for mode in modes
+            if mode.width <= max_width and mode.height <= max_height
+        ] or modes
+    large_enough_modes = [
+        mode for mode in modes if mode.width >= min_width and mode.height >= min_height
+    ]
+    satisfying_modes = [mode for mode in large_enough_modes if mode.fps >= min_fps]
+    if satisfying_modes:
+        return min(satisfying_modes, key=lambda mode: mode.get_capture_cost())
+    if large_enough_modes:
+        return max(
+            large_enough_modes, key=lambda mode: (mode.fps, -mode.get_capture_cost())
+        )
+    return max(modes, key=lambda mode: (mode.width * mode.height, mode.fps))
+
+
+def load_cached_mode(camera_name: str) -> CameraMode | None:
+    """
+    Load the previously selected capture mode for a camera.
+
+    Args:
+        camera_name (str): The name of the camera device.
+
+    Returns:
+        CameraMode | None: The cached mode, or None if the camera was never probed.
+    """
+    if not os.path.exists(CAMERA_MODE_CACHE_PATH):
+        return None
+    with open(CAMERA_MODE_CACHE_PATH, "r") as file:
+        cached_modes = json.load(file)
+    if camera_name not in cached_modes:
+        return None
+    return CameraMode(**cached_modes[camera_name])
+
+
+def save_cached_mode(camera_name: str, camera_mode: CameraMode) -> None:
+    """
+    Store the selected capture mode for a camera.
+
+    Args:
+        camera_name (str): The name of the camera device.
+        camera_mode (CameraMode): The selected mode.
+    """
+    cached_modes = {}
+    if os.path.exists(CAMERA_MODE_CACHE_PATH):
+        with open(CAMERA_MODE_CACHE_PATH, "r") as file:
+            cached_modes = json.load(file)
+    cached_modes[camera_name] = asdict(camera_mode)
+    with open(CAMERA_MODE_CACHE_PATH, "w") as file:
+        json.dump(cached_modes, file, indent=4)
+
+
+def benchmark_camera_mode(
+    camera_id: int, camera_mode: CameraMode, duration_seconds: float
+) -> tuple[CameraMode, float]:
+    """
+    Measure the raw capture throughput of a camera in one mode.
+
+    Args:
+        camera_id (int): The index of the camera.
+        camera_mode (CameraMode): The mode to request.
+        duration_seconds (float): How long to capture for.
+
+    Returns:
+        tuple[CameraMode, float]: The negotiated mode and the measured frames per second.
+    """
+    capture = cv2.VideoCapture(camera_id)
+    try:
+        apply_camera_mode(capture, camera_mode)
+        negotiated_mode = get_negotiated_mode(capture)
+        capture.read()
+        frame_count = 0
+        start_time = time.perf_counter()
+        while time.perf_counter() - start_time < duration_seconds:
+            ret, _ = capture.read()
+            if ret:
+                frame_count += 1
+        elapsed_time = time.perf_counter() - start_time
+    finally:
+        capture.release()
+    return negotiated_mode, frame_count / elapsed_time
+
+
+def main() -> None:
+    """Benchmark raw capture throughput for every mode a camera supports."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark raw capture throughput for each camera mode."
+    )
+    parser.add_argument("camera_id", type=int, help="Index of the camera to probe.")
+    parser.add_argument(
+        "--seconds", type=float, default=3.0, help="Capture duration per mode."
+    )
+    parser.add_argument(
+        "--pixel-format", default=None, help="Only benchmark this pixel format."
+    )
+    arguments = parser.parse_args()
+
+    modes = probe_camera_modes(arguments.camera_id)
+    if arguments.pixel_format is not None:
+        modes = [mode for mode in modes if mode.pixel_format == arguments.pixel_format]
+    if not modes:
+        print("No camera modes found.")
+        return
+
+    print(f"{'Requested':<28}{'Negotiated':<28}{'Measured fps':>12}")
+    for camera_mode in modes:
+        negotiated_mode, measured_fps = benchmark_camera_mode(
+            arguments.camera_id, camera_mode, arguments.seconds
+        )
+        print(f"{str(camera_mode):<28}{str(negotiated_mode):<28}{measured_fps:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
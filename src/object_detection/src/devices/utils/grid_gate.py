@@ -0,0 +1,143 @@
+import numpy as np
+import torch
+from torch import nn
+from torchvision import transforms
+
+from src.devices.utils.cameras.frame import Frame
+from src.math_conversions import calculate_grid_regions
+
+GRID_WIDTH = 20
+GRID_HEIGHT = 20
+GRID_INPUT_SIZE = (320, 320)
+
+
+class GridPredictor(nn.Module):
+    """A small CNN scoring which cells of a GRID_HEIGHT×GRID_WIDTH grid contain a game piece."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(3, 8, kernel_size=3, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(2),
+            nn.Conv2d(8, 16, kernel_size=3, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(2),
+            nn.Conv2d(16, 32, kernel_size=3, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2d(2),
+        )
+        self.classifier = nn.Conv2d(32, 1, kernel_size=1)
+        self.pool = nn.AdaptiveMaxPool2d((GRID_HEIGHT, GRID_WIDTH))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Args:
+            x (torch.Tensor): Input tensor of shape (N, 3, H, W).
+
+        Returns:
+            torch.Tensor: Cell logits of shape (N, GRID_HEIGHT, GRID_WIDTH).
+        """
+        x = self.features(x)
+        x = self.classifier(x)
+        x = self.pool(x)
+        return x.squeeze(1)
+
+
+def create_occupancy_grid(boxes: np.ndarray) -> np.ndarray:
+    """
+    Marks every grid cell a box overlaps.
+
+    Args:
+        boxes (np.ndarray): Boxes with shape (N, 4) as normalized [x1, y1, x2, y2].
+
+    Returns:
+        np.ndarray: A float32 grid with shape (GRID_HEIGHT, GRID_WIDTH) of 0s and 1s.
+    """
+    occupancy_grid = np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.float32)
+    for x1, y1, x2, y2 in np.clip(boxes, 0, 1):
+        first_column = min(int(x1 * GRID_WIDTH), GRID_WIDTH - 1)
+        first_row = min(int(y1 * GRID_HEIGHT), GRID_HEIGHT - 1)
+        last_column = min(int(np.ceil(x2 * GRID_WIDTH)), GRID_WIDTH)
+        last_row = min(int(np.ceil(y2 * GRID_HEIGHT)), GRID_HEIGHT)
+        occupancy_grid[
+            first_row : max(last_row, first_row + 1),
+            first_column : max(last_column, first_column + 1),
+        ] = 1
+    return occupancy_grid
+
+
+def image_to_tensor(image: np.ndarray) -> torch.Tensor:
+    """
+    Converts a BGR image already resized to GRID_INPUT_SIZE into the model's input.
+
+    Args:
+        image (np.ndarray): The resized image.
+
+    Returns:
+        torch.Tensor: A float tensor of shape (3, H, W) in [0, 1].
+    """
+    return transforms.functional.to_tensor(image)
+
+
+class GridGate:
+    """Finds the regions of a frame worth running YOLO on with a GridPredictor."""
+
+    def __init__(
+        self,
+        model_path: str,
+        threshold: float = 0.3,
+        padding: int = 16,
+        min_region_size: int = 96,
+    ) -> None:
+        """
+        Args:
+            model_path (str): The path to the trained GridPredictor weights.
+            threshold (float): The cell probability above which a cell is occupied.
+            padding (int): Pixels added around every group of occupied cells.
+            min_region_size (int): The smallest region side in pixels.
+        """
+        self.threshold = threshold
+        self.padding = padding
+        self.min_region_size = min_region_size
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+        self.model = GridPredictor().to(self.device)
+        try:
+            self.model.load_state_dict(torch.load(model_path, map_location=self.device))
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Grid predictor not found at {model_path}") from e
+        self.model.eval()
+
+    def get_occupancy_grid(self, frame: Frame) -> np.ndarray:
+        """
+        Scores every grid cell of a frame.
+
+        Args:
+            frame (Frame): The frame to score.
+
+        Returns:
+            np.ndarray: Cell probabilities with shape (GRID_HEIGHT, GRID_WIDTH).
+        """
+        tensor = image_to_tensor(frame.get_resized(GRID_INPUT_SIZE))
+        with torch.no_grad():
+            logits = self.model(tensor.unsqueeze(0).to(self.device))
+        return torch.sigmoid(logits)[0].cpu().numpy()
+
+    def get_regions(self, frame: Frame) -> list[tuple[int, int, int, int]]:
+        """
+        Finds the regions of a frame that may contain a game piece.
+
+        Args:
+            frame (Frame): The frame to gate.
+
+        Returns:
+            list[tuple[int, int, int, int]]: The regions as (x1, y1, x2, y2), empty
+                if the frame has no game pieces.
+        """
+        return calculate_grid_regions(
+            self.get_occupancy_grid(frame) >= self.threshold,
+            frame.get_size(),
+            self.padding,
+            self.min_region_size,
+        )
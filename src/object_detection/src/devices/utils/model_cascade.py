@@ -0,0 +1,313 @@
+from typing import Callable
+
+import numpy as np
+import torch
+from torchvision.ops import box_iou
+from ultralytics import YOLO
+from ultralytics.engine.results import Results
+
+from src.devices.utils.cameras.frame import Frame
+from src.utils.results_merging import merge_results, shift_results
+
+AMBIGUOUS_IOU = 0.5
+LOST_MATCH_IOU = 0.3
+CROP_MATCH_IOU = 0.3
+
+
+def _get_unmatched_mask(
+    boxes: torch.Tensor, reference_boxes: torch.Tensor
+) -> torch.Tensor:
+    """
+    Flag boxes that overlap none of the reference boxes.
+
+    Args:
+        boxes (torch.Tensor): Boxes with shape (N, 4+) as [x1, y1, x2, y2, ...].
+        reference_boxes (torch.Tensor): Boxes with shape (M, 4+).
+
+    Returns:
+        torch.Tensor: A boolean mask with shape (N,) on the CPU.
+    """
+    if not len(boxes) or not len(reference_boxes):
+        return torch.ones(len(boxes), dtype=torch.bool)
+    overlaps = box_iou(boxes[:, :4].float().cpu(), reference_boxes[:, :4].float().cpu())
+    return overlaps.max(dim=1).values <= LOST_MATCH_IOU
+
+
+class ModelCascade:
+    """Re-scores uncertain regions of a fast model's result with a larger model."""
+
+    def __init__(
+        self,
+        model_path: str,
+        class_thresholds: dict[str, dict],
+        log: Callable,
+        crop_padding: float = 0.5,
+        min_crop_size: int = 64,
+        input_size: int = 256,
+        lost_frames: int = 3,
+    ) -> None:
+        """
+        Args:
+            model_path (str): The path to the larger YOLO model, trained on the same classes.
+            class_thresholds (dict[str, dict]): Per class name 'low' and 'high'
+                confidences, with a 'default' entry for other classes. Boxes of the
+                fast model below 'low' are dropped, at or above 'high' are kept, and
+                in between are re-scored. The larger model's boxes need 'high'.
+            log (Callable): A callable logger function.
+            crop_padding (float): Padding added around each box as a fraction of its size.
+            min_crop_size (int): The smallest crop side in pixels.
+            input_size (int): The input size the larger model runs crops at.
+            lost_frames (int): How many frames the region of a lost piece is re-scored.
+        """
+        self.class_thresholds = class_thresholds
+        self.log = log
+        self.crop_padding = crop_padding
+        self.min_crop_size = min_crop_size
+        self.input_size = input_size
+        self.lost_frames = lost_frames
+
+        self.log(f"Loading cascade model from {model_path}")
+        self.model = YOLO(model_path, task="detect")
+        self.previous_boxes: dict[str, torch.Tensor] = {}
+        self.lost_regions: dict[str, list[tuple[np.ndarray, int]]] = {}
+
+    def get_thresholds(self, class_name: str) -> tuple[float, float]:
+        """
+        Returns the (low, high) confidences of a class.
+        """
+        thresholds = self.class_thresholds.get(
+            class_name, self.class_thresholds["default"]
+        )
+        return thresholds["low"], thresholds["high"]
+
+    def get_min_confidence(self, confidence_threshold: float | None = None) -> float:
+        """
+        Returns the confidence the fast model has to run at so no candidate is lost.
+
+        Args:
+            confidence_threshold (float | None): A confidence override, e.g. of the
+                latency governor, that raises every class' low confidence.
+        """
+        min_confidence = min(
+            thresholds["low"] for thresholds in self.class_thresholds.values()
+        )
+        if confidence_threshold is None:
+            return min_confidence
+        return max(min_confidence, confidence_threshold)
+
+    def refine(
+        self,
+        result: Results,
+        frame: Frame,
+        infer_device: str,
+        confidence_threshold: float | None = None,
+    ) -> Results:
+        """
+        Keep confident boxes and re-score the rest with the larger model in one batch.
+
+        Every crop only keeps the larger model's box that best matches the box it
+        was cropped for, so neighbouring pieces inside the padding are not added.
+
+        Args:
+            result (Results): The fast model's full frame result.
+            frame (Frame): The frame the result belongs to.
+            infer_device (str): The device string passed to `predict`.
+            confidence_threshold (float | None): A confidence override that raises
+                every class' low confidence.
+
+        Returns:
+            Results: Confident boxes of both models with duplicates suppressed.
+        """
+        boxes_data = result.boxes.data
+        low_thresholds, high_thresholds = self._get_box_thresholds(
+            boxes_data, result.names
+        )
+        if confidence_threshold is not None:
+            low_thresholds = low_thresholds.clamp(min=confidence_threshold)
+        candidate_mask = boxes_data[:, 4] >= low_thresholds
+        boxes_data = boxes_data[candidate_mask]
+        high_thresholds = high_thresholds[candidate_mask]
+
+        accepted_mask = boxes_data[:, 4] >= high_thresholds
+        rescore_mask = ~accepted_mask | self._get_ambiguous_mask(boxes_data)
+        rescore_boxes = boxes_data[rescore_mask, :4].cpu().numpy()
+        lost_boxes = self._update_lost_regions(frame.camera_name, boxes_data)
+        crop_boxes = list(rescore_boxes) + lost_boxes
+        crop_regions = [
+            self._get_crop_region(box, frame.get_size()) for box in crop_boxes
+        ]
+
+        accepted_results = Results(
+            frame.image,
+            path=result.path,
+            names=result.names,
+            boxes=boxes_data[accepted_mask & ~rescore_mask],
+        )
+        accepted_results.speed = result.speed
+        if not crop_regions:
+            self.previous_boxes[frame.camera_name] = accepted_results.boxes.data
+            return accepted_results
+
+        crop_results = self.model.predict(
+            [
+                np.ascontiguousarray(frame.image[top:bottom, left:right])
+                for left, top, right, bottom in crop_regions
+            ],
+            show=False,
+            device=infer_device,
+            conf=min(
+                thresholds["high"] for thresholds in self.class_thresholds.values()
+            ),
+            imgsz=self.input_size,
+            verbose=False,
+            iou=0.5,
+        )
+        rescored_results = []
+        for crop_result, crop_region, crop_box in zip(
+            crop_results, crop_regions, crop_boxes
+        ):
+            shifted_result = shift_results(crop_result, crop_region[:2], frame.image)
+            _, crop_high_thresholds = self._get_box_thresholds(
+                shifted_result.boxes.data, shifted_result.names
+            )
+            confident_boxes = shifted_result.boxes.data[
+                shifted_result.boxes.data[:, 4] >= crop_high_thresholds
+            ]
+            rescored_results.append(
+                Results(
+                    frame.image,
+                    path=result.path,
+                    names=result.names,
+                    boxes=self._get_matching_box(confident_boxes, crop_box).to(
+                        boxes_data.device
+                    ),
+                )
+            )
+
+        merged_results = merge_results(
+            [accepted_results] + rescored_results, frame.image, 0.5
+        )
+        merged_results.speed = result.speed
+        self.previous_boxes[frame.camera_name] = merged_results.boxes.data
+        return merged_results
+
+    def _get_box_thresholds(
+        self, boxes_data: torch.Tensor, class_names: dict[int, str]
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Look up the low and high confidence of every box's class.
+
+        Args:
+            boxes_data (torch.Tensor): Boxes with shape (N, 6) as [x1, y1, x2, y2, conf, cls].
+            class_names (dict[int, str]): Class IDs to class names.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The low and high confidences with shape (N,).
+        """
+        thresholds = [
+            self.get_thresholds(class_names[int(class_id)])
+            for class_id in boxes_data[:, 5].tolist()
+        ]
+        thresholds_tensor = torch.tensor(
+            thresholds, dtype=boxes_data.dtype, device=boxes_data.device
+        ).reshape(-1, 2)
+        return thresholds_tensor[:, 0], thresholds_tensor[:, 1]
+
+    @staticmethod
+    def _get_matching_box(boxes_data: torch.Tensor, box: np.ndarray) -> torch.Tensor:
+        """
+        Pick the box that best overlaps the box a crop was made for.
+
+        Args:
+            boxes_data (torch.Tensor): The crop's boxes with shape (N, 6) in frame
+                coordinates.
+            box (np.ndarray): The box the crop was made for as [x1, y1, x2, y2].
+
+        Returns:
+            torch.Tensor: The best matching box with shape (1, 6), or no boxes if
+                none overlaps by more than `CROP_MATCH_IOU`.
+        """
+        if not len(boxes_data):
+            return boxes_data
+        overlaps = box_iou(
+            boxes_data[:, :4].float().cpu(),
+            torch.from_numpy(np.asarray(box, dtype=np.float32))[None],
+        )[:, 0]
+        best_index = int(overlaps.argmax())
+        if overlaps[best_index] <= CROP_MATCH_IOU:
+            return boxes_data[:0]
+        return boxes_data[best_index : best_index + 1]
+
+    @staticmethod
+    def _get_ambiguous_mask(boxes_data: torch.Tensor) -> torch.Tensor:
+        """
+        Flag boxes that overlap a box of another class.
+
+        Args:
+            boxes_data (torch.Tensor): Boxes with shape (N, 6).
+
+        Returns:
+            torch.Tensor: A boolean mask with shape (N,).
+        """
+        overlaps = box_iou(boxes_data[:, :4], boxes_data[:, :4]) > AMBIGUOUS_IOU
+        different_classes = boxes_data[:, 5][:, None] != boxes_data[:, 5][None, :]
+        return (overlaps & different_classes).any(dim=1)
+
+    def _update_lost_regions(
+        self, camera_name: str, boxes_data: torch.Tensor
+    ) -> list[np.ndarray]:
+        """
+        Track previously reported boxes that have no match in the current frame.
+
+        Args:
+            camera_name (str): The camera the boxes belong to.
+            boxes_data (torch.Tensor): The fast model's boxes above their low confidence.
+
+        Returns:
+            list[np.ndarray]: The [x1, y1, x2, y2] regions of pieces recently lost.
+        """
+        lost_regions = []
+        previous_boxes = self.previous_boxes.get(camera_name)
+        if previous_boxes is not None:
+            lost_boxes = previous_boxes[:, :4].cpu()
+            lost_boxes = lost_boxes[_get_unmatched_mask(lost_boxes, boxes_data)]
+            lost_regions = [(box, self.lost_frames) for box in lost_boxes.numpy()]
+
+        for box, remaining_frames in self.lost_regions.get(camera_name, []):
+            if remaining_frames <= 1:
+                continue
+            box_tensor = torch.from_numpy(box)[None]
+            if _get_unmatched_mask(box_tensor, boxes_data)[0] and all(
+                _get_unmatched_mask(box_tensor, torch.from_numpy(lost_box)[None])[0]
+                for lost_box, _ in lost_regions
+            ):
+                lost_regions.append((box, remaining_frames - 1))
+
+        self.lost_regions[camera_name] = lost_regions
+        return [box for box, _ in lost_regions]
+
+    def _get_crop_region(
+        self, box: np.ndarray, frame_size: tuple[int, int]
+    ) -> tuple[int, int, int, int]:
+        """
+        Pad a box into the crop the larger model sees.
+
+        Args:
+            box (np.ndarray): The box as [x1, y1, x2, y2].
+            frame_size (tuple[int, int]): The (width, height) of the frame.
+
+        Returns:
+            tuple[int, int, int, int]: The crop as (x1, y1, x2, y2), inside the frame.
+        """
+        center_x, center_y = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+        crop_width = max(
+            (box[2] - box[0]) * (1 + 2 * self.crop_padding), self.min_crop_size
+        )
+        crop_height = max(
+            (box[3] - box[1]) * (1 + 2 * self.crop_padding), self.min_crop_size
+        )
+        left = int(np.clip(center_x - crop_width / 2, 0, frame_size[0] - 1))
+        top = int(np.clip(center_y - crop_height / 2, 0, frame_size[1] - 1))
+        right = int(np.clip(center_x + crop_width / 2, left + 1, frame_size[0]))
+        bottom = int(np.clip(center_y + crop_height / 2, top + 1, frame_size[1]))
+        return left, top, right, bottom
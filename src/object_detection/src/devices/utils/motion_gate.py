@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from time import time
+
+import cv2
+import numpy as np
+
+from src.devices.utils.cameras.frame import Frame
+
+THUMBNAIL_SIZE = (64, 48)
+
+
+@dataclass
+class _MotionReference:
+    """The frame thumbnail and robot pose of a camera's last inference."""
+
+    thumbnail: np.ndarray
+    robot_pose: np.ndarray | None
+    inference_time: float
+
+
+class MotionGate:
+    """Decides whether a frame differs enough from the last inferred one to run the model."""
+
+    def __init__(
+        self,
+        difference_threshold: float,
+        pose_threshold: float,
+        rotation_threshold: float,
+        refresh_interval: float,
+    ) -> None:
+        """
+        Args:
+            difference_threshold (float): Mean absolute grayscale difference (0-255)
+                of the letterboxed thumbnails above which the scene counts as changed.
+            pose_threshold (float): Robot translation in meters since the last
+                inference above which the scene counts as changed.
+            rotation_threshold (float): Robot rotation in degrees since the last
+                inference above which the scene counts as changed.
+            refresh_interval (float): Seconds after which inference runs even if
+                nothing changed.
+        """
+        self.difference_threshold = difference_threshold
+        self.pose_threshold = pose_threshold
+        self.rotation_threshold = np.radians(rotation_threshold)
+        self.refresh_interval = refresh_interval
+        self.references: dict[str, _MotionReference] = {}
+
+    def should_infer(self, frame: Frame, robot_pose: np.ndarray | None) -> bool:
+        """
+        Check whether a frame needs inference, recording it as the new reference if so.
+
+        Args:
+            frame (Frame): The new frame.
+            robot_pose (np.ndarray | None): The robot pose as [x, y, rotation], if known.
+
+        Returns:
+            bool: False if the previous detections of this camera can be reused.
+        """
+        thumbnail = frame.get_letterbox(THUMBNAIL_SIZE)
+        reference = self.references.get(frame.camera_name)
+        if reference is not None and not self._has_changed(
+            reference, thumbnail, robot_pose
+        ):
+            return False
+
+        self.references[frame.camera_name] = _MotionReference(
+            thumbnail, None if robot_pose is None else robot_pose.copy(), time()
+        )
+        return True
+
+    def _has_changed(
+        self,
+        reference: _MotionReference,
+        thumbnail: np.ndarray,
+        robot_pose: np.ndarray | None,
+    ) -> bool:
+        """
+        Compare a frame and pose against the camera's last inference.
+
+        Args:
+            reference (_MotionReference): The state at the last inference.
+            thumbnail (np.ndarray): The downsampled grayscale new frame.
+            robot_pose (np.ndarray | None): The current robot pose.
+
+        Returns:
+            bool: True if the refresh interval passed, the robot moved or the image changed.
+        """
+        if time() - reference.inference_time >= self.refresh_interval:
+            return True
+
+        if robot_pose is not None and reference.robot_pose is not None:
+            translation = np.linalg.norm(robot_pose[:2] - reference.robot_pose[:2])
+            rotation = abs(
+                np.arctan2(
+                    np.sin(robot_pose[2] - reference.robot_pose[2]),
+                    np.cos(robot_pose[2] - reference.robot_pose[2]),
+                )
+            )
+            if translation > self.pose_threshold or rotation > self.rotation_threshold:
+                return True
+
+        difference = cv2.absdiff(thumbnail, reference.thumbnail)
+        return float(np.mean(difference)) > self.difference_threshold
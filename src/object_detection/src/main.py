@@ -15,26 +15,32 @@ from src.constants.constants import constants
 logger = Logger(None)
 log = logger.log
 
-# run web server that streams video
-if constants["DisplayConstants.run_web_server"]:
-    from webui.web_server import EagleEyeInterface
+# run web server that streams video, but not again in spawned device workers
+if __name__ == "__main__" and constants["DisplayConstants.run_web_server"]:
+    if constants.get_value("DisplayConstants.web_process", False):
+        from webui.web_interface_process import (
+            WebInterfaceProcess as EagleEyeInterface,
+        )
+    elif constants.get_value("DisplayConstants.web_backend", "flask") == "aiohttp":
+        from webui.async_web_server import AsyncEagleEyeInterface as EagleEyeInterface
+    else:
+        from webui.web_server import EagleEyeInterface
 
     web_interface = EagleEyeInterface(settings_object=constants, log=log)
 else:
     web_interface = None
 
 import numpy as np
+from src.detection_processing import get_robot_pose, process_detections
+from src.devices.device_process import DeviceProcess
 from src.devices.simple_device import SimpleDevice
-from src.math_conversions import (
-    calculate_local_position,
-    convert_to_global_position,
-    pixels_to_degrees,
-)
-from src.utils.results_to_image import results_to_image
+from src.utils.latency_governor import create_latency_governor
+from src.utils.power_mode_manager import PowerModeManager
+from src.math_conversions import get_rotation_matrix
+from src.utils.annotation_renderer import AnnotationRenderer
 from time import sleep, time
 from threading import Thread, Lock
 from networktables import NetworkTables
-import struct
 
 # ANSI color codes
 RED = "\033[91m"
@@ -42,10 +48,12 @@ GREEN = "\033[92m"
 RESET = "\033[0m"
 
 # As a client to connect to a robot
-NetworkTables.initialize(server=constants["NetworkTableConstants.server_address"])
+if __name__ == "__main__":
+    NetworkTables.initialize(server=constants["NetworkTableConstants.server_address"])
 game_piece_nt = NetworkTables.getTable("GamePieces")
 eagle_eye_nt = NetworkTables.getTable("EagleEye")
 advantage_kit_nt = NetworkTables.getTable("AdvantageKit")
+fms_info_nt = NetworkTables.getTable("FMSInfo")
 
 
 def time_ms():
@@ -56,15 +64,26 @@ class EagleEye:
     def __init__(self):
         model_path = self._select_model_path()
         cameras = self._group_cameras_by_device()
-        self.devices = self._initialize_devices_and_cameras(cameras, model_path)
         self.data = {}
         self.data_lock = Lock()
-        self._start_detection_threads()
+        self.power_mode_manager = None
+        if constants["Constants.process_per_device"]:
+            self.devices = self._start_device_processes(cameras, model_path)
+            self._start_power_mode_manager()
+            self._start_device_process_threads()
+        else:
+            self.devices = self._initialize_devices_and_cameras(cameras, model_path)
+            self._start_power_mode_manager()
+            self._start_detection_threads()
         class_names = self._aggregate_class_names()
         sleep(1)
         log("All threads running")
         game_piece_nt.putStringArray("class_names", class_names)
-        self._main_detection_loop(class_names)
+        try:
+            self._main_detection_loop(class_names)
+        finally:
+            self._stop_device_processes()
+            self._stop_web_process()
 
     def _select_model_path(self) -> str:
         model_paths = [
@@ -90,16 +109,62 @@ class EagleEye:
     def _initialize_devices_and_cameras(self, cameras: dict, model_path: str) -> list:
         devices = []
         for device, camera_list in cameras.items():
-            device = SimpleDevice(
-                "gpu", model_path, log, eagle_eye_nt, len(self.devices)
-            )
+            device = SimpleDevice("gpu", model_path, log, eagle_eye_nt, len(devices))
             for camera in camera_list:
                 device.add_camera(camera)
                 web_interface.serve_camera_feed(camera["name"])
             devices.append(device)
-        log(f"{len(self.devices)} devices started")
+        log(f"{len(devices)} devices started")
+        return devices
+
+    def _start_device_processes(
+        self, cameras: dict, model_path: str
+    ) -> list[DeviceProcess]:
+        devices = []
+        for camera_list in cameras.values():
+            device = DeviceProcess("gpu", model_path, camera_list, log, len(devices))
+            device.start()
+            devices.append(device)
+            for camera in camera_list:
+                web_interface.serve_camera_feed(camera["name"])
+
+        for device in devices:
+            if not device.wait_until_ready():
+                log(f"{RED}Device:{device.device_index} worker did not start{RESET}")
+        log(f"{len(devices)} device processes started")
         return devices
 
+    def _start_power_mode_manager(self):
+        if not constants["PowerModeConstants.power_modes"]:
+            return
+        self.power_mode_manager = PowerModeManager(
+            fms_info_nt,
+            constants["PowerModeConstants.profiles"] or {},
+            log,
+            eagle_eye_nt,
+        )
+        self.power_mode_manager.add_listener(self._apply_power_mode)
+
+    def _apply_power_mode(self, mode: str, profile: dict):
+        log(f"Applying power mode {mode}: {profile}")
+        for device in self.devices:
+            if isinstance(device, SimpleDevice):
+                device.apply_power_profile(profile)
+        if web_interface is not None:
+            web_interface.set_stream_fps(profile["web_fps"])
+
+    def _stop_device_processes(self):
+        for device in self.devices:
+            if isinstance(device, DeviceProcess):
+                device.stop()
+
+    @staticmethod
+    def _stop_web_process():
+        if web_interface is not None and constants.get_value(
+            "DisplayConstants.web_process", False
+        ):
+            web_interface.stop()
+
     def _start_detection_threads(self):
         detection_threads = []
         for device in self.devices:
@@ -107,6 +172,12 @@ class EagleEye:
             detection_threads.append(t)
             t.start()
 
+    def _start_device_process_threads(self):
+        for device in self.devices:
+            Thread(
+                target=self.device_process_thread, args=(device,), daemon=True
+            ).start()
+
     def _aggregate_class_names(self) -> list:
         class_names = []
         for device in self.devices:
@@ -118,11 +189,13 @@ class EagleEye:
             collected_detections, num_detections = self._collect_detections()
             if num_detections == 0:
                 self._reset_network_tables(class_names)
+                self._publish_detections({})
                 sleep(0.016)
                 continue
             self._sort_detections_by_distance(collected_detections)
             self._filter_close_detections(collected_detections)
             self._update_network_tables(collected_detections)
+            self._publish_detections(collected_detections)
             sleep(0.016)
 
     def _collect_detections(self) -> tuple[dict, int]:
@@ -172,6 +245,11 @@ class EagleEye:
                             detections.pop(j)
                             break
 
+    @staticmethod
+    def _publish_detections(collected_detections: dict):
+        if constants["DisplayConstants.run_web_server"]:
+            web_interface.publish_detections(collected_detections)
+
     def _update_network_tables(self, collected_detections: dict):
         for class_name, detections in collected_detections.items():
             game_piece_nt.putNumberArray(
@@ -205,25 +283,100 @@ class EagleEye:
                 [detection["ratio"] for detection in detections],
             )
 
+    def device_process_thread(self, device: DeviceProcess):
+        while True:
+            message = device.receive()
+            if message is not None:
+                self._handle_device_message(message)
+            if constants["DisplayConstants.run_web_server"]:
+                # Asked only after publishing, so the frame just received counts
+                # towards the web interface's frame interval.
+                device.set_client_overlays(web_interface.uses_client_overlays())
+                device.set_frame_wanted(
+                    any(
+                        web_interface.wants_frame(camera["name"])
+                        for camera in device.camera_list
+                    )
+                )
+
+    def _handle_device_message(self, message: tuple) -> None:
+        camera_name, detections, annotated_image, frame_info = message
+        sequence_number, frame_size, estimated_fps = frame_info
+        with self.data_lock:
+            self.data[camera_name] = detections
+        if (
+            constants["DisplayConstants.run_web_server"]
+            and web_interface.uses_client_overlays()
+        ):
+            web_interface.update_detections(
+                camera_name, sequence_number, frame_size, detections, estimated_fps
+            )
+        if annotated_image is not None:
+            web_interface.update_camera_frame(camera_name, annotated_image)
+
+    @staticmethod
+    def _publish_to_web_interface(
+        annotation_renderer: AnnotationRenderer,
+        camera_name: str,
+        frame,
+        frame_size: tuple[int, int],
+        results,
+        detections: list[dict],
+        estimated_fps: float,
+    ):
+        client_side_overlays = web_interface.uses_client_overlays()
+        if client_side_overlays:
+            web_interface.update_detections(
+                camera_name,
+                frame.sequence_number,
+                get_rotation_matrix(frame_size, frame.rotation)[1],
+                detections,
+                estimated_fps,
+            )
+        if not web_interface.wants_frame(camera_name):
+            return
+        web_interface.update_camera_frame(
+            camera_name,
+            (
+                annotation_renderer.render_raw(frame, frame.rotation)
+                if client_side_overlays
+                else annotation_renderer.render(
+                    frame=frame,
+                    results=results,
+                    fps=estimated_fps,
+                    detections=detections,
+                    rotation=frame.rotation,
+                )
+            ),
+        )
+
     @profile
     def detection_thread(self, device: SimpleDevice):
         log(f"Starting thread for {device.get_current_camera().get_name()} camera")
         estimated_fps = 0
+        last_frame_time = 0.0
+        annotation_renderer = AnnotationRenderer()
+        latency_governor = create_latency_governor(
+            constants["LatencyGovernorConstants"],
+            constants["ObjectDetectionConstants.input_size"],
+            log,
+            eagle_eye_nt,
+            device.device_index,
+            device.has_dynamic_input_size(),
+        )
+        if latency_governor is not None:
+            device.use_latency_governor(latency_governor)
         while True:
+            if self.power_mode_manager is not None:
+                self.power_mode_manager.wait_for_next_frame(last_frame_time)
+                last_frame_time = time()
             start_time = time_ms()
-            robot_pose = np.array(
-                struct.unpack(
-                    "ddd",
-                    advantage_kit_nt.getValue(
-                        "RealOutputs/Odometry/Robot", np.array([0, 0, 0])
-                    ),
-                )
-            )
-            results, frame_size, frame = device.detect()
+            robot_pose = get_robot_pose(advantage_kit_nt)
+            results, frame_size, frame = device.detect(robot_pose)
 
             if results is None:
                 log(
-                    f"{RED}No frame{RESET}",
+                    f"{RED}No new frame{RESET}",
                     force_no_log=(not constants["Constants"]["detection_logging"]),
                 )
                 sleep(0.002)
@@ -239,77 +392,38 @@ class EagleEye:
                 with self.data_lock:
                     self.data[device.get_current_camera().get_name()] = []
                 if constants["DisplayConstants.run_web_server"]:
-                    estimated_fps = int(1000 / (time_ms() - start_time))
-                    web_interface.update_camera_frame(
+                    estimated_fps = int(1000 / max(time_ms() - start_time, 1))
+                    self._publish_to_web_interface(
+                        annotation_renderer,
                         device.get_current_camera().get_name(),
-                        results_to_image(frame=frame, results=[], fps=estimated_fps),
+                        frame,
+                        frame_size,
+                        None,
+                        [],
+                        estimated_fps,
                     )
                 sleep(0.002)
                 continue
 
-            detections = []
-            debug_points = []
-
-            for box in results.boxes:
-                box_class = device.get_class_names()[int(box.cls[0])]
-                box_confidence = box.conf.tolist()[0]
-                box_lx = box.xyxy.tolist()[0][0]
-                box_bottom_center_y = box.xyxy.tolist()[0][3]
-
-                box_rx = box.xyxy.tolist()[0][2]
-
-                box_width = box_rx - box_lx
-                box_height = box_bottom_center_y - box.xyxy.tolist()[0][1]
-                box_ratio = box_width / box_height
-
-                box_bottom_center_x = (box_lx + box_rx) / 2
-
-                debug_points.append(
-                    [int(box_bottom_center_x), int(box_bottom_center_y)]
-                )
-
-                # make pixel positions relative to the center
-                box_bottom_center_x -= frame_size[0] // 2
-                box_bottom_center_y -= frame_size[1] // 2
-                box_bottom_center_y = -box_bottom_center_y
-
-                yaw_angle = pixels_to_degrees(
-                    box_bottom_center_x,
-                    frame_size[0],
-                    float(device.get_current_camera().get_fov()[0]),
-                    log,
-                )
-                object_local_position = calculate_local_position(
-                    np.array([box_bottom_center_x, box_bottom_center_y]),
-                    frame_size,
-                    device.get_current_camera().get_fov(),
-                    device.get_current_camera().get_camera_offset_pos(),
-                    log,
-                )
-                object_global_position = convert_to_global_position(
-                    object_local_position, robot_pose
-                )
-
-                distance = np.linalg.norm(object_local_position)
-                if distance > constants["ObjectDetectionConstants.max_distance"]:
-                    continue
-
-                detections.append(
-                    {
-                        "class": box_class,
-                        "confidence": box_confidence,
-                        "yaw_angle": yaw_angle,
-                        "local_position": object_local_position,
-                        "global_position": object_global_position,
-                        "distance": distance,
-                        "ratio": box_ratio,
-                    }
-                )
+            detections = process_detections(
+                results,
+                frame_size,
+                frame,
+                device.get_current_camera(),
+                device.get_class_names(),
+                robot_pose,
+                log,
+            )
 
             if constants["DisplayConstants.run_web_server"]:
-                web_interface.update_camera_frame(
+                self._publish_to_web_interface(
+                    annotation_renderer,
                     device.get_current_camera().get_name(),
-                    results_to_image(frame=frame, results=results, fps=estimated_fps),
+                    frame,
+                    frame_size,
+                    results,
+                    detections,
+                    estimated_fps,
                 )
 
             with self.data_lock:
@@ -331,6 +445,10 @@ class EagleEye:
                 f"Estimated fps: {estimated_fps}",
                 force_no_log=(not constants["Constants"]["detection_logging"]),
             )
+            log(
+                f"Frame {frame.sequence_number} age (ms): {frame.get_age_ms()}",
+                force_no_log=(not constants["Constants"]["detection_logging"]),
+            )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
+import cv2
 import numpy as np
 
+FOV_CORRECTION_FACTOR = 1.3312675733
+
 
 def rotate2d(point: np.array, angle: float) -> np.array:
     """
@@ -67,11 +70,11 @@ def calculate_local_position(
     """
     screen_angle_x = (
         pixels_to_degrees(pixel_position[0], total_pixels[0], camera_fov[0], log=log)
-        * 1.3312675733
+        * FOV_CORRECTION_FACTOR
     )
     screen_angle_y = (
         pixels_to_degrees(pixel_position[1], total_pixels[1], camera_fov[1], log=log)
-        * 1.3312675733
+        * FOV_CORRECTION_FACTOR
     )
     flat_distance = camera_offset_pos[2] * np.tan(np.radians(90 + screen_angle_y))
     return rotate2d([flat_distance, 0], np.radians(-screen_angle_x)) + np.array(
@@ -93,3 +96,295 @@ def convert_to_global_position(
         np.array: The global position of the note as [x, y].
     """
     return rotate2d(local_position, robot_pose[2]) + robot_pose[:2]
+
+
+def get_rotation_matrix(
+    frame_size: tuple[int, int], angle: float
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Builds the affine transform used by `imutils.rotate_bound` for a frame.
+
+    Args:
+        frame_size (tuple[int, int]): The size of the unrotated frame as (width, height).
+        angle (float): The clockwise rotation in degrees.
+
+    Returns:
+        tuple[np.ndarray, tuple[int, int]]: The 2x3 affine matrix mapping unrotated pixel
+            coordinates to rotated ones, and the rotated frame size as (width, height).
+    """
+    width, height = frame_size
+    center_x, center_y = width / 2, height / 2
+    cos = np.cos(np.radians(-angle))
+    sin = np.sin(np.radians(-angle))
+
+    rotated_width = int(height * abs(sin) + width * abs(cos))
+    rotated_height = int(height * abs(cos) + width * abs(sin))
+
+    rotation_matrix = np.array(
+        [
+            [cos, sin, (1 - cos) * center_x - sin * center_y],
+            [-sin, cos, sin * center_x + (1 - cos) * center_y],
+        ]
+    )
+    rotation_matrix[0, 2] += rotated_width / 2 - center_x
+    rotation_matrix[1, 2] += rotated_height / 2 - center_y
+    return rotation_matrix, (rotated_width, rotated_height)
+
+
+def unrotate_region(
+    region: tuple[int, int, int, int], frame_size: tuple[int, int], angle: float
+) -> tuple[int, int, int, int]:
+    """
+    Maps a region of the rotated frame back to the unrotated frame.
+
+    Args:
+        region (tuple[int, int, int, int]): The region in the rotated frame as (x1, y1, x2, y2).
+        frame_size (tuple[int, int]): The size of the unrotated frame as (width, height).
+        angle (float): The clockwise rotation in degrees.
+
+    Returns:
+        tuple[int, int, int, int]: The axis aligned bounds of the region in the
+            unrotated frame, clipped to the frame, as (x1, y1, x2, y2).
+    """
+    rotation_matrix, _ = get_rotation_matrix(frame_size, angle)
+    inverse_matrix = cv2.invertAffineTransform(rotation_matrix)
+    x1, y1, x2, y2 = region
+    corners = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.float64)
+    unrotated_corners = corners @ inverse_matrix[:, :2].T + inverse_matrix[:, 2]
+    lower = np.floor(unrotated_corners.min(axis=0))
+    upper = np.ceil(unrotated_corners.max(axis=0))
+    return (
+        int(np.clip(lower[0], 0, frame_size[0])),
+        int(np.clip(lower[1], 0, frame_size[1])),
+        int(np.clip(upper[0], 0, frame_size[0])),
+        int(np.clip(upper[1], 0, frame_size[1])),
+    )
+
+
+def calculate_horizon_crop_row(
+    frame_height: int,
+    camera_fov_y: float,
+    camera_height: float,
+    camera_pitch: float,
+    max_distance: float,
+) -> int:
+    """
+    Calculates the highest image row where a floor point within range can appear.
+
+    Uses the same pixel to angle model as `calculate_local_position`.
+
+    Args:
+        frame_height (int): The height of the upright frame in pixels.
+        camera_fov_y (float): The vertical field of view of the camera in degrees.
+        camera_height (float): The height of the camera above the floor in meters.
+        camera_pitch (float): The pitch of the camera in degrees, positive pointing up.
+        max_distance (float): The furthest distance in meters a piece is reported at.
+
+    Returns:
+        int: The row, counted from the top, of a floor point at `max_distance`,
+            clipped to the frame.
+    """
+    depression_angle = np.degrees(np.arctan2(camera_height, max_distance))
+    pixel_percent = (depression_angle + camera_pitch) / (
+        camera_fov_y / 2 * FOV_CORRECTION_FACTOR
+    )
+    horizon_row = frame_height / 2 * (1 + pixel_percent)
+    return int(np.clip(horizon_row, 0, frame_height))
+
+
+def rotate_boxes(
+    boxes_xyxy: np.ndarray, frame_size: tuple[int, int], angle: float
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """
+    Rotates bounding boxes the same way `imutils.rotate_bound` rotates the frame.
+
+    Each box is rotated as a quadrilateral and replaced with its axis aligned bounds,
+    which is exact for multiples of 90 degrees.
+
+    Args:
+        boxes_xyxy (np.ndarray): Boxes in the unrotated frame with shape (N, 4) as [x1, y1, x2, y2].
+        frame_size (tuple[int, int]): The size of the unrotated frame as (width, height).
+        angle (float): The clockwise rotation in degrees.
+
+    Returns:
+        tuple[np.ndarray, tuple[int, int]]: The rotated boxes with shape (N, 4) and the
+            rotated frame size as (width, height).
+    """
+    rotation_matrix, rotated_size = get_rotation_matrix(frame_size, angle)
+    x1, y1, x2, y2 = (
+        boxes_xyxy[:, 0],
+        boxes_xyxy[:, 1],
+        boxes_xyxy[:, 2],
+        boxes_xyxy[:, 3],
+    )
+    corners = np.stack(
+        [
+            np.stack([x1, y1], axis=-1),
+            np.stack([x2, y1], axis=-1),
+            np.stack([x2, y2], axis=-1),
+            np.stack([x1, y2], axis=-1),
+        ],
+        axis=1,
+    )
+    rotated_corners = corners @ rotation_matrix[:, :2].T + rotation_matrix[:, 2]
+    rotated_boxes = np.concatenate(
+        [rotated_corners.min(axis=1), rotated_corners.max(axis=1)], axis=1
+    )
+    return rotated_boxes, rotated_size
+
+
+def undistort_points(
+    pixel_points: np.ndarray,
+    source_resolution: tuple[int, int],
+    rotation: float,
+    camera_matrix: np.ndarray,
+    distortion_coefficients: np.ndarray,
+) -> np.ndarray:
+    """
+    Converts upright pixel positions to undistorted normalized image coordinates.
+
+    The points are mapped back to the native sensor orientation the calibration
+    was performed in, undistorted in one vectorized call and rotated upright again.
+
+    Args:
+        pixel_points (np.ndarray): Pixel positions in the upright frame with shape (N, 2).
+        source_resolution (tuple[int, int]): The (width, height) of the unrotated source image.
+        rotation (float): The clockwise rotation in degrees between the source and upright frame.
+        camera_matrix (np.ndarray): The 3x3 camera matrix for the source resolution.
+        distortion_coefficients (np.ndarray): The lens distortion coefficients.
+
+    Returns:
+        np.ndarray: Normalized coordinates (x right, y down, at unit depth) with shape (N, 2).
+    """
+    native_points = np.asarray(pixel_points, dtype=np.float64)
+    rotation_part = np.eye(2)
+    if rotation:
+        rotation_matrix, _ = get_rotation_matrix(source_resolution, rotation)
+        rotation_part = rotation_matrix[:, :2]
+        native_points = (native_points - rotation_matrix[:, 2]) @ np.linalg.inv(
+            rotation_part
+        ).T
+
+    normalized_points = cv2.undistortPoints(
+        native_points.reshape(-1, 1, 2), camera_matrix, distortion_coefficients
+    ).reshape(-1, 2)
+    return normalized_points @ rotation_part.T
+
+
+def calculate_local_positions_from_normalized(
+    normalized_points: np.ndarray, camera_offset_pos: np.array
+) -> np.ndarray:
+    """
+    Projects normalized image coordinates of floor contact points onto the ground.
+
+    Points at or above the horizon are returned as infinitely far away.
+
+    Args:
+        normalized_points (np.ndarray): Undistorted normalized coordinates with shape (N, 2).
+        camera_offset_pos (np.array): The offset position of the camera in meters as [x, y, z].
+
+    Returns:
+        np.ndarray: The local positions of the points as [x, y] with shape (N, 2).
+    """
+    normalized_x = normalized_points[:, 0]
+    normalized_y = normalized_points[:, 1]
+    below_horizon = normalized_y > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ground_scale = camera_offset_pos[2] / normalized_y
+        forward_distance = np.where(below_horizon, ground_scale, np.inf)
+        left_distance = np.where(below_horizon, -ground_scale * normalized_x, 0.0)
+    return np.stack([forward_distance, left_distance], axis=1) + np.array(
+        camera_offset_pos[:2]
+    )
+
+
+def _calculate_tile_starts(length: int, tile_length: int, overlap: float) -> list[int]:
+    """
+    Spreads overlapping tiles evenly along one axis.
+
+    Args:
+        length (int): The length to cover in pixels.
+        tile_length (int): The length of a tile in pixels.
+        overlap (float): The minimum overlap between neighbouring tiles as a fraction.
+
+    Returns:
+        list[int]: The offset of every tile from the start of the axis.
+    """
+    if length <= tile_length:
+        return [0]
+    stride = tile_length * (1 - overlap)
+    tile_count = int(np.ceil((length - tile_length) / stride)) + 1
+    return np.linspace(0, length - tile_length, tile_count).astype(int).tolist()
+
+
+def calculate_tile_regions(
+    region: tuple[int, int, int, int], tile_size: int, overlap: float
+) -> list[tuple[int, int, int, int]]:
+    """
+    Covers a region with overlapping square tiles, shrinking tiles to the region where it is smaller.
+
+    Args:
+        region (tuple[int, int, int, int]): The region to cover as (x1, y1, x2, y2).
+        tile_size (int): The side length of a tile in pixels.
+        overlap (float): The minimum overlap between neighbouring tiles as a fraction.
+
+    Returns:
+        list[tuple[int, int, int, int]]: The tiles as (x1, y1, x2, y2).
+    """
+    x1, y1, x2, y2 = region
+    tile_width = min(tile_size, x2 - x1)
+    tile_height = min(tile_size, y2 - y1)
+    return [
+        (
+            x1 + x_start,
+            y1 + y_start,
+            x1 + x_start + tile_width,
+            y1 + y_start + tile_height,
+        )
+        for y_start in _calculate_tile_starts(y2 - y1, tile_height, overlap)
+        for x_start in _calculate_tile_starts(x2 - x1, tile_width, overlap)
+    ]
+
+
+def calculate_grid_regions(
+    occupancy_grid: np.ndarray,
+    frame_size: tuple[int, int],
+    padding: int,
+    min_region_size: int,
+) -> list[tuple[int, int, int, int]]:
+    """
+    Turns connected occupied cells of a grid into padded pixel regions.
+
+    Args:
+        occupancy_grid (np.ndarray): A boolean grid with shape (rows, columns) spread
+            evenly over the frame.
+        frame_size (tuple[int, int]): The (width, height) of the frame.
+        padding (int): Pixels added around every group of cells.
+        min_region_size (int): The smallest region side in pixels.
+
+    Returns:
+        list[tuple[int, int, int, int]]: The regions as (x1, y1, x2, y2).
+    """
+    frame_width, frame_height = frame_size
+    cell_width = frame_width / occupancy_grid.shape[1]
+    cell_height = frame_height / occupancy_grid.shape[0]
+    label_count, _, stats, _ = cv2.connectedComponentsWithStats(
+        occupancy_grid.astype(np.uint8), connectivity=8
+    )
+
+    regions = []
+    for label in range(1, label_count):
+        column, row, width_cells, height_cells = stats[label, :4]
+        center_x = (column + width_cells / 2) * cell_width
+        center_y = (row + height_cells / 2) * cell_height
+        region_width = min(
+            max(width_cells * cell_width + 2 * padding, min_region_size), frame_width
+        )
+        region_height = min(
+            max(height_cells * cell_height + 2 * padding, min_region_size),
+            frame_height,
+        )
+        x1 = int(np.clip(center_x - region_width / 2, 0, frame_width - region_width))
+        y1 = int(np.clip(center_y - region_height / 2, 0, frame_height - region_height))
+        regions.append((x1, y1, x1 + int(region_width), y1 + int(region_height)))
+    return regions
@@ -0,0 +1,177 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import torch
+from torch import nn, optim
+from torch.optim import lr_scheduler
+from torch.utils.data import DataLoader, Dataset
+from tqdm import tqdm
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from src.devices.utils.grid_gate import (
+    GRID_INPUT_SIZE,
+    GridPredictor,
+    create_occupancy_grid,
+    image_to_tensor,
+)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class YoloGridDataset(Dataset):
+    """Images of a YOLO format dataset split with their boxes turned into occupancy grids."""
+
+    def __init__(self, split_dir: str) -> None:
+        """
+        Args:
+            split_dir (str): A split of the dataset, e.g. "dataset/train", holding an
+                'images' and a 'labels' directory.
+        """
+        self.images_dir = os.path.join(split_dir, "images")
+        self.labels_dir = os.path.join(split_dir, "labels")
+        self.image_names = sorted(
+            image_name
+            for image_name in os.listdir(self.images_dir)
+            if image_name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    def __len__(self) -> int:
+        return len(self.image_names)
+
+    def _load_boxes(self, image_name: str) -> np.ndarray:
+        """
+        Reads an image's YOLO labels as normalized [x1, y1, x2, y2] boxes.
+
+        Args:
+            image_name (str): The file name of the image.
+
+        Returns:
+            np.ndarray: Boxes with shape (N, 4); empty for background images.
+        """
+        label_path = os.path.join(
+            self.labels_dir, os.path.splitext(image_name)[0] + ".txt"
+        )
+        if not os.path.isfile(label_path):
+            return np.zeros((0, 4), dtype=np.float32)
+        labels = np.loadtxt(label_path, dtype=np.float32, ndmin=2)
+        if not len(labels):
+            return np.zeros((0, 4), dtype=np.float32)
+        centers, sizes = labels[:, 1:3], labels[:, 3:5]
+        return np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1)
+
+    def __getitem__(self, index: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Args:
+            index (int): The index of the image.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The model input and its target grid.
+        """
+        image_name = self.image_names[index]
+        image = cv2.imread(os.path.join(self.images_dir, image_name))
+        image = cv2.resize(image, GRID_INPUT_SIZE, interpolation=cv2.INTER_AREA)
+        occupancy_grid = create_occupancy_grid(self._load_boxes(image_name))
+        return image_to_tensor(image), torch.from_numpy(occupancy_grid)
+
+
+def run_epoch(
+    model: nn.Module,
+    data_loader: DataLoader,
+    criterion: nn.Module,
+    device: torch.device,
+    optimizer: optim.Optimizer | None = None,
+) -> tuple[float, float]:
+    """
+    Runs one pass over a dataset, training if an optimizer is given.
+
+    Args:
+        model (nn.Module): The grid predictor.
+        data_loader (DataLoader): The batches to run.
+        criterion (nn.Module): The loss function.
+        device (torch.device): Where the model runs.
+        optimizer (optim.Optimizer | None): The optimizer, or None to only evaluate.
+
+    Returns:
+        tuple[float, float]: The mean loss and the recall of occupied cells at 0.5.
+    """
+    model.train(optimizer is not None)
+    total_loss = 0.0
+    occupied_cells = 0
+    found_cells = 0
+    with torch.set_grad_enabled(optimizer is not None):
+        for images, grids in tqdm(data_loader, unit="batch", leave=False):
+            images = images.to(device, non_blocking=True)
+            grids = grids.to(device, non_blocking=True)
+            logits = model(images)
+            loss = criterion(logits, grids)
+            if optimizer is not None:
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+            total_loss += loss.item() * images.size(0)
+            occupied_cells += int(grids.sum().item())
+            found_cells += int(((logits >= 0) & (grids > 0)).sum().item())
+    return total_loss / len(data_loader.dataset), found_cells / max(occupied_cells, 1)
+
+
+def main() -> None:
+    """Train a grid predictor on a YOLO dataset, keeping the best validation loss."""
+    dataset_path = input(
+        "Input the YOLO dataset path holding 'train' and 'valid' splits, e.g. the roboflow export: "
+    )
+    output_path = input("Enter the output path of the grid predictor (grid.pth): ")
+    epochs = int(input("Enter the number of epochs, 100 is a good starting point: "))
+    patience = int(input("Enter the patience value, 10 is a good starting point: "))
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    train_loader = DataLoader(
+        YoloGridDataset(os.path.join(dataset_path, "train")),
+        batch_size=64,
+        shuffle=True,
+        num_workers=max(1, os.cpu_count() - 1),
+        pin_memory=True,
+    )
+    validation_loader = DataLoader(
+        YoloGridDataset(os.path.join(dataset_path, "valid")),
+        batch_size=64,
+        num_workers=max(1, os.cpu_count() - 1),
+        pin_memory=True,
+    )
+
+    model = GridPredictor().to(device)
+    criterion = nn.BCEWithLogitsLoss(pos_weight=torch.tensor(4.0, device=device))
+    optimizer = optim.Adam(model.parameters(), lr=1e-3, weight_decay=1e-4)
+    scheduler = lr_scheduler.ReduceLROnPlateau(optimizer, factor=0.5, patience=5)
+
+    print("Starting training...")
+    best_loss, epochs_without_improvement = float("inf"), 0
+    for epoch in range(1, epochs + 1):
+        train_loss, _ = run_epoch(model, train_loader, criterion, device, optimizer)
+        validation_loss, validation_recall = run_epoch(
+            model, validation_loader, criterion, device
+        )
+        print(
+            f"Epoch {epoch}/{epochs}: train loss {train_loss:.4f}, validation loss "
+            f"{validation_loss:.4f}, occupied cell recall {validation_recall:.3f}"
+        )
+
+        scheduler.step(validation_loss)
+        if validation_loss < best_loss:
+            best_loss, epochs_without_improvement = validation_loss, 0
+            torch.save(model.state_dict(), output_path)
+        else:
+            epochs_without_improvement += 1
+        if epochs_without_improvement >= patience:
+            print("Early stopping triggered")
+            break
+
+    print(f"Training complete, grid predictor saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
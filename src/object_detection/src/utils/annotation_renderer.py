@@ -0,0 +1,249 @@
+from functools import lru_cache
+
+import cv2
+import numpy as np
+from ultralytics.engine.results import Results
+
+from src.devices.utils.cameras.frame import Frame
+from src.math_conversions import get_rotation_matrix, rotate_boxes
+
+CLASS_COLORS = [
+    (int(hex_color[4:6], 16), int(hex_color[2:4], 16), int(hex_color[0:2], 16))
+    for hex_color in (
+        "FF3838 FF9D97 FF701F FFB21D CFD231 48F90A 92CC17 3DDB86 1A9334 00D4BB "
+        "2C99A8 00C2FF 344593 6473FF 0018EC 8438FF 520085 CB38FF FF95C8 FF37C7"
+    ).split()
+]
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_FONT_SCALE = 0.4
+LABEL_PADDING = 2
+TEXT_COLOR = (255, 255, 255)
+
+
+@lru_cache(maxsize=1024)
+def _get_text_size(
+    text: str, font_scale: float, thickness: int
+) -> tuple[int, int, int]:
+    """
+    Returns the width, height above the baseline and baseline depth of a text.
+    """
+    (width, height), baseline = cv2.getTextSize(text, FONT, font_scale, thickness)
+    return width, height, baseline
+
+
+def _get_text_color(background_color: tuple[int, int, int]) -> tuple[int, int, int]:
+    """
+    Returns black or white, whichever reads better on a background color.
+    """
+    blue, green, red = background_color
+    return (0, 0, 0) if 0.299 * red + 0.587 * green + 0.114 * blue > 150 else TEXT_COLOR
+
+
+LABEL_TEXT_COLORS = [_get_text_color(color) for color in CLASS_COLORS]
+
+
+class AnnotationRenderer:
+    """Draws detections onto downscaled preview frames for the web interface.
+
+    Frames are downscaled and rotated before anything is drawn, so boxes and
+    labels are drawn onto the small preview only, with the thickness and
+    font size it is viewed at. Every preview is a new array, so consumers
+    can keep published frames without copying them.
+
+    Besides the class and confidence that `Results.plot` shows, every box
+    with a positioned detection is labelled with its distance and yaw. Boxes
+    use the ultralytics palette, converted to BGR once at import.
+    """
+
+    def __init__(self, scale: float = 0.5) -> None:
+        """
+        Args:
+            scale (float): The factor frames are downscaled by.
+        """
+        self.scale = scale
+        self.line_thickness = max(round(2 * scale), 1)
+        self.fps_font_scale = 0.7 * scale
+        self.fps_position = (int(10 * scale), int(30 * scale))
+
+    def render(
+        self,
+        frame: np.ndarray | Frame,
+        results: Results | None,
+        fps: float,
+        detections: list[dict] | None = None,
+        rotation: float = 0,
+    ) -> np.ndarray:
+        """
+        Draw boxes, labels, distances, yaw angles and the FPS onto a preview.
+
+        Args:
+            frame (np.ndarray | Frame): The frame the results were detected in. A
+                Frame lets the preview reuse the frame's cached downscaled image.
+            results (Results | None): The detection result, None for no boxes.
+            fps (float): Frames per second for display.
+            detections (list[dict] | None): The positioned detections of the
+                result, from `process_detections`.
+            rotation (float): Clockwise rotation in degrees still pending on the frame.
+
+        Returns:
+            np.ndarray: The annotated BGR preview.
+        """
+        preview, scaled_size = self._create_preview(frame, rotation)
+        if results is not None and len(results.boxes):
+            self._draw_boxes(preview, results, scaled_size, rotation)
+        if detections:
+            self._draw_detection_info(preview, detections)
+
+        cv2.putText(
+            preview,
+            f"FPS: {fps:.2f}",
+            self.fps_position,
+            FONT,
+            self.fps_font_scale,
+            TEXT_COLOR,
+            self.line_thickness,
+        )
+        return preview
+
+    def render_raw(self, frame: np.ndarray | Frame, rotation: float = 0) -> np.ndarray:
+        """
+        Downscale and rotate a frame for a client that draws the overlays itself.
+
+        An upright Frame is passed through as its cached downscaled image, so
+        nothing is copied or drawn.
+
+        Args:
+            frame (np.ndarray | Frame): The frame to preview.
+            rotation (float): Clockwise rotation in degrees still pending on the frame.
+
+        Returns:
+            np.ndarray: The read-only BGR preview.
+        """
+        if isinstance(frame, Frame) and not rotation:
+            return frame.get_scaled(self.scale)
+        return self._create_preview(frame, rotation)[0]
+
+    def _create_preview(
+        self, frame: np.ndarray | Frame, rotation: float
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """
+        Downscale and rotate a frame into a new preview image.
+
+        Returns:
+            tuple[np.ndarray, tuple[int, int]]: The preview and the (width, height)
+                of the frame after downscaling, before rotating.
+        """
+        image = frame.image if isinstance(frame, Frame) else frame
+        scaled_size = (
+            max(int(image.shape[1] * self.scale), 1),
+            max(int(image.shape[0] * self.scale), 1),
+        )
+        if rotation:
+            rotation_matrix, preview_size = get_rotation_matrix(scaled_size, rotation)
+        else:
+            preview_size = scaled_size
+        preview = np.empty(
+            (preview_size[1], preview_size[0]) + image.shape[2:], dtype=image.dtype
+        )
+        if isinstance(frame, Frame):
+            scaled_image = frame.get_scaled(self.scale)
+        elif rotation:
+            scaled_image = cv2.resize(image, scaled_size, interpolation=cv2.INTER_AREA)
+        else:
+            scaled_image = None
+            cv2.resize(image, scaled_size, dst=preview, interpolation=cv2.INTER_AREA)
+        if rotation:
+            cv2.warpAffine(scaled_image, rotation_matrix, preview_size, dst=preview)
+        elif scaled_image is not None:
+            np.copyto(preview, scaled_image)
+        return preview, scaled_size
+
+    def _draw_boxes(
+        self,
+        preview: np.ndarray,
+        results: Results,
+        scaled_size: tuple[int, int],
+        rotation: float,
+    ) -> None:
+        """
+        Draw every box of a result with its class and confidence.
+        """
+        boxes_data = results.boxes.data.cpu().numpy()
+        boxes_xyxy = boxes_data[:, :4] * self.scale
+        if rotation:
+            boxes_xyxy, _ = rotate_boxes(boxes_xyxy, scaled_size, rotation)
+        for (x1, y1, x2, y2), confidence, class_id in zip(
+            boxes_xyxy.astype(int).tolist(),
+            boxes_data[:, 4].tolist(),
+            boxes_data[:, 5].astype(int).tolist(),
+        ):
+            color_index = class_id % len(CLASS_COLORS)
+            color = CLASS_COLORS[color_index]
+            cv2.rectangle(preview, (x1, y1), (x2, y2), color, self.line_thickness)
+            self._draw_label(
+                preview,
+                f"{results.names.get(class_id, class_id)} {confidence:.2f}",
+                (x1, y1),
+                color,
+                LABEL_TEXT_COLORS[color_index],
+                above=True,
+            )
+
+    def _draw_detection_info(self, preview: np.ndarray, detections: list[dict]) -> None:
+        """
+        Label the boxes of positioned detections with their distance and yaw.
+        """
+        for detection in detections:
+            x1, _, _, y2 = (detection["box"] * self.scale).astype(int).tolist()
+            self._draw_label(
+                preview,
+                f"{detection['distance']:.2f}m {detection['yaw_angle']:.1f}deg",
+                (x1, y2),
+                (0, 0, 0),
+                TEXT_COLOR,
+                above=False,
+            )
+
+    @staticmethod
+    def _draw_label(
+        preview: np.ndarray,
+        text: str,
+        anchor: tuple[int, int],
+        background_color: tuple[int, int, int],
+        text_color: tuple[int, int, int],
+        above: bool,
+    ) -> None:
+        """
+        Draw a text on a filled background at the corner of a box.
+
+        Args:
+            preview (np.ndarray): The image to draw on.
+            text (str): The label.
+            anchor (tuple[int, int]): The box corner the label is attached to.
+            background_color (tuple[int, int, int]): The fill behind the text.
+            text_color (tuple[int, int, int]): The color of the text.
+            above (bool): Whether the label sits above the anchor, or below it.
+        """
+        text_width, text_height, baseline = _get_text_size(text, LABEL_FONT_SCALE, 1)
+        label_height = text_height + baseline + 2 * LABEL_PADDING
+        label_width = text_width + 2 * LABEL_PADDING
+        x = min(max(anchor[0], 0), max(preview.shape[1] - label_width, 0))
+        top = anchor[1] - label_height if above else anchor[1]
+        top = min(max(top, 0), max(preview.shape[0] - label_height, 0))
+        cv2.rectangle(
+            preview,
+            (x, top),
+            (x + label_width, top + label_height),
+            background_color,
+            cv2.FILLED,
+        )
+        cv2.putText(
+            preview,
+            text,
+            (x + LABEL_PADDING, top + LABEL_PADDING + text_height),
+            FONT,
+            LABEL_FONT_SCALE,
+            text_color,
+            1,
+            cv2.LINE_AA,
+        )
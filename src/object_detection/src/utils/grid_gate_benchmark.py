@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+from time import perf_counter
+
+import cv2
+import numpy as np
+import torch
+from torchvision.ops import box_iou
+from ultralytics import YOLO
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.cameras.synthetic_camera import SyntheticCamera
+from src.devices.utils.grid_gate import GridGate
+
+
+def load_video_frames(video_path: str, frame_limit: int) -> list[Frame]:
+    """
+    Read the first frames of a video file.
+
+    Args:
+        video_path (str): The video to read.
+        frame_limit (int): The most frames to read.
+
+    Returns:
+        list[Frame]: The frames in order.
+    """
+    capture = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < frame_limit:
+        success, image = capture.read()
+        if not success:
+            break
+        frames.append(Frame(image, video_path, len(frames) + 1))
+    capture.release()
+    return frames
+
+
+def render_synthetic_frames(
+    frame_limit: int, resolution: list[int], pieces: int
+) -> list[Frame]:
+    """
+    Render frames of moving game pieces with a synthetic camera.
+
+    Args:
+        frame_limit (int): The number of frames to render.
+        resolution (list[int]): The (width, height) of the frames.
+        pieces (int): The number of pieces in view.
+
+    Returns:
+        list[Frame]: The frames in order.
+    """
+    camera = SyntheticCamera(
+        {
+            "name": "Synthetic 0",
+            "camera_type": "synthetic_camera",
+            "fov": [70, 38],
+            "camera_offset_pos": [0.25, 0.0, 0.75],
+            "camera_pitch": 0,
+            "camera_yaw": 0,
+            "frame_rotation": 0,
+            "processing_device": "cpu",
+            "resolution": resolution,
+            "fps": 1000,
+            "piece_count": pieces,
+            "seed": 0,
+        },
+        print,
+    )
+    frames = []
+    while len(frames) < frame_limit:
+        frame = camera.get_frame()
+        if not frames or frame.sequence_number != frames[-1].sequence_number:
+            frames.append(frame)
+    return frames
+
+
+def detect_full_frame(
+    model: YOLO, frame: Frame, arguments: argparse.Namespace
+) -> torch.Tensor:
+    """
+    Run the model on the whole frame, as the detection loop does without a gate.
+
+    Returns:
+        torch.Tensor: The boxes as [x1, y1, x2, y2, conf, cls].
+    """
+    result = model.predict(
+        frame.image,
+        device=arguments.device,
+        conf=arguments.confidence,
+        imgsz=arguments.input_size,
+        verbose=False,
+        iou=0.5,
+    )[0]
+    return result.boxes.data.cpu()
+
+
+def detect_gated(
+    model: YOLO,
+    regions: list[tuple[int, int, int, int]],
+    frame: Frame,
+    arguments: argparse.Namespace,
+) -> torch.Tensor:
+    """
+    Run the model only on the regions the grid gate marked.
+
+    Returns:
+        torch.Tensor: The boxes in frame coordinates as [x1, y1, x2, y2, conf, cls].
+    """
+    if not regions:
+        return torch.zeros((0, 6))
+    results = model.predict(
+        [
+            np.ascontiguousarray(frame.image[top:bottom, left:right])
+            for left, top, right, bottom in regions
+        ],
+        device=arguments.device,
+        conf=arguments.confidence,
+        imgsz=arguments.input_size,
+        verbose=False,
+        iou=0.5,
+    )
+    boxes = []
+    for result, (left, top, _, _) in zip(results, regions):
+        region_boxes = result.boxes.data.cpu().clone()
+        region_boxes[:, [0, 2]] += left
+        region_boxes[:, [1, 3]] += top
+        boxes.append(region_boxes)
+    return torch.cat(boxes)
+
+
+def count_matched_boxes(reference_boxes: torch.Tensor, boxes: torch.Tensor) -> int:
+    """
+    Count reference boxes that a box of the same class overlaps by more than 0.5 IoU.
+    """
+    if not len(reference_boxes) or not len(boxes):
+        return 0
+    overlaps = box_iou(reference_boxes[:, :4], boxes[:, :4])
+    same_class = reference_boxes[:, 5][:, None] == boxes[:, 5][None, :]
+    return int(((overlaps > 0.5) & same_class).any(dim=1).sum())
+
+
+def main() -> None:
+    """Compare grid gated detection against full frame detection on the same frames."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark grid predictor gating of the game piece detector."
+    )
+    parser.add_argument("--model", required=True, help="The YOLO model.")
+    parser.add_argument("--grid-model", required=True, help="The grid predictor.")
+    parser.add_argument("--video", help="A video to use instead of synthetic frames.")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to run.")
+    parser.add_argument("--pieces", type=int, default=3, help="Synthetic pieces.")
+    parser.add_argument(
+        "--resolution", type=int, nargs=2, default=[640, 480], help="Width height."
+    )
+    parser.add_argument("--input-size", type=int, default=320, help="Model size.")
+    parser.add_argument("--confidence", type=float, default=0.5, help="Confidence.")
+    parser.add_argument("--grid-threshold", type=float, default=0.3, help="Cell cut.")
+    parser.add_argument("--device", default="cpu", help="Inference device.")
+    arguments = parser.parse_args()
+
+    frames = (
+        load_video_frames(arguments.video, arguments.frames)
+        if arguments.video
+        else render_synthetic_frames(
+            arguments.frames, arguments.resolution, arguments.pieces
+        )
+    )
+    model = YOLO(arguments.model, task="detect")
+    grid_gate = GridGate(arguments.grid_model, arguments.grid_threshold)
+    detect_full_frame(model, frames[0], arguments)
+    detect_gated(model, grid_gate.get_regions(frames[0]), frames[0], arguments)
+
+    full_frame_times, gated_times = [], []
+    full_frame_box_count, matched_box_count, skipped_frame_count = 0, 0, 0
+    for frame in frames:
+        start_time = perf_counter()
+        full_frame_boxes = detect_full_frame(model, frame, arguments)
+        full_frame_times.append(perf_counter() - start_time)
+
+        start_time = perf_counter()
+        regions = grid_gate.get_regions(frame)
+        gated_boxes = detect_gated(model, regions, frame, arguments)
+        gated_times.append(perf_counter() - start_time)
+
+        full_frame_box_count += len(full_frame_boxes)
+        matched_box_count += count_matched_boxes(full_frame_boxes, gated_boxes)
+        skipped_frame_count += not regions
+
+    full_frame_ms = np.mean(full_frame_times) * 1000
+    gated_ms = np.mean(gated_times) * 1000
+    print(f"Frames: {len(frames)}")
+    print(f"Full frame detection: {full_frame_ms:.2f} ms per frame")
+    print(
+        f"Grid gated detection: {gated_ms:.2f} ms per frame, "
+        f"{skipped_frame_count / len(frames) * 100:.1f}% of frames skipped"
+    )
+    print(f"Gated detection is {full_frame_ms / gated_ms:.2f}x faster")
+    if full_frame_box_count:
+        print(
+            f"Gated detection found {matched_box_count / full_frame_box_count * 100:.1f}% "
+            f"of the {full_frame_box_count} full frame boxes"
+        )
+
+
+if __name__ == "__main__":
+    main()
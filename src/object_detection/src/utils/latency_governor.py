@@ -0,0 +1,202 @@
+from typing import Callable
+
+from networktables import NetworkTable
+
+
+class LatencyGovernor:
+    """Steps a device along a ladder of model settings to hold a per-frame latency target."""
+
+    def __init__(
+        self,
+        ladder: list[dict],
+        target_latency_ms: float,
+        log: Callable,
+        eagle_eye_nt: NetworkTable | None = None,
+        nt_prefix: str = "",
+        smoothing: float = 0.2,
+        hysteresis: float = 0.15,
+        hold_frames: int = 15,
+        initial_level: int = 0,
+    ) -> None:
+        """
+        Args:
+            ladder (list[dict]): Rungs ordered from most accurate to cheapest. Each has
+                an 'input_size' and optionally a 'model_path' and a
+                'confidence_threshold'.
+            target_latency_ms (float): The per-frame latency to hold.
+            log (Callable): A callable logger function.
+            eagle_eye_nt (NetworkTable | None): Where decisions are published.
+            nt_prefix (str): Prefix of the published keys, e.g. "device:0_".
+            smoothing (float): Weight of the newest sample in the latency average.
+            hysteresis (float): Fraction above the target before stepping down and
+                below it before stepping up.
+            hold_frames (int): Consecutive frames outside the band before a step,
+                and frames to wait after a step.
+            initial_level (int): The rung to start on.
+        """
+        self.ladder = ladder
+        self.target_latency_ms = target_latency_ms
+        self.log = log
+        self.eagle_eye_nt = eagle_eye_nt
+        self.nt_prefix = nt_prefix
+        self.smoothing = smoothing
+        self.hysteresis = hysteresis
+        self.hold_frames = hold_frames
+
+        self.level = min(max(initial_level, 0), len(ladder) - 1)
+        self.average_latency_ms: float | None = None
+        self.frames_over_target = 0
+        self.frames_under_target = 0
+        self.frames_since_step = 0
+        self._publish()
+
+    def update(self, latency_ms: float) -> dict | None:
+        """
+        Record a frame's latency and step the ladder if it stayed out of band.
+
+        Args:
+            latency_ms (float): The frame's detection latency, from receiving the
+                frame to its final result.
+
+        Returns:
+            dict | None: The new rung if the level changed, else None.
+        """
+        if self.average_latency_ms is None:
+            self.average_latency_ms = latency_ms
+        else:
+            self.average_latency_ms += self.smoothing * (
+                latency_ms - self.average_latency_ms
+            )
+        self.frames_since_step += 1
+
+        upper_latency_ms = self.target_latency_ms * (1 + self.hysteresis)
+        lower_latency_ms = self.target_latency_ms * (1 - self.hysteresis)
+        self.frames_over_target = (
+            self.frames_over_target + 1
+            if self.average_latency_ms > upper_latency_ms
+            else 0
+        )
+        self.frames_under_target = (
+            self.frames_under_target + 1
+            if self.average_latency_ms < lower_latency_ms
+            else 0
+        )
+        if self.frames_since_step < self.hold_frames:
+            return None
+
+        if self.frames_over_target >= self.hold_frames and self.level + 1 < len(
+            self.ladder
+        ):
+            return self._step(self.level + 1)
+        if self.frames_under_target >= self.hold_frames and self.level > 0:
+            return self._step(self.level - 1)
+        return None
+
+    def _step(self, level: int) -> dict:
+        """
+        Move to another rung and report it.
+
+        Args:
+            level (int): The rung to move to.
+
+        Returns:
+            dict: The new rung.
+        """
+        self.log(
+            f"Latency governor {self.nt_prefix or 'device'}: average "
+            f"{self.average_latency_ms:.1f} ms vs target {self.target_latency_ms} ms, "
+            f"level {self.level} -> {level} ({self.ladder[level]})"
+        )
+        self.level = level
+        self.frames_over_target = 0
+        self.frames_under_target = 0
+        self.frames_since_step = 0
+        self._publish()
+        return self.ladder[level]
+
+    def _publish(self) -> None:
+        """
+        Publishes the current level and its input size to NetworkTables.
+        """
+        if self.eagle_eye_nt is None:
+            return
+        self.eagle_eye_nt.putNumber(f"{self.nt_prefix}governor_level", self.level)
+        self.eagle_eye_nt.putNumber(
+            f"{self.nt_prefix}input_size", self.ladder[self.level]["input_size"]
+        )
+
+    def get_rung(self) -> dict:
+        """
+        Returns the current rung.
+        """
+        return self.ladder[self.level]
+
+    def get_average_latency_ms(self) -> float | None:
+        """
+        Returns the smoothed latency, or None before the first frame.
+        """
+        return self.average_latency_ms
+
+
+def create_latency_governor(
+    governor_constants: dict | None,
+    configured_input_size: int,
+    log: Callable,
+    eagle_eye_nt: NetworkTable | None,
+    device_index: int,
+    dynamic_input_size: bool = True,
+) -> LatencyGovernor | None:
+    """
+    Builds a device's governor from `LatencyGovernorConstants`.
+
+    A model with a fixed input size cannot just be run at another size, so
+    rungs that change the input size without their own 'model_path' are
+    rejected for it.
+
+    Args:
+        governor_constants (dict | None): The `LatencyGovernorConstants` section.
+        configured_input_size (int): `ObjectDetectionConstants.input_size`, used to
+            pick the starting rung.
+        log (Callable): A callable logger function.
+        eagle_eye_nt (NetworkTable | None): Where decisions are published.
+        device_index (int): The index of the governed device.
+        dynamic_input_size (bool): Whether the device's model runs at any input size.
+
+    Returns:
+        LatencyGovernor | None: The governor, or None if it is disabled or no
+            rung is usable.
+    """
+    if not governor_constants or not governor_constants.get("latency_governor"):
+        return None
+    ladder = []
+    for rung in governor_constants["ladder"]:
+        if (
+            dynamic_input_size
+            or rung.get("model_path")
+            or rung["input_size"] == configured_input_size
+        ):
+            ladder.append(rung)
+        else:
+            log(
+                f"Latency governor rung {rung} rejected: the model has a fixed input "
+                "size, so a rung with another input size needs its own model_path"
+            )
+    if not ladder:
+        return None
+    ladder_input_sizes = [rung["input_size"] for rung in ladder]
+    initial_level = (
+        ladder_input_sizes.index(configured_input_size)
+        if configured_input_size in ladder_input_sizes
+        else 0
+    )
+    return LatencyGovernor(
+        ladder,
+        governor_constants["target_latency_ms"],
+        log,
+        eagle_eye_nt,
+        f"device:{device_index}_",
+        governor_constants.get("smoothing", 0.2),
+        governor_constants.get("hysteresis", 0.15),
+        governor_constants.get("hold_frames", 15),
+        initial_level,
+    )
@@ -0,0 +1,184 @@
+import threading
+from time import time
+from typing import Callable
+
+from networktables import NetworkTable
+
+ENABLED_BIT = 0x01
+AUTONOMOUS_BIT = 0x02
+TEST_BIT = 0x04
+EMERGENCY_STOP_BIT = 0x08
+FMS_ATTACHED_BIT = 0x10
+DRIVER_STATION_ATTACHED_BIT = 0x20
+
+IDLE_MODE = "idle"
+LOW_POWER_MODE = "low_power"
+FULL_MODE = "full"
+
+DEFAULT_PROFILES = {
+    IDLE_MODE: {"detection_fps": 2, "input_size": 256, "web_fps": 2, "capture_fps": 15},
+    LOW_POWER_MODE: {
+        "detection_fps": 10,
+        "input_size": 320,
+        "web_fps": 10,
+        "capture_fps": 30,
+    },
+    FULL_MODE: {
+        "detection_fps": 0,
+        "input_size": 320,
+        "web_fps": 30,
+        "capture_fps": 60,
+    },
+}
+
+
+def get_robot_state(control_data: int) -> str:
+    """
+    Describes the robot state encoded in the FMSInfo control word.
+
+    Args:
+        control_data (int): The value of `FMSInfo/FMSControlData`.
+
+    Returns:
+        str: One of "disconnected", "estopped", "disabled", "autonomous", "test" or "teleop".
+    """
+    if not control_data & DRIVER_STATION_ATTACHED_BIT:
+        return "disconnected"
+    if control_data & EMERGENCY_STOP_BIT:
+        return "estopped"
+    if not control_data & ENABLED_BIT:
+        return "disabled"
+    if control_data & AUTONOMOUS_BIT:
+        return "autonomous"
+    if control_data & TEST_BIT:
+        return "test"
+    return "teleop"
+
+
+def get_power_mode(control_data: int) -> str:
+    """
+    Chooses the power mode for a robot state.
+
+    Args:
+        control_data (int): The value of `FMSInfo/FMSControlData`.
+
+    Returns:
+        str: Full power while enabled, low power while disabled with a driver
+            station or FMS attached, and idle otherwise.
+    """
+    robot_state = get_robot_state(control_data)
+    if robot_state in ("autonomous", "teleop", "test"):
+        return FULL_MODE
+    if robot_state == "disabled":
+        return LOW_POWER_MODE
+    return IDLE_MODE
+
+
+class PowerModeManager:
+    """Follows the robot's FMS state over NetworkTables and selects a power profile."""
+
+    def __init__(
+        self,
+        fms_info_nt: NetworkTable,
+        profiles: dict[str, dict],
+        log: Callable,
+        eagle_eye_nt: NetworkTable | None = None,
+    ) -> None:
+        """
+        Args:
+            fms_info_nt (NetworkTable): The `FMSInfo` table published by the robot.
+            profiles (dict[str, dict]): Per mode overrides of `DEFAULT_PROFILES`, with
+                the keys 'detection_fps' (0 for unlimited), 'input_size' (only used
+                by models that run at any input size), 'web_fps' and 'capture_fps'.
+            log (Callable): A callable logger function.
+            eagle_eye_nt (NetworkTable | None): Where the current mode is published
+                as 'power_mode'; None to not publish.
+        """
+        self.log = log
+        self.eagle_eye_nt = eagle_eye_nt
+        self.profiles = {
+            mode: {**default_profile, **profiles.get(mode, {})}
+            for mode, default_profile in DEFAULT_PROFILES.items()
+        }
+        self.listeners: list[Callable[[str, dict], None]] = []
+        self.mode_condition = threading.Condition()
+        self.mode = get_power_mode(int(fms_info_nt.getNumber("FMSControlData", 0)))
+        self._publish_mode()
+
+        fms_info_nt.addEntryListener(
+            self._on_control_data_changed,
+            key="FMSControlData",
+            immediateNotify=True,
+            localNotify=False,
+        )
+
+    def _on_control_data_changed(self, table, key, value, _) -> None:
+        """
+        Switches the mode as soon as the robot state changes.
+        """
+        mode = get_power_mode(int(value))
+        with self.mode_condition:
+            if mode == self.mode:
+                return
+            self.log(
+                f"Power mode {self.mode} -> {mode} (robot {get_robot_state(int(value))})"
+            )
+            self.mode = mode
+            listeners = list(self.listeners)
+            self.mode_condition.notify_all()
+        self._publish_mode()
+        for listener in listeners:
+            listener(mode, self.profiles[mode])
+
+    def _publish_mode(self) -> None:
+        """
+        Publishes the current mode to the EagleEye table.
+        """
+        if self.eagle_eye_nt is not None:
+            self.eagle_eye_nt.putString("power_mode", self.mode)
+
+    def add_listener(self, listener: Callable[[str, dict], None]) -> None:
+        """
+        Registers a callback run with the new mode and profile on every change.
+
+        The callback is also run once immediately with the current mode.
+
+        Args:
+            listener (Callable[[str, dict], None]): The callback.
+        """
+        with self.mode_condition:
+            self.listeners.append(listener)
+            mode = self.mode
+        listener(mode, self.profiles[mode])
+
+    def wait_for_next_frame(self, last_frame_time: float) -> None:
+        """
+        Sleeps until the current mode's detection rate allows the next frame.
+
+        A mode change wakes the wait up, so enabling the robot takes effect
+        without finishing an idle mode's long frame interval.
+
+        Args:
+            last_frame_time (float): When the previous frame was started, from `time()`.
+        """
+        with self.mode_condition:
+            while True:
+                detection_fps = self.profiles[self.mode]["detection_fps"]
+                if not detection_fps:
+                    return
+                remaining_time = last_frame_time + 1 / detection_fps - time()
+                if remaining_time <= 0:
+                    return
+                self.mode_condition.wait(remaining_time)
+
+    def get_mode(self) -> str:
+        """
+        Returns the current power mode.
+        """
+        return self.mode
+
+    def get_profile(self) -> dict:
+        """
+        Returns the settings of the current power mode.
+        """
+        return self.profiles[self.mode]
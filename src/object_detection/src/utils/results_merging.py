@@ -0,0 +1,123 @@
+import numpy as np
+import torch
+from torchvision.ops import batched_nms
+from ultralytics.engine.results import Results
+
+CUT_EDGE_MARGIN = 2
+
+
+def shift_results(
+    results: Results, offset: tuple[int, int], orig_img: np.ndarray
+) -> Results:
+    """
+    Moves the boxes of a result computed on part of a frame into full frame coordinates.
+
+    Args:
+        results (Results): The result of running the model on a region of the frame.
+        offset (tuple[int, int]): The (x, y) of the region's top left corner in the frame.
+        orig_img (np.ndarray): The full frame the result should refer to.
+
+    Returns:
+        Results: A result whose boxes and original image refer to the full frame.
+    """
+    boxes_data = results.boxes.data.clone()
+    boxes_data[:, [0, 2]] += offset[0]
+    boxes_data[:, [1, 3]] += offset[1]
+    shifted_results = Results(
+        orig_img, path=results.path, names=results.names, boxes=boxes_data
+    )
+    shifted_results.speed = results.speed
+    return shifted_results
+
+
+def remove_cut_boxes(
+    results: Results,
+    region: tuple[int, int, int, int],
+    frame_size: tuple[int, int],
+    margin: int = CUT_EDGE_MARGIN,
+) -> Results:
+    """
+    Drops the boxes touching an edge of a region that lies inside the frame.
+
+    A piece crossing such an edge is cut off, so its box is too small and its
+    distance is wrong. Tiles overlap and the full pass covers every tile, so the
+    piece is still found whole by another pass.
+
+    Args:
+        results (Results): The result of running the model on the region, in the
+            region's coordinates.
+        region (tuple[int, int, int, int]): The region as (x1, y1, x2, y2).
+        frame_size (tuple[int, int]): The (width, height) of the full frame.
+        margin (int): How close in pixels a box may come to an inner edge.
+
+    Returns:
+        Results: A result holding only the boxes away from the inner edges.
+    """
+    region_left, region_top, region_right, region_bottom = region
+    boxes_data = results.boxes.data
+    keep = torch.ones(len(boxes_data), dtype=torch.bool, device=boxes_data.device)
+    if region_left > 0:
+        keep &= boxes_data[:, 0] > margin
+    if region_top > 0:
+        keep &= boxes_data[:, 1] > margin
+    if region_right < frame_size[0]:
+        keep &= boxes_data[:, 2] < region_right - region_left - margin
+    if region_bottom < frame_size[1]:
+        keep &= boxes_data[:, 3] < region_bottom - region_top - margin
+    kept_results = Results(
+        results.orig_img, path=results.path, names=results.names, boxes=boxes_data[keep]
+    )
+    kept_results.speed = results.speed
+    return kept_results
+
+
+def merge_results(
+    results_list: list[Results], orig_img: np.ndarray, iou_threshold: float
+) -> Results:
+    """
+    Combines full frame results from several passes and removes duplicate boxes.
+
+    Boxes of the same class that overlap by more than `iou_threshold` are reduced
+    to the most confident one, so pieces seen by several tiles are reported once.
+
+    Args:
+        results_list (list[Results]): Results whose boxes are in full frame coordinates.
+        orig_img (np.ndarray): The full frame the merged result should refer to.
+        iou_threshold (float): The IoU above which boxes are considered duplicates.
+
+    Returns:
+        Results: A single result holding the surviving boxes.
+    """
+    boxes_data = torch.cat([results.boxes.data for results in results_list])
+    kept_indices = batched_nms(
+        boxes_data[:, :4], boxes_data[:, 4], boxes_data[:, 5], iou_threshold
+    )
+    merged_results = Results(
+        orig_img,
+        path=results_list[0].path,
+        names=results_list[0].names,
+        boxes=boxes_data[kept_indices],
+    )
+    merged_results.speed = {
+        stage: sum(results.speed.get(stage) or 0 for results in results_list)
+        for stage in results_list[0].speed
+    }
+    return merged_results
+
+
+def create_empty_results(orig_img: np.ndarray, names: dict[int, str]) -> Results:
+    """
+    Builds a result without boxes for frames the model was not run on.
+
+    Args:
+        orig_img (np.ndarray): The frame the result should refer to.
+        names (dict[int, str]): The model's class IDs to class names.
+
+    Returns:
+        Results: A result with zero boxes and zero timings.
+    """
+    empty_results = Results(
+        orig_img, path="", names=names, boxes=torch.zeros((0, 6), dtype=torch.float32)
+    )
+    empty_results.speed = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+    return empty_results
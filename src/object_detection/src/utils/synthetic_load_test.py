@@ -0,0 +1,180 @@
+import argparse
+import os
+import sys
+import threading
+from time import perf_counter, sleep
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from src.custom_logging.log import Logger
+from src.detection_processing import process_detections
+from src.devices.utils.cameras.frame import Frame
+from src.devices.utils.cameras.synthetic_camera import SyntheticCamera
+
+PIECE_CLASS_NAMES = {0: "piece"}
+
+logger = Logger(None)
+log = logger.log
+
+
+def build_camera_data(camera_index: int, arguments: argparse.Namespace) -> dict:
+    """
+    Build the configuration of one synthetic camera.
+
+    Args:
+        camera_index (int): The index of the camera, also used as its random seed.
+        arguments (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        dict: Camera data accepted by `SyntheticCamera`.
+    """
+    return {
+        "name": f"Synthetic {camera_index}",
+        "camera_type": "synthetic_camera",
+        "fov": [70, 38],
+        "camera_offset_pos": [0.25, 0.0, 0.75],
+        "camera_pitch": 0,
+        "camera_yaw": 0,
+        "frame_rotation": 0,
+        "processing_device": "cpu",
+        "resolution": arguments.resolution,
+        "fps": arguments.fps,
+        "piece_count": arguments.pieces,
+        "seed": camera_index,
+    }
+
+
+def measure_geometry_error(camera: SyntheticCamera, frame: Frame) -> list[float]:
+    """
+    Position the frame's ground truth boxes with `process_detections`.
+
+    The camera projects pieces through its own pinhole model, so this measures
+    how far the detection geometry is from that lens.
+
+    Args:
+        camera (SyntheticCamera): The camera the frame came from.
+        frame (Frame): The frame to check.
+
+    Returns:
+        list[float]: The distance in meters between each positioned and true
+            piece within the maximum detection distance.
+    """
+    sequence_number, ground_truth = camera.get_ground_truth()
+    if sequence_number != frame.sequence_number or not ground_truth:
+        return []
+    results = Results(
+        frame.image,
+        path=frame.camera_name,
+        names=PIECE_CLASS_NAMES,
+        boxes=torch.tensor(
+            [[*piece["box"], 1.0, 0] for piece in ground_truth], dtype=torch.float32
+        ),
+    )
+    detections = process_detections(
+        results,
+        frame.get_size(),
+        frame,
+        camera,
+        PIECE_CLASS_NAMES,
+        np.zeros(3),
+        log,
+    )
+    true_positions = {
+        tuple(float(value) for value in piece["box"]): piece["local_position"]
+        for piece in ground_truth
+    }
+    return [
+        float(
+            np.linalg.norm(
+                detection["local_position"]
+                - true_positions[tuple(detection["box"].tolist())]
+            )
+        )
+        for detection in detections
+    ]
+
+
+def consume_camera(
+    camera: SyntheticCamera,
+    stop_event: threading.Event,
+    frame_counts: dict[str, int],
+    geometry_errors: list[float],
+) -> None:
+    """
+    Pull frames from a camera as fast as possible and check their geometry.
+
+    Args:
+        camera (SyntheticCamera): The camera to read from.
+        stop_event (threading.Event): Set when the test is over.
+        frame_counts (dict[str, int]): Unique frames received per camera name.
+        geometry_errors (list[float]): Collected positioning errors.
+    """
+    last_sequence_number = 0
+    while not stop_event.is_set():
+        frame = camera.get_frame()
+        if frame.sequence_number == last_sequence_number:
+            sleep(0.001)
+            continue
+        last_sequence_number = frame.sequence_number
+        frame_counts[camera.get_name()] += 1
+        geometry_errors.extend(measure_geometry_error(camera, frame))
+
+
+def main() -> None:
+    """Stress frame delivery with N synthetic cameras and report geometry accuracy."""
+    parser = argparse.ArgumentParser(
+        description="Load test the camera pipeline with synthetic cameras."
+    )
+    parser.add_argument("--cameras", type=int, default=4, help="Number of cameras.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Test duration.")
+    parser.add_argument("--fps", type=float, default=30.0, help="Per camera fps.")
+    parser.add_argument("--pieces", type=int, default=3, help="Pieces per camera.")
+    parser.add_argument(
+        "--resolution", type=int, nargs=2, default=[640, 480], help="Width height."
+    )
+    arguments = parser.parse_args()
+
+    cameras = [
+        SyntheticCamera(build_camera_data(camera_index, arguments), log)
+        for camera_index in range(arguments.cameras)
+    ]
+    frame_counts = {camera.get_name(): 0 for camera in cameras}
+    geometry_errors: list[float] = []
+    stop_event = threading.Event()
+    consumer_threads = [
+        threading.Thread(
+            target=consume_camera,
+            args=(camera, stop_event, frame_counts, geometry_errors),
+            daemon=True,
+        )
+        for camera in cameras
+    ]
+
+    start_time = perf_counter()
+    for consumer_thread in consumer_threads:
+        consumer_thread.start()
+    sleep(arguments.seconds)
+    stop_event.set()
+    for consumer_thread in consumer_threads:
+        consumer_thread.join()
+    elapsed_time = perf_counter() - start_time
+
+    for camera_name, frame_count in frame_counts.items():
+        print(f"{camera_name}: {frame_count / elapsed_time:.1f} fps")
+    total_fps = sum(frame_counts.values()) / elapsed_time
+    print(f"Total: {total_fps:.1f} fps across {arguments.cameras} cameras")
+    if geometry_errors:
+        print(
+            f"Geometry error (m): mean {np.mean(geometry_errors):.3f}, "
+            f"max {np.max(geometry_errors):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import json
+
 import cv2
 import numpy as np
 from typing import Tuple, List, Optional
@@ -91,7 +93,7 @@ def calibrate_camera(
     object_points_list: List[np.ndarray],
     image_points_list: List[np.ndarray],
     image_size: Tuple[int, int],
-) -> Tuple[np.ndarray, float]:
+) -> Tuple[np.ndarray, np.ndarray, float]:
     """Calibrate the camera using collected object and image points.
 
     Args:
@@ -100,7 +102,7 @@ def calibrate_camera(
         image_size (Tuple[int, int]): Size of the calibration images (width, height).
 
     Returns:
-        Tuple[np.ndarray, float]: Camera matrix and mean reprojection error.
+        Tuple[np.ndarray, np.ndarray, float]: Camera matrix, distortion coefficients and mean reprojection error.
     """
     _, camera_matrix, distortion_coefficients, rotation_vectors, translation_vectors = cv2.calibrateCamera(
         object_points_list, image_points_list, image_size, None, None
@@ -113,7 +115,7 @@ def calibrate_camera(
         camera_matrix,
         distortion_coefficients,
     )
-    return camera_matrix, mean_reprojection_error
+    return camera_matrix, distortion_coefficients, mean_reprojection_error
 
 def compute_mean_reprojection_error(
     object_points_list: List[np.ndarray],
@@ -155,7 +157,7 @@ def calibrate_camera_from_image_array(
     square_size: float,
     minimum_patterns: int = 5,
     debug_display: bool = False,
-) -> Optional[Tuple[np.ndarray, float]]:
+) -> Optional[Tuple[np.ndarray, np.ndarray, float, Tuple[int, int]]]:
     """Perform camera calibration from a list of images (numpy arrays).
 
     Args:
@@ -167,7 +169,7 @@ def calibrate_camera_from_image_array(
         debug_display (bool, optional): Whether to display debug windows. Defaults to False.
 
     Returns:
-        Optional[Tuple[np.ndarray, float]]: Camera matrix and mean reprojection error, or None if not enough valid patterns are found.
+        Optional[Tuple[np.ndarray, np.ndarray, float, Tuple[int, int]]]: Camera matrix, distortion coefficients, mean reprojection error and calibration image size (width, height), or None if not enough valid patterns are found.
     """
     chessboard_size = (chessboard_rows, chessboard_cols)
     object_points_list, image_points_list, image_size = collect_calibration_points_from_image_array(
@@ -180,10 +182,35 @@ def calibrate_camera_from_image_array(
         return None
     if image_size is None:
         return None
-    camera_matrix, mean_reprojection_error = calibrate_camera(
+    camera_matrix, distortion_coefficients, mean_reprojection_error = calibrate_camera(
         object_points_list, image_points_list, image_size
     )
-    return camera_matrix, mean_reprojection_error
+    return camera_matrix, distortion_coefficients, mean_reprojection_error, image_size
+
+def save_camera_intrinsics(
+    json_path: str,
+    camera_matrix: np.ndarray,
+    distortion_coefficients: np.ndarray,
+    image_size: Tuple[int, int],
+) -> None:
+    """Save calibration results in the format read by the object detection cameras.
+
+    Args:
+        json_path (str): Path of the JSON file to write.
+        camera_matrix (np.ndarray): Camera matrix from calibration.
+        distortion_coefficients (np.ndarray): Distortion coefficients from calibration.
+        image_size (Tuple[int, int]): Size of the calibration images (width, height).
+    """
+    with open(json_path, "w") as file:
+        json.dump(
+            {
+                "camera_matrix": camera_matrix.tolist(),
+                "distortion_coefficients": distortion_coefficients.ravel().tolist(),
+                "image_size": list(image_size),
+            },
+            file,
+            indent=4,
+        )
 
 def undistort_image(
     image: np.ndarray,
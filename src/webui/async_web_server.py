@@ -0,0 +1,529 @@
+import asyncio
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from threading import Thread
+from typing import Callable, Generator
+
+import socketio
+from aiohttp import web
+
+from src.object_detection.src.constants.constants import Constants
+from src.webui.web_server import (
+    DEFAULT_H264_WIDTH,
+    DEFAULT_LONG_POLL_TIMEOUT,
+    DETECTION_KEEPALIVE_INTERVAL,
+    MAX_LONG_POLL_TIMEOUT,
+    MAX_STREAM_WIDTH,
+    MIN_H264_WIDTH,
+    EagleEyeInterface,
+    current_path,
+)
+from src.webui.web_server_utils.async_broadcaster import AsyncBroadcaster
+from src.webui.web_server_utils.frame_encoder import DEFAULT_QUALITY
+from src.webui.web_server_utils.h264_stream import is_h264_available
+
+MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache", "Access-Control-Allow-Origin": "*"}
+
+
+def _get_query_number(
+    query, key: str, number_type: type, default: float | None = None
+) -> float | None:
+    """
+    Read a number from the query string, like Flask's `request.args.get(type=...)`.
+
+    Returns:
+        float | None: The number, or the default if it is missing or malformed.
+    """
+    try:
+        return number_type(query[key])
+    except (KeyError, ValueError):
+        return default
+
+
+def _close_chunks(chunks: Generator, pending_chunk: Future | None) -> None:
+    """
+    Close a blocking chunk generator after the chunk it is producing arrived.
+    """
+    if pending_chunk is not None:
+        wait([pending_chunk])
+    chunks.close()
+
+
+class AsyncEagleEyeInterface(EagleEyeInterface):
+    """EagleEyeInterface served by aiohttp and python-socketio on one event loop.
+
+    Serves the same routes, feeds and SocketIO events as the Flask server.
+    Feed clients are coroutines instead of threads: one broadcaster per camera
+    waits for new frames, JPEG encodes are shared through the frame encoder's
+    cache, and every client writes the same encoded buffer, so hundreds of
+    viewers cost little more than a few.
+
+    H.264 feeds borrow a worker thread per client, because their encoder hands
+    out fragments through a blocking generator. Idle streams yield empty chunks,
+    so the worker of a client that left is released within a second.
+    """
+
+    def __init__(
+        self,
+        settings_object: Constants | None = None,
+        dev_mode: bool = False,
+        log: Callable | None = None,
+    ):
+        """
+        Initialize the AsyncEagleEyeInterface.
+
+        Starts the event loop in a separate thread.
+
+        Args:
+            settings_object (Constants | None): Optional settings object.
+        """
+        self.store_executor = ThreadPoolExecutor(thread_name_prefix="store_watcher")
+        self.h264_executor = ThreadPoolExecutor(
+            max_workers=64, thread_name_prefix="h264_client"
+        )
+        self.frame_broadcasters: dict[str, AsyncBroadcaster] = {}
+        self.detection_broadcaster: AsyncBroadcaster | None = None
+        self.feed_cameras: dict[str, str] = {}
+        super().__init__(settings_object, dev_mode, log)
+
+    def _start_server(self, dev_mode: bool) -> None:
+        """
+        Create the aiohttp application and serve it on an event loop thread.
+
+        Args:
+            dev_mode (bool): Whether to serve in the calling thread instead.
+        """
+        self.loop = asyncio.new_event_loop()
+        self.app = web.Application(middlewares=[self._log_errors])
+        self.socketio = socketio.AsyncServer(
+            async_mode="aiohttp",
+            cors_allowed_origins="*",
+            ping_timeout=60,
+            ping_interval=25,
+            logger=False,
+            engineio_logger=False,
+        )
+        self.socketio.attach(self.app)
+        self._register_routes()
+        self._register_socket_handlers()
+
+        if dev_mode:
+            self.run()
+        else:
+            self.app_thread = Thread(target=self.run, daemon=True)
+            self.app_thread.start()
+
+    def run(self) -> None:
+        """
+        Run the aiohttp application with SocketIO on the interface's event loop.
+        """
+        asyncio.set_event_loop(self.loop)
+        runner = web.AppRunner(self.app)
+        self.loop.run_until_complete(runner.setup())
+        self.loop.run_until_complete(web.TCPSite(runner, "0.0.0.0", 5001).start())
+        self.loop.run_forever()
+
+    @web.middleware
+    async def _log_errors(self, request: web.Request, handler) -> web.StreamResponse:
+        """
+        Log unexpected errors and answer them like the Flask server does.
+        """
+        try:
+            return await handler(request)
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            self.log("Error:", e)
+            return web.json_response({"message": "Internal server error"}, status=500)
+
+    def _register_routes(self) -> None:
+        """
+        Register all aiohttp endpoints.
+        """
+        router = self.app.router
+        router.add_get("/", self._serve_file(current_path, "index.html"))
+        router.add_get(
+            "/script.js",
+            self._serve_file(os.path.join(current_path, "static"), "bundle.js"),
+        )
+        router.add_get(
+            "/bundle.js.map",
+            self._serve_file(os.path.join(current_path, "static"), "bundle.js.map"),
+        )
+        router.add_post("/save-settings", self.set_settings)
+        router.add_get("/get-settings", self._respond_json(self.get_settings))
+        router.add_get(
+            "/get-available-cameras", self._respond_json(self.get_available_cameras)
+        )
+        router.add_get("/stream-stats", self._respond_json(self.get_stream_stats))
+        router.add_get(
+            "/stream-capabilities", self._respond_json(self.get_stream_capabilities)
+        )
+        router.add_post("/select-feed", self.select_feed)
+        router.add_get("/detections/stream", self.stream_detections)
+        router.add_get("/detections/latest", self.get_latest_detections)
+        router.add_get(
+            "/background.png",
+            self._serve_file(os.path.join(current_path, "static"), "background.png"),
+        )
+        router.add_post("/update-sphere-position", self.handle_sphere_position_request)
+        router.add_get(
+            "/frc2025r2.json",
+            self._serve_file(
+                os.path.join(current_path, "..", "apriltags", "utils"),
+                "frc2025r2.json",
+            ),
+        )
+        router.add_static(
+            "/src/webui/assets/apriltags",
+            os.path.join(current_path, "assets", "apriltags"),
+        )
+        router.add_get("/feed/{url_name}", self._serve_mjpeg_feed)
+        router.add_get("/feed-h264/{url_name}", self._serve_h264_feed)
+        # Like Flask's static folder, anything else is looked up in the web UI folder.
+        router.add_static("/", current_path)
+
+    @staticmethod
+    def _serve_file(directory: str, filename: str) -> Callable:
+        """
+        Returns a handler serving one file.
+        """
+
+        async def _handler(request: web.Request) -> web.FileResponse:
+            return web.FileResponse(os.path.join(directory, filename))
+
+        return _handler
+
+    @staticmethod
+    def _respond_json(get_data: Callable[[], dict]) -> Callable:
+        """
+        Returns a handler answering with the JSON of a method of the interface.
+        """
+
+        async def _handler(request: web.Request) -> web.Response:
+            return web.json_response(get_data())
+
+        return _handler
+
+    def _register_socket_handlers(self) -> None:
+        """
+        Register all SocketIO events.
+        """
+        self.socketio.on("subscribe_detections", self._subscribe_detections)
+        self.socketio.on("unsubscribe_detections", self._unsubscribe_detections)
+        self.socketio.on("disconnect", self._on_disconnect)
+
+    async def _subscribe_detections(self, client_id: str, data: dict) -> None:
+        """
+        Start sending a client the detection metadata of a camera.
+
+        Args:
+            client_id (str): The SocketIO session of the client.
+            data (dict): The message, holding the camera name under "camera".
+        """
+        camera_name = data.get("camera")
+        if camera_name is None:
+            return
+        await self.socketio.enter_room(client_id, camera_name)
+        self._add_detection_subscriber(camera_name, client_id)
+
+    async def _unsubscribe_detections(self, client_id: str, data: dict) -> None:
+        """
+        Stop sending a client the detection metadata of a camera.
+
+        Args:
+            client_id (str): The SocketIO session of the client.
+            data (dict): The message, holding the camera name under "camera".
+        """
+        camera_name = data.get("camera")
+        if camera_name is None:
+            return
+        await self.socketio.leave_room(client_id, camera_name)
+        self._remove_detection_subscriber(client_id, camera_name)
+
+    async def _on_disconnect(self, client_id: str, *args) -> None:
+        """
+        Forget the subscriptions of a disconnected client.
+        """
+        self._remove_detection_subscriber(client_id)
+
+    def _emit(self, event: str, data: dict, room: str | None = None) -> None:
+        """
+        Send a SocketIO event from any thread.
+
+        Args:
+            event (str): The event name.
+            data (dict): The JSON serializable payload.
+            room (str | None): The room to send to, None for every client.
+        """
+        asyncio.run_coroutine_threadsafe(
+            self.socketio.emit(event, data, to=room), self.loop
+        )
+
+    async def set_settings(self, request: web.Request) -> web.Response:
+        """
+        Set the current settings.
+
+        Returns:
+            web.Response: A success or failure message.
+        """
+        message, status = self._apply_settings(await self._read_json(request))
+        return web.json_response(message, status=status)
+
+    async def select_feed(self, request: web.Request) -> web.Response:
+        """
+        Give the camera the driver selected priority in the bandwidth budget.
+
+        Returns:
+            web.Response: A success or failure message.
+        """
+        data = await self._read_json(request) or {}
+        message, status = self._select_camera(data.get("camera"))
+        return web.json_response(message, status=status)
+
+    async def handle_sphere_position_request(
+        self, request: web.Request
+    ) -> web.Response:
+        """
+        Handle HTTP POST request to update sphere position.
+
+        Returns:
+            web.Response: A success or failure message.
+        """
+        message, status = self._handle_sphere_position(await self._read_json(request))
+        return web.json_response(message, status=status)
+
+    @staticmethod
+    async def _read_json(request: web.Request) -> dict | None:
+        """
+        Returns the JSON body of a request, None if it is missing or malformed.
+        """
+        try:
+            return await request.json()
+        except ValueError:
+            return None
+
+    def _get_detection_broadcaster(self) -> AsyncBroadcaster:
+        """
+        Returns the broadcaster of the detection store, creating it on first use.
+        """
+        if self.detection_broadcaster is None:
+            self.detection_broadcaster = AsyncBroadcaster(
+                self.detection_store.get_latest,
+                self.detection_store.wait_for_update,
+                self.store_executor,
+            )
+        return self.detection_broadcaster
+
+    def _get_frame_broadcaster(self, camera_name: str) -> AsyncBroadcaster:
+        """
+        Returns the broadcaster of a camera's frames, creating it on first use.
+        """
+        if camera_name not in self.frame_broadcasters:
+            self.frame_broadcasters[camera_name] = AsyncBroadcaster(
+                partial(self.frame_store.get_frame, camera_name),
+                partial(self.frame_store.wait_for_frame, camera_name),
+                self.store_executor,
+            )
+        return self.frame_broadcasters[camera_name]
+
+    async def stream_detections(self, request: web.Request) -> web.StreamResponse:
+        """
+        Stream the aggregated detections as Server-Sent Events.
+
+        Returns:
+            web.StreamResponse: The event stream, one event per change with the
+                sequence number as its ID.
+        """
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "X-Accel-Buffering": "no",
+                **NO_CACHE_HEADERS,
+            }
+        )
+        await response.prepare(request)
+        broadcaster = self._get_detection_broadcaster()
+        broadcaster.add_client()
+        try:
+            loop = asyncio.get_running_loop()
+            last_sequence_number = -1
+            last_write_time = loop.time()
+            while True:
+                update = await broadcaster.wait(last_sequence_number)
+                if update is None:
+                    if loop.time() - last_write_time >= DETECTION_KEEPALIVE_INTERVAL:
+                        await response.write(b": keep-alive\n\n")
+                        last_write_time = loop.time()
+                    continue
+                last_sequence_number, message = update
+                last_write_time = loop.time()
+                await response.write(
+                    f"id: {last_sequence_number}\ndata: {message}\n\n".encode()
+                )
+        except ConnectionResetError:
+            pass
+        finally:
+            broadcaster.remove_client()
+        return response
+
+    async def get_latest_detections(self, request: web.Request) -> web.Response:
+        """
+        Get the aggregated detections, long-polling for newer ones.
+
+        Returns:
+            web.Response: The detections as JSON, or an empty 204 response.
+        """
+        since = _get_query_number(request.query, "since", int)
+        timeout = _get_query_number(
+            request.query, "timeout", float, DEFAULT_LONG_POLL_TIMEOUT
+        )
+        sequence_number, message = self.detection_store.get_latest()
+        if since is not None and since == sequence_number:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + min(max(timeout, 0.0), MAX_LONG_POLL_TIMEOUT)
+            broadcaster = self._get_detection_broadcaster()
+            broadcaster.add_client()
+            try:
+                update = await broadcaster.wait(since)
+                while update is None and loop.time() < deadline:
+                    update = await broadcaster.wait(since)
+            finally:
+                broadcaster.remove_client()
+            if update is None:
+                return web.Response(status=204, headers=NO_CACHE_HEADERS)
+            _, message = update
+        return web.Response(
+            text=message, content_type="application/json", headers=NO_CACHE_HEADERS
+        )
+
+    def _get_feed_camera(self, request: web.Request) -> str:
+        """
+        Returns the camera a feed URL refers to.
+
+        Raises:
+            web.HTTPNotFound: If no feed is served under the URL.
+        """
+        camera_name = self.feed_cameras.get(request.match_info["url_name"])
+        if camera_name is None:
+            raise web.HTTPNotFound()
+        return camera_name
+
+    async def _serve_mjpeg_feed(self, request: web.Request) -> web.StreamResponse:
+        """
+        Stream a camera as MJPEG, e.g. /feed/cam?width=320&quality=60&fps=15.
+
+        Works like the Flask server's frame generator: every frame version is
+        sent at most once, slow clients skip to the latest frame and the bandwidth
+        budgeter may lower the requested settings.
+
+        Returns:
+            web.StreamResponse: The camera feed.
+        """
+        camera_name = self._get_feed_camera(request)
+        width, quality, max_fps = self._clamp_feed_settings(
+            _get_query_number(request.query, "width", int),
+            _get_query_number(request.query, "quality", int, DEFAULT_QUALITY),
+            _get_query_number(request.query, "fps", float),
+        )
+        response = web.StreamResponse(
+            headers={"Content-Type": "multipart/x-mixed-replace; boundary=frame"}
+        )
+        await response.prepare(request)
+
+        loop = asyncio.get_running_loop()
+        broadcaster = self._get_frame_broadcaster(camera_name)
+        version, frame = broadcaster.add_client()
+        self.frame_store.subscribe(camera_name, max_fps)
+        feed_id = self.bandwidth_budgeter.register(camera_name, width, quality, max_fps)
+        try:
+            while True:
+                time_start = loop.time()
+                feed_width, feed_quality, feed_fps = (
+                    self.bandwidth_budgeter.get_settings(
+                        feed_id,
+                        frame.shape[1],
+                        self.stream_fps,
+                    )
+                )
+                encoding = self.frame_encoder.submit(
+                    camera_name, version, frame, feed_width, feed_quality
+                )
+                # Most clients find the encode another client already finished.
+                frame_bytes = (
+                    encoding.result()
+                    if encoding.done()
+                    else await asyncio.wrap_future(encoding)
+                )
+                # Every client writes the shared encoded buffer instead of a copy.
+                await response.write(MJPEG_PART_HEADER)
+                await response.write(frame_bytes)
+                await response.write(b"\r\n")
+                self.bandwidth_budgeter.record(feed_id, len(frame_bytes))
+
+                remaining_time = (1 / feed_fps) - (loop.time() - time_start)
+                if remaining_time > 0:
+                    await asyncio.sleep(remaining_time)
+                update = await broadcaster.wait(version)
+                while update is None:
+                    if request.transport is None or request.transport.is_closing():
+                        return response
+                    update = await broadcaster.wait(version)
+                version, frame = update
+        except ConnectionResetError:
+            pass
+        finally:
+            self.bandwidth_budgeter.unregister(feed_id)
+            self.frame_store.unsubscribe(camera_name, max_fps)
+            broadcaster.remove_client()
+        return response
+
+    async def _serve_h264_feed(self, request: web.Request) -> web.StreamResponse:
+        """
+        Stream a camera as H.264 fragmented MP4, e.g. /feed-h264/cam?width=640.
+
+        Returns:
+            web.StreamResponse: The camera feed.
+        """
+        camera_name = self._get_feed_camera(request)
+        if not is_h264_available():
+            return web.json_response(
+                {"message": "H.264 streaming needs PyAV installed"}, status=404
+            )
+        width = _get_query_number(request.query, "width", int, DEFAULT_H264_WIDTH)
+        h264_stream = self._get_h264_stream(
+            camera_name, min(max(width, MIN_H264_WIDTH), MAX_STREAM_WIDTH)
+        )
+        response = web.StreamResponse(headers={"Content-Type": "video/mp4"})
+        await response.prepare(request)
+
+        chunks = h264_stream.stream()
+        pending_chunk = None
+        try:
+            while True:
+                pending_chunk = self.h264_executor.submit(next, chunks, None)
+                chunk = await asyncio.wrap_future(pending_chunk)
+                if chunk is None:
+                    break
+                if request.transport is None or request.transport.is_closing():
+                    break
+                if chunk:
+                    await response.write(chunk)
+        except ConnectionResetError:
+            pass
+        finally:
+            # The generator can only be closed once its pending chunk arrived,
+            # which takes at most FRAME_WAIT_TIMEOUT as idle streams yield b"".
+            self.h264_executor.submit(_close_chunks, chunks, pending_chunk)
+        return response
+
+    def _register_feed_routes(self, camera_name: str) -> None:
+        """
+        Make a camera's feeds available under the shared feed routes.
+
+        Args:
+            camera_name (str): The ID of the camera.
+        """
+        self.feed_cameras[camera_name.replace(" ", "_")] = camera_name
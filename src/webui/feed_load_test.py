@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+from time import perf_counter, process_time, sleep
+
+import cv2
+import numpy as np
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from src.webui.web_server import EagleEyeInterface
+
+CAMERA_NAME = "Load Test"
+SERVER_URL = "http://127.0.0.1:5001"
+FRAME_BOUNDARY = b"--frame"
+
+
+def publish_frames(
+    interface: EagleEyeInterface, resolution: list[int], fps: float
+) -> None:
+    """
+    Publish a moving test pattern to the load test camera forever.
+
+    Args:
+        interface (EagleEyeInterface): The web server under test.
+        resolution (list[int]): The (width, height) of the frames.
+        fps (float): The rate frames are published at.
+    """
+    width, height = resolution
+    background = np.dstack(
+        [np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))] * 3
+    )
+    frame_number = 0
+    while True:
+        frame = background.copy()
+        x = frame_number * 8 % max(width - 80, 1)
+        cv2.rectangle(
+            frame, (x, height // 3), (x + 80, height // 3 + 80), (0, 0, 255), -1
+        )
+        cv2.putText(
+            frame,
+            str(frame_number),
+            (10, 40),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (255, 255, 255),
+            2,
+        )
+        interface.update_camera_frame(CAMERA_NAME, frame)
+        frame_number += 1
+        sleep(1 / fps)
+
+
+async def read_feed(
+    session, url: str, deadline: float, frame_counts: list[int], index: int
+) -> None:
+    """
+    Read an MJPEG feed until the deadline, counting the frames received.
+    """
+    tail = b""
+    async with session.get(url) as response:
+        async for chunk in response.content.iter_any():
+            data = tail + chunk
+            frame_counts[index] += data.count(FRAME_BOUNDARY)
+            tail = data[-(len(FRAME_BOUNDARY) - 1) :]
+            if perf_counter() >= deadline:
+                return
+
+
+async def run_clients(client_count: int, duration: float, url: str) -> list[int]:
+    """
+    Open many feed connections at once and count the frames each receives.
+
+    Returns:
+        list[int]: The number of frames every client received.
+    """
+    import aiohttp
+
+    frame_counts = [0] * client_count
+    deadline = perf_counter() + duration
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=duration + 10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(
+            *(
+                read_feed(session, url, deadline, frame_counts, index)
+                for index in range(client_count)
+            ),
+            return_exceptions=True,
+        )
+    return frame_counts
+
+
+def client_process(
+    client_count: int, duration: float, url: str, result_queue: multiprocessing.Queue
+) -> None:
+    """
+    Run the clients in their own process, so they do not count as server work.
+    """
+    result_queue.put(asyncio.run(run_clients(client_count, duration, url)))
+
+
+def measure_server(duration: float) -> tuple[float, int]:
+    """
+    Measure the CPU time this process uses over a window.
+
+    Returns:
+        tuple[float, int]: The CPU seconds used and the threads alive at the end.
+    """
+    cpu_start = process_time()
+    sleep(duration)
+    return process_time() - cpu_start, threading.active_count()
+
+
+def main() -> None:
+    """Measure the per-client cost of MJPEG feeds on one of the web server backends."""
+    parser = argparse.ArgumentParser(
+        description="Load test the camera feeds of the web server."
+    )
+    parser.add_argument(
+        "--backend", choices=["flask", "aiohttp"], default="aiohttp", help="Server."
+    )
+    parser.add_argument(
+        "--clients", type=int, nargs="+", default=[1, 10, 50, 100, 200], help="Loads."
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per load."
+    )
+    parser.add_argument("--fps", type=float, default=30.0, help="Published frame rate.")
+    parser.add_argument(
+        "--resolution", type=int, nargs=2, default=[640, 480], help="Width height."
+    )
+    parser.add_argument("--width", type=int, help="Requested feed width.")
+    arguments = parser.parse_args()
+
+    if arguments.backend == "aiohttp":
+        from src.webui.async_web_server import AsyncEagleEyeInterface
+
+        interface = AsyncEagleEyeInterface(log=lambda *args, **kwargs: None)
+    else:
+        interface = EagleEyeInterface(log=lambda *args, **kwargs: None)
+    interface.cameras[CAMERA_NAME] = 0
+    interface.serve_camera_feed(CAMERA_NAME)
+    threading.Thread(
+        target=publish_frames,
+        args=(interface, arguments.resolution, arguments.fps),
+        daemon=True,
+    ).start()
+    sleep(2)
+
+    url = f"{SERVER_URL}/feed/{CAMERA_NAME.replace(' ', '_')}"
+    if arguments.width:
+        url += f"?width={arguments.width}"
+    baseline_cpu, baseline_threads = measure_server(arguments.duration)
+    print(f"Backend: {arguments.backend}, {arguments.fps:.0f} fps published")
+    print(
+        f"Without clients: {baseline_cpu / arguments.duration * 100:.1f}% CPU, "
+        f"{baseline_threads} threads"
+    )
+    print("clients  threads  cpu %  cpu ms/client/s  fps mean  fps min")
+
+    context = multiprocessing.get_context("spawn")
+    for client_count in arguments.clients:
+        result_queue = context.Queue()
+        clients = context.Process(
+            target=client_process,
+            args=(client_count, arguments.duration + 2, url, result_queue),
+        )
+        clients.start()
+        # Skip the connection ramp up before measuring.
+        sleep(2)
+        server_cpu, thread_count = measure_server(arguments.duration)
+        frame_counts = np.array(result_queue.get())
+        clients.join()
+
+        client_fps = frame_counts / (arguments.duration + 2)
+        cpu_ms_per_client = (
+            (server_cpu - baseline_cpu) / arguments.duration / client_count * 1000
+        )
+        print(
+            f"{client_count:7d}  {thread_count:7d}  "
+            f"{server_cpu / arguments.duration * 100:5.1f}  "
+            f"{cpu_ms_per_client:15.2f}  {client_fps.mean():8.1f}  "
+            f"{client_fps.min():7.1f}"
+        )
+        sleep(1)
+
+    peak_memory_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Peak server memory: {peak_memory_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
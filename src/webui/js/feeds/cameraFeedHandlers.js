@@ -1,8 +1,12 @@
+import { attachDetectionOverlay } from "./detectionOverlay.js";
+import { attachH264Feed, canPlayH264, getStreamCapabilities } from "./h264Feed.js";
+
 export function setupCameraFeedHandlers() {
     const addFeedBackgroundDiv = document.getElementById("addFeedBackgroundDiv");
     const cameraSelect = document.getElementById("cameraSelect");
     const saveFeedBtn = document.getElementById("saveFeedBtn");
     const cancelFeedBtn = document.getElementById("cancelFeedBtn");
+    const lowBandwidthCheckbox = document.getElementById("lowBandwidthCheckbox");
 
     document.getElementById("addFeedBtn").addEventListener("click", () => {
         fetch("/get-available-cameras", {
@@ -37,6 +41,18 @@ export function setupCameraFeedHandlers() {
         document.body.classList.remove("overflow-hidden");
     });
 
+    function selectFeed(cameraName) {
+        fetch("/select-feed", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+            },
+            body: JSON.stringify({ camera: cameraName }),
+        }).catch((error) => {
+            console.error("Error selecting feed:", error);
+        });
+    }
+
     function updateGridLayout() {
         const cameraList = document.getElementById("cameraList");
         const cameraCount = cameraList.children.length;
@@ -55,7 +71,40 @@ export function setupCameraFeedHandlers() {
         cameraList.style.gridTemplateColumns = `repeat(${columns}, 1fr)`;
     }
 
-    saveFeedBtn.addEventListener("click", () => {
+    function createMjpegView(urlName) {
+        const cameraView = document.createElement("img");
+        cameraView.className = "camera-view";
+        cameraView.src = `/feed/${urlName}`;
+        return cameraView;
+    }
+
+    async function createCameraView(urlName) {
+        if (!lowBandwidthCheckbox.checked) {
+            return { view: createMjpegView(urlName), stop: () => {} };
+        }
+        const capabilities = await getStreamCapabilities();
+        if (!canPlayH264(capabilities)) {
+            return { view: createMjpegView(urlName), stop: () => {} };
+        }
+        const cameraView = document.createElement("video");
+        cameraView.className = "camera-view";
+        const feed = { view: cameraView, stop: () => {} };
+        feed.stop = attachH264Feed(
+            cameraView,
+            `/feed-h264/${urlName}`,
+            capabilities.h264_mime_type,
+            () => {
+                feed.stop();
+                const mjpegView = createMjpegView(urlName);
+                cameraView.replaceWith(mjpegView);
+                feed.view = mjpegView;
+                feed.stop = () => {};
+            }
+        );
+        return feed;
+    }
+
+    saveFeedBtn.addEventListener("click", async () => {
         const selectedCamera = cameraSelect.value;
         if (!selectedCamera) {
             alert("Please select a camera.");
@@ -66,14 +115,35 @@ export function setupCameraFeedHandlers() {
         const cameraBox = document.createElement("div");
         cameraBox.className = "camera-box";
         cameraBox.textContent = `${selectedCameraName}`;
-        const cameraView = document.createElement("img");
-        cameraView.className = "camera-view";
-        cameraView.src = `/feed/${selectedCameraName.replace(/ /g, "_")}`;
-        cameraBox.appendChild(cameraView);
+        const cameraFeed = await createCameraView(
+            selectedCameraName.replace(/ /g, "_")
+        );
+        cameraBox.appendChild(cameraFeed.view);
+        const detachOverlay = attachDetectionOverlay(
+            cameraBox,
+            selectedCameraName,
+            () => cameraFeed.view,
+        );
+        cameraBox.addEventListener("click", () => {
+            const wasSelected = cameraBox.classList.contains("selected");
+            document
+                .querySelectorAll(".camera-box.selected")
+                .forEach((box) => box.classList.remove("selected"));
+            if (!wasSelected) {
+                cameraBox.classList.add("selected");
+            }
+            selectFeed(wasSelected ? null : selectedCameraName);
+        });
         const removeButton = document.createElement("button");
         removeButton.className = "camera-remove-btn";
         removeButton.textContent = "×";
-        removeButton.addEventListener("click", function () {
+        removeButton.addEventListener("click", function (event) {
+            event.stopPropagation();
+            if (cameraBox.classList.contains("selected")) {
+                selectFeed(null);
+            }
+            cameraFeed.stop();
+            detachOverlay();
             cameraBox.remove();
             const cameraList = document.getElementById("cameraList");
             if (cameraList.children.length === 0) {
@@ -0,0 +1,164 @@
+// The palette of the server-side renderer.
+const CLASS_COLORS = [
+    "#FF3838", "#FF9D97", "#FF701F", "#FFB21D", "#CFD231",
+    "#48F90A", "#92CC17", "#3DDB86", "#1A9334", "#00D4BB",
+    "#2C99A8", "#00C2FF", "#344593", "#6473FF", "#0018EC",
+    "#8438FF", "#520085", "#CB38FF", "#FF95C8", "#FF37C7",
+];
+const LABEL_FONT = "12px sans-serif";
+const LABEL_HEIGHT = 16;
+
+let socket = null;
+const overlays = new Map();
+const classColors = new Map();
+
+function getClassColor(className) {
+    if (!classColors.has(className)) {
+        classColors.set(
+            className,
+            CLASS_COLORS[classColors.size % CLASS_COLORS.length],
+        );
+    }
+    return classColors.get(className);
+}
+
+function getMediaSize(view) {
+    if (view instanceof HTMLVideoElement) {
+        return [view.videoWidth, view.videoHeight];
+    }
+    return [view.naturalWidth, view.naturalHeight];
+}
+
+// The rectangle an object-fit: contain media element actually fills.
+function getContentRect(view, canvas) {
+    const [mediaWidth, mediaHeight] = getMediaSize(view);
+    if (!mediaWidth || !mediaHeight) {
+        return null;
+    }
+    const scale = Math.min(canvas.width / mediaWidth, canvas.height / mediaHeight);
+    const width = mediaWidth * scale;
+    const height = mediaHeight * scale;
+    return {
+        x: (canvas.width - width) / 2,
+        y: (canvas.height - height) / 2,
+        width,
+        height,
+    };
+}
+
+function drawLabel(context, text, x, y, background) {
+    const width = context.measureText(text).width + 6;
+    context.fillStyle = background;
+    context.fillRect(x, y, width, LABEL_HEIGHT);
+    context.fillStyle = "#FFFFFF";
+    context.fillText(text, x + 3, y + LABEL_HEIGHT - 4);
+}
+
+function drawOverlay(overlay) {
+    overlay.drawPending = false;
+    const { canvas, message } = overlay;
+    const view = overlay.getView();
+    canvas.width = canvas.clientWidth;
+    canvas.height = canvas.clientHeight;
+    const context = canvas.getContext("2d");
+    context.clearRect(0, 0, canvas.width, canvas.height);
+    const rect = message && getContentRect(view, canvas);
+    if (!rect) {
+        return;
+    }
+
+    context.font = LABEL_FONT;
+    context.lineWidth = 2;
+    for (const detection of message.detections) {
+        const [x1, y1, x2, y2] = detection.box;
+        const left = rect.x + x1 * rect.width;
+        const top = rect.y + y1 * rect.height;
+        const right = rect.x + x2 * rect.width;
+        const bottom = rect.y + y2 * rect.height;
+        const color = getClassColor(detection.class);
+        context.strokeStyle = color;
+        context.strokeRect(left, top, right - left, bottom - top);
+        drawLabel(
+            context,
+            `${detection.class} ${detection.confidence.toFixed(2)}`,
+            left,
+            Math.max(top - LABEL_HEIGHT, rect.y),
+            color,
+        );
+        drawLabel(
+            context,
+            `${detection.distance.toFixed(2)}m ${detection.yaw.toFixed(1)}° ` +
+                `(${detection.global_position
+                    .map((value) => value.toFixed(2))
+                    .join(", ")})`,
+            left,
+            Math.min(bottom, rect.y + rect.height - LABEL_HEIGHT),
+            "#000000",
+        );
+    }
+    drawLabel(context, `FPS: ${message.fps.toFixed(1)}`, rect.x, rect.y, "#000000");
+}
+
+function scheduleDraw(overlay) {
+    if (!overlay.drawPending) {
+        overlay.drawPending = true;
+        requestAnimationFrame(() => drawOverlay(overlay));
+    }
+}
+
+export function setupDetectionOverlays(detectionSocket) {
+    socket = detectionSocket;
+    socket.on("connect", () => {
+        for (const [cameraName, cameraOverlays] of overlays) {
+            // Sequence numbers start over when the server restarts.
+            for (const overlay of cameraOverlays) {
+                overlay.message = null;
+            }
+            socket.emit("subscribe_detections", { camera: cameraName });
+        }
+    });
+    socket.on("detections", (message) => {
+        const cameraOverlays = overlays.get(message.camera);
+        if (!cameraOverlays) {
+            return;
+        }
+        for (const overlay of cameraOverlays) {
+            // Messages can overtake each other, never draw an older frame's boxes.
+            if (overlay.message && message.seq <= overlay.message.seq) {
+                continue;
+            }
+            overlay.message = message;
+            scheduleDraw(overlay);
+        }
+    });
+}
+
+export function attachDetectionOverlay(cameraBox, cameraName, getView) {
+    const canvas = document.createElement("canvas");
+    canvas.className = "camera-overlay";
+    cameraBox.appendChild(canvas);
+    const overlay = { canvas, getView, message: null, drawPending: false };
+
+    if (!overlays.has(cameraName)) {
+        overlays.set(cameraName, new Set());
+        if (socket) {
+            socket.emit("subscribe_detections", { camera: cameraName });
+        }
+    }
+    overlays.get(cameraName).add(overlay);
+    const resizeObserver = new ResizeObserver(() => scheduleDraw(overlay));
+    resizeObserver.observe(canvas);
+
+    return () => {
+        resizeObserver.disconnect();
+        canvas.remove();
+        const cameraOverlays = overlays.get(cameraName);
+        cameraOverlays.delete(overlay);
+        if (cameraOverlays.size === 0) {
+            overlays.delete(cameraName);
+            if (socket) {
+                socket.emit("unsubscribe_detections", { camera: cameraName });
+            }
+        }
+    };
+}
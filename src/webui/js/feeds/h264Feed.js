@@ -0,0 +1,85 @@
+// Seconds of buffered video after which playback jumps back to live.
+const MAX_LIVE_DELAY = 0.5;
+
+let streamCapabilities = null;
+
+export function getStreamCapabilities() {
+    if (streamCapabilities === null) {
+        streamCapabilities = fetch("/stream-capabilities", { method: "GET" })
+            .then((response) => response.json())
+            .catch(() => ({ h264: false }));
+    }
+    return streamCapabilities;
+}
+
+export function canPlayH264(capabilities) {
+    return (
+        capabilities.h264 &&
+        "MediaSource" in window &&
+        MediaSource.isTypeSupported(capabilities.h264_mime_type)
+    );
+}
+
+export function attachH264Feed(video, url, mimeType, onError) {
+    const mediaSource = new MediaSource();
+    const abortController = new AbortController();
+    video.src = URL.createObjectURL(mediaSource);
+    video.muted = true;
+    video.autoplay = true;
+    video.playsInline = true;
+
+    mediaSource.addEventListener("sourceopen", async () => {
+        const sourceBuffer = mediaSource.addSourceBuffer(mimeType);
+        sourceBuffer.mode = "sequence";
+        const pendingChunks = [];
+
+        const appendNext = () => {
+            if (sourceBuffer.updating || pendingChunks.length === 0) {
+                return;
+            }
+            sourceBuffer.appendBuffer(pendingChunks.shift());
+        };
+        sourceBuffer.addEventListener("updateend", () => {
+            const buffered = sourceBuffer.buffered;
+            if (buffered.length > 0) {
+                const liveEdge = buffered.end(buffered.length - 1);
+                if (liveEdge - video.currentTime > MAX_LIVE_DELAY) {
+                    video.currentTime = liveEdge - 0.05;
+                }
+                if (video.currentTime - buffered.start(0) > 10) {
+                    sourceBuffer.remove(buffered.start(0), video.currentTime - 5);
+                    return;
+                }
+            }
+            appendNext();
+        });
+
+        try {
+            const response = await fetch(url, { signal: abortController.signal });
+            if (!response.ok) {
+                throw new Error(`H.264 feed returned ${response.status}`);
+            }
+            const reader = response.body.getReader();
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) {
+                    // The server ends the response when its encoder stops.
+                    throw new Error("H.264 feed ended");
+                }
+                pendingChunks.push(value);
+                appendNext();
+                video.play().catch(() => {});
+            }
+        } catch (error) {
+            if (error.name !== "AbortError") {
+                console.error("H.264 feed failed, falling back to MJPEG:", error);
+                onError();
+            }
+        }
+    });
+
+    return () => {
+        abortController.abort();
+        URL.revokeObjectURL(video.src);
+    };
+}
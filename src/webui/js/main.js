@@ -1,7 +1,9 @@
 import { populateFieldDropdown } from "./dropdown/fieldDropdown.js";
 import { setupSidebar } from "./ui/sidebar.js";
 import { setupCameraFeedHandlers } from "./feeds/cameraFeedHandlers.js";
+import { setupDetectionOverlays } from "./feeds/detectionOverlay.js";
 import { saveSettings } from "./settings/saveSettings.js";
+import { setupStreamStats } from "./settings/streamStats.js";
 import { updateTrackedCameraTransform } from "./init3DView.js";
 import "../index.css";
 import io from "socket.io-client";
@@ -11,6 +13,7 @@ window.onload = () => {
     setupSidebar();
     setupCameraFeedHandlers();
     saveSettings();
+    setupStreamStats();
 
     const mmToM = 1000;
 
@@ -30,6 +33,7 @@ window.onload = () => {
         timeout: 5000,
         forceNew: true
     })
+    setupDetectionOverlays(socket);
     
     socket.on("update_sphere_position", (data) => {
         if (data && data.transform_matrix && Array.isArray(data.transform_matrix) && data.transform_matrix.length === 4) {
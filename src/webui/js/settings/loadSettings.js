@@ -34,5 +34,7 @@ export function loadSettings() {
             settings["ObjectDetectionConstants"]["combined_threshold"];
         document.getElementById("maxDistanceInput").value =
             settings["ObjectDetectionConstants"]["max_distance"];
+        document.getElementById("streamBandwidthInput").value =
+            settings["DisplayConstants"]["stream_bandwidth_mbps"] ?? 0;
     });
 }
@@ -37,6 +37,12 @@ export function saveSettings() {
                     document.getElementById("maxDistanceInput").value,
                 ),
             },
+            DisplayConstants: {
+                stream_bandwidth_mbps:
+                    parseFloat(
+                        document.getElementById("streamBandwidthInput").value,
+                    ) || 0,
+            },
         };
 
         console.log("Settings saved:", settings);
@@ -0,0 +1,37 @@
+const STREAM_STATS_INTERVAL_MS = 1000;
+
+function formatStreamStats(stats) {
+    const limit =
+        stats["max_mbps"] > 0 ? `${stats["max_mbps"]} Mbps` : "no limit";
+    const lines = [`Total: ${stats["total_mbps"].toFixed(2)} Mbps (${limit})`];
+    for (const feed of stats["feeds"]) {
+        lines.push(
+            `${feed["selected"] ? "★ " : ""}${feed["camera"]}: ` +
+                `${feed["mbps"].toFixed(2)} Mbps, ${feed["fps"]} fps, ` +
+                `${feed["width"]}px, quality ${feed["quality"]}`,
+        );
+    }
+    if (stats["feeds"].length === 0) {
+        lines.push("No active feeds");
+    }
+    return lines.join("\n");
+}
+
+export function setupStreamStats() {
+    const settingsView = document.getElementById("view-settings");
+    const streamStatsDisplay = document.getElementById("streamStatsDisplay");
+
+    setInterval(() => {
+        if (settingsView.classList.contains("hidden")) {
+            return;
+        }
+        fetch("/stream-stats", { method: "GET" })
+            .then((response) => response.json())
+            .then((stats) => {
+                streamStatsDisplay.textContent = formatStreamStats(stats);
+            })
+            .catch((error) => {
+                console.error("Error fetching stream stats:", error);
+            });
+    }, STREAM_STATS_INTERVAL_MS);
+}
@@ -0,0 +1,482 @@
+import multiprocessing
+import queue
+from multiprocessing.synchronize import Event
+from threading import Lock, Thread
+from time import sleep
+from typing import Callable
+
+import numpy as np
+
+from src.object_detection.src.constants.constants import Constants
+from src.object_detection.src.devices.utils.cameras.frame import Frame
+from src.object_detection.src.devices.utils.frame_bus import (
+    FrameBusReader,
+    FrameBusWriter,
+)
+
+MESSAGE_QUEUE_SIZE = 64
+MAX_CAMERAS = 16
+POLL_INTERVAL = 0.005
+RESTART_DELAY = 1.0
+
+
+class _ForwardedSettings(Constants):
+    """Settings of the web process whose writes are saved by the main process."""
+
+    def __init__(self, config: dict, message_queue: multiprocessing.Queue) -> None:
+        """
+        Args:
+            config (dict): The configuration of the main process.
+            message_queue (multiprocessing.Queue): Where settings writes are sent.
+        """
+        self.config_path = None
+        self.config_json = config
+        self.message_queue = message_queue
+
+    def load_config_from_file(self) -> dict:
+        """
+        Returns the configuration, which only the main process reads from disk.
+        """
+        return self.config_json
+
+    def set_value(self, key: str, value) -> None:
+        """
+        Set a value and forward the configuration to the main process.
+
+        Args:
+            key (str): The key to set the value for.
+            value (any): The value to set.
+        """
+        self.config_json[key] = value
+        self.save_config()
+
+    def save_config(self) -> None:
+        """
+        Send the configuration to the main process, which applies and saves it.
+        """
+        self.message_queue.put(("settings", self.config_json))
+
+
+def _create_queue_log(message_queue: multiprocessing.Queue) -> Callable:
+    """
+    Build a log function that forwards messages to the main process.
+
+    Args:
+        message_queue (multiprocessing.Queue): The web process' outgoing queue.
+
+    Returns:
+        Callable: A function accepting the arguments of `Logger.log` and, like
+            `print`, several messages.
+    """
+
+    def log(*messages, force_log=False, force_no_log=False) -> None:
+        if force_no_log:
+            return
+        message_queue.put(("log", " ".join(str(message) for message in messages)))
+
+    return log
+
+
+def _create_interface(settings_object: Constants, log: Callable):
+    """
+    Start the web server backend selected by DisplayConstants.web_backend.
+
+    Args:
+        settings_object (Constants): The settings the web server reads and writes.
+        log (Callable): The logger of the web server.
+
+    Returns:
+        EagleEyeInterface: The running web server.
+    """
+    if settings_object.get_value("DisplayConstants.web_backend", "flask") == "aiohttp":
+        from src.webui.async_web_server import AsyncEagleEyeInterface
+
+        return AsyncEagleEyeInterface(settings_object=settings_object, log=log)
+
+    from src.webui.web_server import EagleEyeInterface
+
+    return EagleEyeInterface(settings_object=settings_object, log=log)
+
+
+def _get_web_bus_name(camera_name: str) -> str:
+    """
+    Returns the name of the frame bus a camera's feed frames are published to.
+    """
+    return f"web {camera_name}"
+
+
+def _read_frame_bus(
+    camera_name: str,
+    frame_bus_readers: dict[str, FrameBusReader],
+    last_sequence_numbers: dict[str, int],
+) -> Frame | None:
+    """
+    Read a camera's newest feed frame, attaching to its frame bus when needed.
+
+    The main process creates the bus with the first frame and replaces it when
+    frames grow, so a missing or closed bus is retried on the next poll.
+
+    Args:
+        camera_name (str): The ID of the camera.
+        frame_bus_readers (dict[str, FrameBusReader]): The attached readers.
+        last_sequence_numbers (dict[str, int]): The last frame read per camera.
+
+    Returns:
+        Frame | None: A copy of the newest frame, or None if there is none.
+    """
+    frame_bus_reader = frame_bus_readers.get(camera_name)
+    if frame_bus_reader is not None and frame_bus_reader.is_closed():
+        frame_bus_readers.pop(camera_name).close()
+        frame_bus_reader = None
+    if frame_bus_reader is None:
+        try:
+            frame_bus_reader = FrameBusReader(_get_web_bus_name(camera_name))
+        except FileNotFoundError:
+            return None
+        frame_bus_readers[camera_name] = frame_bus_reader
+        last_sequence_numbers[camera_name] = 0
+
+    if (
+        frame_bus_reader.get_latest_sequence_number()
+        <= last_sequence_numbers[camera_name]
+    ):
+        return None
+    frame = frame_bus_reader.read_latest(copy=True)
+    if frame is not None:
+        last_sequence_numbers[camera_name] = frame.sequence_number
+    return frame
+
+
+def run_web_interface(
+    config: dict,
+    control_queue: multiprocessing.Queue,
+    inbound_queue: multiprocessing.Queue,
+    outbound_queue: multiprocessing.Queue,
+    frames_wanted,
+    stop_event: Event,
+) -> None:
+    """
+    Run the web server and feed it the frames and detections of the main process.
+
+    Frames are read from the frame buses the main process publishes to, so images
+    never pass through a queue. Whether a camera's next frame would be streamed is
+    written to `frames_wanted` after every poll.
+
+    Args:
+        config (dict): The configuration of the main process.
+        control_queue (multiprocessing.Queue): Commands from the main process.
+        inbound_queue (multiprocessing.Queue): Detections from the main process.
+        outbound_queue (multiprocessing.Queue): Logs and settings writes to the
+            main process.
+        frames_wanted: A shared byte array with one flag per camera index.
+        stop_event (Event): Set by the main process to stop the web server.
+    """
+    interface = _create_interface(
+        _ForwardedSettings(config, outbound_queue), _create_queue_log(outbound_queue)
+    )
+    camera_indices: dict[str, int] = {}
+    frame_bus_readers: dict[str, FrameBusReader] = {}
+    last_sequence_numbers: dict[str, int] = {}
+
+    while not stop_event.is_set():
+        while True:
+            try:
+                message = control_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "serve":
+                camera_indices[message[1]] = message[2]
+                interface.serve_camera_feed(message[1])
+            elif message[0] == "stream_fps":
+                interface.set_stream_fps(message[1])
+
+        try:
+            message = inbound_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            message = None
+        while message is not None:
+            if message[0] == "detections":
+                interface.update_detections(*message[1:])
+            elif message[0] == "aggregated_detections":
+                interface.publish_detections(message[1])
+            try:
+                message = inbound_queue.get_nowait()
+            except queue.Empty:
+                message = None
+
+        for camera_name in camera_indices:
+            frame = _read_frame_bus(
+                camera_name, frame_bus_readers, last_sequence_numbers
+            )
+            if frame is not None:
+                interface.update_camera_frame(camera_name, frame.image)
+
+        for camera_name, camera_index in camera_indices.items():
+            frames_wanted[camera_index] = interface.wants_frame(camera_name)
+
+    for frame_bus_reader in frame_bus_readers.values():
+        frame_bus_reader.close()
+
+
+class WebInterfaceProcess:
+    """Runs the web server in its own process, behind the EagleEyeInterface API.
+
+    Encoding, request handling and SocketIO keep-alives then use another GIL
+    than the detection threads. Frames are copied into a shared memory frame bus
+    per camera, commands go through an unbounded queue, detections through a
+    bounded one that drops them when the web process is behind, and settings the
+    dashboard writes are applied to and saved by the main process. No call ever
+    blocks the detection threads.
+    """
+
+    def __init__(self, settings_object: Constants, log: Callable) -> None:
+        """
+        Start the web server process.
+
+        Args:
+            settings_object (Constants): The settings of the main process, which
+                receive the writes of the dashboard.
+            log (Callable): A callable logger function.
+        """
+        self.settings_object = settings_object
+        self.log = log
+
+        self.context = multiprocessing.get_context("spawn")
+        self.process: multiprocessing.Process | None = None
+        self.control_queue: multiprocessing.Queue | None = None
+        self.inbound_queue: multiprocessing.Queue | None = None
+        self.outbound_queue: multiprocessing.Queue | None = None
+        self.queue_lock = Lock()
+        self.stop_event = self.context.Event()
+        self.frames_wanted = self.context.RawArray("b", MAX_CAMERAS)
+        self.camera_indices: dict[str, int] = {}
+        self.frame_bus_writers: dict[str, FrameBusWriter] = {}
+        self.sequence_numbers: dict[str, int] = {}
+        self.frame_bus_lock = Lock()
+        self.stream_fps = None
+        self.restart_count = 0
+        self.stopping = False
+
+        self.start()
+        Thread(target=self._receive_messages, daemon=True).start()
+
+    def start(self) -> None:
+        """
+        Start the web server process and replay the state it needs.
+
+        The new queues are swapped in while holding the queue lock, together with
+        the replayed state, so no command sent meanwhile is lost to the old queues.
+        """
+        self.stop_event.clear()
+        control_queue = self.context.Queue()
+        inbound_queue = self.context.Queue(MESSAGE_QUEUE_SIZE)
+        outbound_queue = self.context.Queue()
+        process = self.context.Process(
+            target=run_web_interface,
+            args=(
+                self.settings_object.get_config(),
+                control_queue,
+                inbound_queue,
+                outbound_queue,
+                self.frames_wanted,
+                self.stop_event,
+            ),
+            name="web_interface",
+            daemon=True,
+        )
+        process.start()
+
+        with self.queue_lock:
+            for camera_name, camera_index in self.camera_indices.items():
+                control_queue.put(("serve", camera_name, camera_index))
+            if self.stream_fps is not None:
+                control_queue.put(("stream_fps", self.stream_fps))
+            self.control_queue = control_queue
+            self.inbound_queue = inbound_queue
+            self.outbound_queue = outbound_queue
+            self.process = process
+        self.log("Started web interface process")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the web server process and remove the frame buses.
+
+        Args:
+            timeout (float): Seconds to wait for a clean exit.
+        """
+        self.stopping = True
+        self.stop_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.log("Web interface process did not stop, terminating")
+            self.process.terminate()
+            self.process.join()
+        with self.frame_bus_lock:
+            for frame_bus_writer in self.frame_bus_writers.values():
+                frame_bus_writer.close()
+            self.frame_bus_writers.clear()
+
+    def _receive_messages(self) -> None:
+        """
+        Apply the settings writes and logs of the web process, restarting it if it died.
+        """
+        while not self.stopping:
+            if not self.process.is_alive():
+                self.restart_count += 1
+                self.log(
+                    f"Web interface process exited with code {self.process.exitcode}, "
+                    f"restarting (restart {self.restart_count})"
+                )
+                sleep(RESTART_DELAY)
+                self.start()
+
+            try:
+                message = self.outbound_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if message[0] == "log":
+                self.log(message[1])
+            elif message[0] == "settings":
+                self.settings_object.load_config_from_json(message[1])
+
+    def _send(self, message: tuple) -> None:
+        """
+        Send detections to the web process, dropping them if it is behind.
+
+        Args:
+            message (tuple): The message to send.
+        """
+        with self.queue_lock:
+            try:
+                self.inbound_queue.put_nowait(message)
+            except queue.Full:
+                # Newer detections follow, and they are all the dashboard shows.
+                pass
+
+    def serve_camera_feed(self, camera_name: str) -> None:
+        """
+        Serve the camera feed.
+
+        Args:
+            camera_name (str): The ID of the camera.
+
+        Raises:
+            ValueError: If more than `MAX_CAMERAS` cameras are served.
+        """
+        with self.queue_lock:
+            if camera_name in self.camera_indices:
+                return
+            if len(self.camera_indices) >= MAX_CAMERAS:
+                raise ValueError(
+                    f"The web process serves at most {MAX_CAMERAS} cameras"
+                )
+            self.camera_indices[camera_name] = len(self.camera_indices)
+            # The control queue is unbounded, so this never blocks.
+            self.control_queue.put(
+                ("serve", camera_name, self.camera_indices[camera_name])
+            )
+
+    def update_camera_frame(self, camera_name: str, frame: np.ndarray) -> None:
+        """
+        Publish a camera frame to the web process through the camera's frame bus.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            frame (np.ndarray): The new BGR frame.
+        """
+        camera_index = self.camera_indices.get(camera_name)
+        if camera_index is not None:
+            self.frames_wanted[camera_index] = 0
+
+        with self.frame_bus_lock:
+            frame_bus_writer = self.frame_bus_writers.get(camera_name)
+            if frame_bus_writer is None:
+                # Larger frames later make the writer replace its bus itself.
+                frame_bus_writer = FrameBusWriter(
+                    _get_web_bus_name(camera_name), frame.nbytes
+                )
+                self.frame_bus_writers[camera_name] = frame_bus_writer
+                self.sequence_numbers[camera_name] = 0
+            self.sequence_numbers[camera_name] += 1
+            frame_bus_writer.publish(
+                Frame(
+                    image=frame,
+                    camera_name=camera_name,
+                    sequence_number=self.sequence_numbers[camera_name],
+                    source_resolution=(frame.shape[1], frame.shape[0]),
+                )
+            )
+
+    def wants_frame(self, camera_name: str) -> bool:
+        """
+        Check whether a new frame of a camera would be streamed to anyone.
+
+        Args:
+            camera_name (str): The ID of the camera.
+
+        Returns:
+            bool: True if the web process asked for the camera's next frame.
+        """
+        camera_index = self.camera_indices.get(camera_name)
+        return camera_index is not None and bool(self.frames_wanted[camera_index])
+
+    def uses_client_overlays(self) -> bool:
+        """
+        Check whether browsers draw detection overlays on raw feed frames.
+
+        Returns:
+            bool: True if producers should publish unannotated frames and send
+                detections through `update_detections` instead.
+        """
+        return bool(
+            self.settings_object.get_value("DisplayConstants.client_side_overlays")
+        )
+
+    def update_detections(
+        self,
+        camera_name: str,
+        sequence_number: int,
+        frame_size: tuple[int, int],
+        detections: list[dict],
+        fps: float,
+    ) -> None:
+        """
+        Send the detections of a frame to the clients overlaying a camera.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            sequence_number (int): The frame's sequence number.
+            frame_size (tuple[int, int]): The (width, height) of the upright frame.
+            detections (list[dict]): The positioned detections of the frame.
+            fps (float): The detection rate of the camera.
+        """
+        self._send(
+            (
+                "detections",
+                camera_name,
+                sequence_number,
+                frame_size,
+                detections,
+                fps,
+            )
+        )
+
+    def publish_detections(self, collected_detections: dict[str, list[dict]]) -> None:
+        """
+        Publish the aggregated detections of all cameras to the detection stream.
+
+        Args:
+            collected_detections (dict[str, list[dict]]): Detections by class name.
+        """
+        self._send(("aggregated_detections", collected_detections))
+
+    def set_stream_fps(self, stream_fps: float) -> None:
+        """
+        Set the rate at which camera feeds are streamed to clients.
+
+        Args:
+            stream_fps (float): Frames per second sent to each client.
+        """
+        with self.queue_lock:
+            self.stream_fps = stream_fps
+            self.control_queue.put(("stream_fps", stream_fps))
@@ -1,24 +1,44 @@
 import os
-import threading
 import time
-from threading import Thread
+from threading import Lock, Thread
 from typing import Any, Callable, Generator
 
 import cv2
 import numpy as np
 from flask import Flask, Response, request, send_from_directory
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room
 
 from src.object_detection.src.constants.constants import Constants
+from src.object_detection.src.devices.utils.frame_bus import FrameBusReader
 from src.object_detection.src.devices.utils.get_available_cameras import (
     detect_cameras_with_names,
 )
+from src.webui.web_server_utils.bandwidth_budgeter import BandwidthBudgeter
+from src.webui.web_server_utils.detection_metadata import (
+    pack_aggregated_detections,
+    pack_detections,
+)
+from src.webui.web_server_utils.detection_store import DetectionStore
+from src.webui.web_server_utils.frame_encoder import DEFAULT_QUALITY, FrameEncoder
+from src.webui.web_server_utils.frame_store import FrameStore
+from src.webui.web_server_utils.h264_stream import (
+    H264_MIME_TYPE,
+    H264Stream,
+    is_h264_available,
+)
 from src.webui.web_server_utils.serve_static_files import index, serve_js
 
 current_path = os.path.dirname(__file__)
 
 with open(os.path.join(current_path, "assets", "no_image.png"), "rb") as f:
-    no_image = f.read()
+    no_image = cv2.imdecode(np.frombuffer(f.read(), np.uint8), cv2.IMREAD_COLOR)
+
+MAX_STREAM_WIDTH = 3840
+DEFAULT_H264_WIDTH = 640
+MIN_H264_WIDTH = 64
+DETECTION_KEEPALIVE_INTERVAL = 15.0
+DEFAULT_LONG_POLL_TIMEOUT = 10.0
+MAX_LONG_POLL_TIMEOUT = 30.0
 
 
 class EagleEyeInterface:
@@ -31,7 +51,7 @@ class EagleEyeInterface:
         """
         Initialize the EagleEyeInterface.
 
-        Starts a Flask server in a separate thread.
+        Starts the web server in a separate thread.
 
         Args:
             settings_object (Constants | None): Optional settings object.
@@ -41,32 +61,54 @@ class EagleEyeInterface:
         else:
             self.log = log
 
-        self.app = Flask(__name__, static_folder=current_path, static_url_path="")
-        self.socketio = SocketIO(
-            self.app,
-            cors_allowed_origins="*",
-            async_mode="threading",
-            ping_timeout=60,
-            ping_interval=25,
-            engineio_logger=False,
-            socketio_logger=False,
-        )
-
         self.cameras = detect_cameras_with_names()
         self.log(f"Detected Cameras: {self.cameras}")
-        self.frame_list = {}
-        for camera in self.cameras:
-            self.frame_list[camera] = no_image
+        self.frame_store = FrameStore(no_image)
+        self.frame_encoder = FrameEncoder()
+        self.h264_streams: dict[tuple[str, int], H264Stream] = {}
+        self.h264_streams_lock = Lock()
+        self.detection_store = DetectionStore()
+        self.detection_subscribers: dict[str, set[str]] = {}
+        self.detection_subscribers_lock = Lock()
         self.available_cameras = {}
 
-        self.frame_list_lock = threading.Lock()
+        self.stream_fps = 120
 
         if settings_object is None:
             self.settings_object = Constants()
         else:
             self.settings_object = settings_object
 
+        self.bandwidth_budgeter = BandwidthBudgeter(
+            self.settings_object.get_value("DisplayConstants.stream_bandwidth_mbps", 0)
+        )
+
+        self._start_server(dev_mode)
+
+    def _start_server(self, dev_mode: bool) -> None:
+        """
+        Create the Flask application and serve it in a separate thread.
+
+        Args:
+            dev_mode (bool): Whether to serve in the calling thread instead.
+        """
+        self.app = Flask(__name__, static_folder=current_path, static_url_path="")
+        self.socketio = SocketIO(
+            self.app,
+            cors_allowed_origins="*",
+            async_mode="threading",
+            ping_timeout=60,
+            ping_interval=25,
+            engineio_logger=False,
+            socketio_logger=False,
+        )
         self._register_routes()
+        self._register_socket_handlers()
+
+        @self.app.errorhandler(Exception)
+        def _log_and_raise(e):
+            self.log("Error:", e)
+            return {"message": "Internal server error"}, 500
 
         if dev_mode:
             self.run()
@@ -79,11 +121,6 @@ class EagleEyeInterface:
             )
             self.app_thread.start()
 
-        @self.app.errorhandler(Exception)
-        def _log_and_raise(e):
-            self.log("Error:", e)
-            return {"message": "Internal server error"}, 500
-
     def _register_routes(self) -> None:
         """
         Register all Flask endpoints.
@@ -107,6 +144,30 @@ class EagleEyeInterface:
             self.get_available_cameras,
             methods=["GET"],
         )
+        self.app.add_url_rule(
+            "/stream-stats", "stream_stats", self.get_stream_stats, methods=["GET"]
+        )
+        self.app.add_url_rule(
+            "/stream-capabilities",
+            "stream_capabilities",
+            self.get_stream_capabilities,
+            methods=["GET"],
+        )
+        self.app.add_url_rule(
+            "/select-feed", "select_feed", self.select_feed, methods=["POST"]
+        )
+        self.app.add_url_rule(
+            "/detections/stream",
+            "detections_stream",
+            self.stream_detections,
+            methods=["GET"],
+        )
+        self.app.add_url_rule(
+            "/detections/latest",
+            "detections_latest",
+            self.get_latest_detections,
+            methods=["GET"],
+        )
         self.app.add_url_rule(
             "/background.png",
             "background",
@@ -133,6 +194,64 @@ class EagleEyeInterface:
             ),
         )
 
+    def _register_socket_handlers(self) -> None:
+        """
+        Register all SocketIO events.
+        """
+        self.socketio.on_event("subscribe_detections", self._subscribe_detections)
+        self.socketio.on_event("unsubscribe_detections", self._unsubscribe_detections)
+        self.socketio.on_event("disconnect", self._on_disconnect)
+
+    def _subscribe_detections(self, data: dict) -> None:
+        """
+        Start sending a client the detection metadata of a camera.
+
+        Args:
+            data (dict): The message, holding the camera name under "camera".
+        """
+        camera_name = data.get("camera")
+        if camera_name is None:
+            return
+        join_room(camera_name)
+        self._add_detection_subscriber(camera_name, request.sid)
+
+    def _unsubscribe_detections(self, data: dict) -> None:
+        """
+        Stop sending a client the detection metadata of a camera.
+
+        Args:
+            data (dict): The message, holding the camera name under "camera".
+        """
+        camera_name = data.get("camera")
+        if camera_name is None:
+            return
+        leave_room(camera_name)
+        self._remove_detection_subscriber(request.sid, camera_name)
+
+    def _on_disconnect(self, *args) -> None:
+        """
+        Forget the subscriptions of a disconnected client.
+        """
+        self._remove_detection_subscriber(request.sid)
+
+    def _add_detection_subscriber(self, camera_name: str, client_id: str) -> None:
+        """
+        Record that a client receives the detection metadata of a camera.
+        """
+        with self.detection_subscribers_lock:
+            self.detection_subscribers.setdefault(camera_name, set()).add(client_id)
+
+    def _remove_detection_subscriber(
+        self, client_id: str, camera_name: str | None = None
+    ) -> None:
+        """
+        Forget a client's subscription to a camera, or to every camera if None.
+        """
+        with self.detection_subscribers_lock:
+            for subscribed_camera, subscribers in self.detection_subscribers.items():
+                if camera_name is None or subscribed_camera == camera_name:
+                    subscribers.discard(client_id)
+
     def get_available_cameras(self) -> dict:
         """
         Get a dict of available cameras.
@@ -171,44 +290,300 @@ class EagleEyeInterface:
         Returns:
             Response: A success or failure message.
         """
+        return self._apply_settings(request.get_json(silent=True))
+
+    def _apply_settings(self, settings: dict | None) -> tuple[dict, int]:
+        """
+        Load new settings and apply the ones the web server uses itself.
+
+        Args:
+            settings (dict | None): The settings sent by the client.
+
+        Returns:
+            tuple[dict, int]: A success or failure message and its status code.
+        """
         try:
-            settings = request.get_json()
             self.settings_object.load_config_from_json(settings)
+            self.bandwidth_budgeter.set_max_mbps(
+                self.settings_object.get_value(
+                    "DisplayConstants.stream_bandwidth_mbps", 0
+                )
+            )
             self.log("Settings updated successfully")
             return {"message": "Settings updated successfully"}, 200
         except Exception as e:
             self.log("Error updating settings:", e)
             return {"message": "Failed to update settings"}, 500
 
-    def update_camera_frame(self, camera_name: str, frame: bytes) -> None:
+    def get_stream_stats(self) -> dict:
+        """
+        Get the achieved bitrate of every camera feed.
+
+        Returns:
+            dict: The bandwidth ceiling, the total bitrate and per feed statistics.
+        """
+        return self.bandwidth_budgeter.get_stats()
+
+    def get_stream_capabilities(self) -> dict:
+        """
+        Get the feed formats the server can stream.
+
+        Returns:
+            dict: Whether H.264 feeds are available and their MIME type.
+        """
+        return {"h264": is_h264_available(), "h264_mime_type": H264_MIME_TYPE}
+
+    def select_feed(self) -> tuple[dict, int]:
+        """
+        Give the camera the driver selected priority in the bandwidth budget.
+
+        Returns:
+            Response: A success or failure message.
+        """
+        return self._select_camera((request.get_json(silent=True) or {}).get("camera"))
+
+    def _select_camera(self, camera_name: str | None) -> tuple[dict, int]:
+        """
+        Give a camera priority in the bandwidth budget, None for no priority.
+
+        Returns:
+            tuple[dict, int]: A success or failure message and its status code.
+        """
+        if camera_name is not None and camera_name not in self.available_cameras:
+            return {"message": f"Unknown camera {camera_name}"}, 400
+        self.bandwidth_budgeter.set_selected_camera(camera_name)
+        return {"message": "Selected feed updated"}, 200
+
+    def update_camera_frame(self, camera_name: str, frame: np.ndarray) -> None:
         """
         Update the camera frame.
 
+        Frames are published unencoded, and each client's feed encodes them at
+        its own size and quality.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            frame (np.ndarray): The new BGR frame.
+        """
+        self.frame_store.publish(camera_name, frame)
+
+    def wants_frame(self, camera_name: str) -> bool:
+        """
+        Check whether a new frame of a camera would be streamed to anyone.
+
+        Producers call this before annotating and encoding a frame, so no work is
+        done for feeds without viewers or faster than the stream rate.
+
         Args:
             camera_name (str): The ID of the camera.
-            frame: The frame to update.
+
+        Returns:
+            bool: True if a client watches the feed and its frame interval passed.
         """
-        with self.frame_list_lock:
-            self.frame_list[camera_name] = frame
+        return self.frame_store.wants_frame(camera_name, self.stream_fps)
 
-    def _frame_generator(self, camera_name: str) -> Generator[bytes, Any, Any]:
+    def uses_client_overlays(self) -> bool:
+        """
+        Check whether browsers draw detection overlays on raw feed frames.
+
+        Returns:
+            bool: True if producers should publish unannotated frames and send
+                detections through `update_detections` instead.
+        """
+        return bool(
+            self.settings_object.get_value("DisplayConstants.client_side_overlays")
+        )
+
+    def update_detections(
+        self,
+        camera_name: str,
+        sequence_number: int,
+        frame_size: tuple[int, int],
+        detections: list[dict],
+        fps: float,
+    ) -> None:
+        """
+        Send the detections of a frame to the clients overlaying a camera.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            sequence_number (int): The frame's sequence number.
+            frame_size (tuple[int, int]): The (width, height) of the upright frame.
+            detections (list[dict]): The positioned detections of the frame.
+            fps (float): The detection rate of the camera.
+        """
+        with self.detection_subscribers_lock:
+            if not self.detection_subscribers.get(camera_name):
+                return
+        self._emit(
+            "detections",
+            pack_detections(camera_name, sequence_number, frame_size, detections, fps),
+            camera_name,
+        )
+
+    def publish_detections(self, collected_detections: dict[str, list[dict]]) -> None:
+        """
+        Publish the aggregated detections of all cameras to the detection stream.
+
+        Args:
+            collected_detections (dict[str, list[dict]]): Detections by class name.
+        """
+        self.detection_store.publish(pack_aggregated_detections(collected_detections))
+
+    def stream_detections(self) -> Response:
+        """
+        Stream the aggregated detections as Server-Sent Events.
+
+        Each client waits on the detection store in its own request, and a client
+        that cannot keep up skips to the latest detections instead of queueing.
+        A comment is sent when nothing changed for a while, so proxies keep the
+        connection open.
+
+        Returns:
+            Response: The event stream, one event per change with the sequence
+                number as its ID.
+        """
+
+        def _generate_events() -> Generator[str, Any, Any]:
+            last_sequence_number = -1
+            while True:
+                update = self.detection_store.wait_for_update(
+                    last_sequence_number, DETECTION_KEEPALIVE_INTERVAL
+                )
+                if update is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                last_sequence_number, message = update
+                yield f"id: {last_sequence_number}\ndata: {message}\n\n"
+
+        return Response(
+            _generate_events(),
+            mimetype="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+                "Access-Control-Allow-Origin": "*",
+            },
+        )
+
+    def get_latest_detections(self) -> Response:
+        """
+        Get the aggregated detections, long-polling for newer ones.
+
+        Without `since` the latest detections are returned right away. With
+        `since`, the request waits up to `timeout` seconds for detections with a
+        higher sequence number and returns 204 if none arrived.
+
+        Returns:
+            Response: The detections as JSON, or an empty 204 response.
+        """
+        since = request.args.get("since", type=int)
+        timeout = request.args.get("timeout", DEFAULT_LONG_POLL_TIMEOUT, type=float)
+        if since is None:
+            _, message = self.detection_store.get_latest()
+        else:
+            update = self.detection_store.wait_for_update(
+                since, min(max(timeout, 0.0), MAX_LONG_POLL_TIMEOUT)
+            )
+            if update is None:
+                return Response(
+                    status=204, headers={"Access-Control-Allow-Origin": "*"}
+                )
+            _, message = update
+        return Response(
+            message,
+            mimetype="application/json",
+            headers={"Cache-Control": "no-cache", "Access-Control-Allow-Origin": "*"},
+        )
+
+    def set_stream_fps(self, stream_fps: float) -> None:
+        """
+        Set the rate at which camera feeds are streamed to clients.
+
+        Args:
+            stream_fps (float): Frames per second sent to each client.
+        """
+        self.stream_fps = max(float(stream_fps), 1.0)
+
+    def _frame_generator(
+        self,
+        camera_name: str,
+        width: int | None = None,
+        quality: int = DEFAULT_QUALITY,
+        max_fps: float | None = None,
+    ) -> Generator[bytes, Any, Any]:
         """
         Generate frames for the camera feed.
 
+        Every frame version is sent at most once. The generator blocks until a
+        newer frame is published and then jumps to the latest one, so slow clients
+        skip frames instead of queueing them. The bandwidth budgeter may lower the
+        requested width, quality and frame rate to keep all feeds under the ceiling.
+
         Args:
             camera_name (str): The ID of the camera.
+            width (int | None): The width frames are sent at, None for the
+                published width.
+            quality (int): The JPEG quality from 1 to 100.
+            max_fps (float | None): The client's frame rate limit, None for the
+                stream rate.
 
         Yields:
             Generator: The camera feed.
         """
-        while True:
-            time_start = time.time()
-            with self.frame_list_lock:
-                frame = self.frame_list[camera_name]
+        self.frame_store.subscribe(camera_name, max_fps)
+        feed_id = self.bandwidth_budgeter.register(camera_name, width, quality, max_fps)
+        try:
+            version, frame = self.frame_store.get_frame(camera_name)
+            while True:
+                time_start = time.time()
+                feed_width, feed_quality, feed_fps = (
+                    self.bandwidth_budgeter.get_settings(
+                        feed_id,
+                        frame.shape[1],
+                        self.stream_fps,
+                    )
+                )
+                frame_bytes = self.frame_encoder.encode(
+                    camera_name, version, frame, feed_width, feed_quality
+                )
+                yield (
+                    b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+                    + frame_bytes
+                    + b"\r\n"
+                )
+                self.bandwidth_budgeter.record(feed_id, len(frame_bytes))
+
+                time.sleep(max((1 / feed_fps) - (time.time() - time_start), 0))
+                version, frame = self.frame_store.wait_for_frame(camera_name, version)
+        finally:
+            self.bandwidth_budgeter.unregister(feed_id)
+            self.frame_store.unsubscribe(camera_name, max_fps)
 
-            yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
+    def _get_h264_stream(self, camera_name: str, width: int) -> H264Stream:
+        """
+        Get the shared H.264 encoder of a camera at a width, creating it if needed.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            width (int): The encoded width.
 
-            time.sleep(max((1 / 120) - (time.time() - time_start), 0))
+        Returns:
+            H264Stream: The encoder all clients with these settings share.
+        """
+        with self.h264_streams_lock:
+            key = (camera_name, width)
+            if key not in self.h264_streams:
+                self.h264_streams[key] = H264Stream(
+                    self.frame_store,
+                    camera_name,
+                    width,
+                    self.log,
+                    self.settings_object.get_value(
+                        "DisplayConstants.h264_bitrate_kbps", 1000
+                    ),
+                )
+            return self.h264_streams[key]
 
     def serve_camera_feed(self, camera_name: str, direct_serve: bool = False) -> None:
         """
@@ -221,40 +596,96 @@ class EagleEyeInterface:
         Returns:
             Response: The camera feed.
         """
+        self._register_feed_routes(camera_name)
+
+        if direct_serve:
+            camera_thread = Thread(
+                target=self._update_camera_feed, args=(camera_name,), daemon=True
+            )
+            camera_thread.start()
+
+        self.available_cameras[camera_name] = self.cameras[camera_name]
+
+        self.log(
+            f"Serving camera feed for {camera_name} at /feed/{camera_name.replace(' ', '_')}"
+        )
+
+    @staticmethod
+    def _clamp_feed_settings(
+        width: int | None, quality: int, max_fps: float | None
+    ) -> tuple[int | None, int, float | None]:
+        """
+        Limit the feed settings a client asked for to what can be streamed.
+
+        Returns:
+            tuple[int | None, int, float | None]: The width, JPEG quality and frame
+                rate, None meaning the default width and the stream rate.
+        """
+        return (
+            None if width is None else min(max(width, 1), MAX_STREAM_WIDTH),
+            min(max(quality, 1), 100),
+            None if not max_fps or max_fps <= 0 else max_fps,
+        )
+
+    def _register_feed_routes(self, camera_name: str) -> None:
+        """
+        Register the MJPEG and H.264 feed endpoints of a camera.
+
+        Args:
+            camera_name (str): The ID of the camera.
+        """
         # Create URL path and unique endpoint
         url_name = camera_name.replace(" ", "_")
         route = f"/feed/{url_name}"
         endpoint = f"feed_{url_name}"
 
-        # Define view function for this camera
+        # Define view function for this camera, e.g. /feed/cam?width=320&quality=60&fps=15
         def _make_feed(name: str = camera_name) -> Response:
+            width, quality, max_fps = self._clamp_feed_settings(
+                request.args.get("width", type=int),
+                request.args.get("quality", DEFAULT_QUALITY, type=int),
+                request.args.get("fps", type=float),
+            )
             return Response(
-                self._frame_generator(name),
+                self._frame_generator(name, width, quality, max_fps),
                 mimetype="multipart/x-mixed-replace; boundary=frame",
             )
 
         # Register the route with a unique endpoint
         self.app.add_url_rule(route, endpoint, _make_feed, methods=["GET"])
 
-        if direct_serve:
-            camera_thread = Thread(
-                target=self._update_camera_feed, args=(camera_name,), daemon=True
+        # H.264 fragmented MP4 alternative, e.g. /feed-h264/cam?width=640
+        def _make_h264_feed(name: str = camera_name) -> Response | tuple[dict, int]:
+            if not is_h264_available():
+                return {"message": "H.264 streaming needs PyAV installed"}, 404
+            width = request.args.get("width", DEFAULT_H264_WIDTH, type=int)
+            h264_stream = self._get_h264_stream(
+                name, min(max(width, MIN_H264_WIDTH), MAX_STREAM_WIDTH)
             )
-            camera_thread.start()
-
-        self.available_cameras[camera_name] = self.cameras[camera_name]
+            return Response(h264_stream.stream(), mimetype="video/mp4")
 
-        self.log(
-            f"Serving camera feed for {camera_name} at /feed/{camera_name.replace(' ', '_')}"
+        self.app.add_url_rule(
+            f"/feed-h264/{url_name}",
+            f"feed_h264_{url_name}",
+            _make_h264_feed,
+            methods=["GET"],
         )
 
     def _update_camera_feed(self, camera_name: str) -> None:
         """
         Update the camera feed.
 
+        Reads from the camera's frame bus when a capture process publishes one,
+        otherwise opens the camera directly.
+
         Args:
             camera_name (str): The ID of the camera.
         """
+        frame_bus_reader = FrameBusReader.connect(camera_name, timeout=0)
+        if frame_bus_reader is not None:
+            self._update_camera_feed_from_bus(camera_name, frame_bus_reader)
+            return
+
         camera = cv2.VideoCapture(0)
         camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
@@ -275,17 +706,49 @@ class EagleEyeInterface:
                     time.sleep(1)
                     continue
 
-                ret, buffer = cv2.imencode(".jpg", frame)
-                frame_bytes = buffer.tobytes()
-
                 # Check if processing time exceeds target frame time
                 processing_time = time.time() - time_start
                 if processing_time > (1 / 30):
-                    self.update_camera_frame(camera_name, frame_bytes)
+                    self.update_camera_frame(camera_name, frame)
                     time_start = time.time()
         finally:
             camera.release()
 
+    def _update_camera_feed_from_bus(
+        self, camera_name: str, frame_bus_reader: FrameBusReader
+    ) -> None:
+        """
+        Serve a camera feed from frames shared by its capture process.
+
+        Reconnects when the capture process replaces the bus, e.g. after it
+        restarted or the resolution changed.
+
+        Args:
+            camera_name (str): The ID of the camera.
+            frame_bus_reader (FrameBusReader): A reader attached to the camera's bus.
+        """
+        last_sequence_number = 0
+        try:
+            while True:
+                if frame_bus_reader.is_closed():
+                    reconnected_reader = FrameBusReader.connect(camera_name)
+                    if reconnected_reader is None:
+                        continue
+                    frame_bus_reader.close()
+                    frame_bus_reader = reconnected_reader
+                    last_sequence_number = 0
+                frame = frame_bus_reader.wait_for_frame(last_sequence_number)
+                if frame is None:
+                    continue
+                last_sequence_number = frame.sequence_number
+
+                image = frame.image.copy()
+                if frame_bus_reader.is_valid(frame):
+                    self.update_camera_frame(camera_name, image)
+                time.sleep(1 / 30)
+        finally:
+            frame_bus_reader.close()
+
     def handle_sphere_position_request(self) -> tuple[dict, int]:
         """
         Handle HTTP POST request to update sphere position.
@@ -293,8 +756,19 @@ class EagleEyeInterface:
         Returns:
             Response: A success or failure message.
         """
+        return self._handle_sphere_position(request.get_json(silent=True))
+
+    def _handle_sphere_position(self, data: dict | None) -> tuple[dict, int]:
+        """
+        Update the sphere position from a request body.
+
+        Args:
+            data (dict | None): The request body, holding "transform_matrix".
+
+        Returns:
+            tuple[dict, int]: A success or failure message and its status code.
+        """
         try:
-            data = request.get_json()
             if "transform_matrix" in data:
                 transform_matrix = np.array(data["transform_matrix"])
                 self.update_sphere_position(transform_matrix)
@@ -317,7 +791,18 @@ class EagleEyeInterface:
 
         # Convert matrix to list for JSON serialization
         matrix_list = transformation_matrix.tolist()
-        self.socketio.emit("update_sphere_position", {"transform_matrix": matrix_list})
+        self._emit("update_sphere_position", {"transform_matrix": matrix_list})
+
+    def _emit(self, event: str, data: dict, room: str | None = None) -> None:
+        """
+        Send a SocketIO event from any thread.
+
+        Args:
+            event (str): The event name.
+            data (dict): The JSON serializable payload.
+            room (str | None): The room to send to, None for every client.
+        """
+        self.socketio.emit(event, data, to=room)
         self.socketio.sleep(0)
 
 
@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+WAIT_TIMEOUT = 1.0
+
+
+class AsyncBroadcaster:
+    """Hands the updates of a thread-safe store to any number of asyncio clients.
+
+    A single executor thread blocks on the store while clients are connected
+    and resolves one shared future when a newer version arrives, so neither
+    threads nor timers grow with the number of clients. The future is also
+    resolved every `WAIT_TIMEOUT` seconds without an update, which lets
+    clients notice disconnects and time out. Like the stores, only the latest
+    version is kept and slow clients skip to it.
+    """
+
+    def __init__(
+        self,
+        get_latest: Callable[[], tuple[int, Any]],
+        wait_for_update: Callable[[int, float], tuple[int, Any] | None],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """
+        Args:
+            get_latest (Callable[[], tuple[int, Any]]): Returns the store's latest
+                (version, value).
+            wait_for_update (Callable[[int, float], tuple[int, Any] | None]): Blocks
+                until a version newer than the first argument exists, for at most
+                the second argument in seconds, and returns it or None.
+            executor (ThreadPoolExecutor): Runs the blocking wait.
+        """
+        self.get_latest = get_latest
+        self.wait_for_update = wait_for_update
+        self.executor = executor
+        self.version, self.value = get_latest()
+        self.update_future: asyncio.Future | None = None
+        self.client_count = 0
+        self.watch_task: asyncio.Task | None = None
+
+    def add_client(self) -> tuple[int, Any]:
+        """
+        Registers a client, starting the watcher if it is the first one.
+
+        Returns:
+            tuple[int, Any]: The latest (version, value).
+        """
+        self.client_count += 1
+        if self.watch_task is None:
+            self.version, self.value = self.get_latest()
+            self.watch_task = asyncio.get_running_loop().create_task(self._watch())
+        return self.version, self.value
+
+    def remove_client(self) -> None:
+        """
+        Removes a client registered with `add_client`.
+        """
+        self.client_count -= 1
+
+    async def wait(self, last_version: int) -> tuple[int, Any] | None:
+        """
+        Wait for a version newer than `last_version`, at most `WAIT_TIMEOUT` seconds.
+
+        Only registered clients may wait, as the watcher stops without them.
+
+        Args:
+            last_version (int): The version the client already has.
+
+        Returns:
+            tuple[int, Any] | None: The latest (version, value), or None if no
+                newer version arrived in time.
+        """
+        if self.version <= last_version:
+            if self.update_future is None:
+                self.update_future = asyncio.get_running_loop().create_future()
+            # Shielded, so a cancelled client does not cancel the shared future.
+            await asyncio.shield(self.update_future)
+        if self.version <= last_version:
+            return None
+        return self.version, self.value
+
+    def _wake_clients(self) -> None:
+        """
+        Resolve the shared future every waiting client awaits.
+        """
+        if self.update_future is not None:
+            self.update_future.set_result(None)
+            self.update_future = None
+
+    async def _watch(self) -> None:
+        """
+        Wait for updates in the executor until the last client left.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while self.client_count > 0:
+                update = await loop.run_in_executor(
+                    self.executor, self.wait_for_update, self.version, WAIT_TIMEOUT
+                )
+                if update is not None:
+                    self.version, self.value = update
+                self._wake_clients()
+        finally:
+            self.watch_task = None
+            self._wake_clients()
@@ -0,0 +1,213 @@
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import time
+
+# Steps from the client's own settings to the cheapest stream, applied in order.
+DEGRADATION_LEVELS = [
+    {"scale": 1.0, "quality": 100, "fps_scale": 1.0},
+    {"scale": 1.0, "quality": 60, "fps_scale": 1.0},
+    {"scale": 0.75, "quality": 50, "fps_scale": 1.0},
+    {"scale": 0.75, "quality": 40, "fps_scale": 0.5},
+    {"scale": 0.5, "quality": 35, "fps_scale": 0.5},
+    {"scale": 0.5, "quality": 30, "fps_scale": 0.25},
+]
+
+
+@dataclass
+class _Feed:
+    """A connected client stream and its recent traffic."""
+
+    camera_name: str
+    width: int | None
+    quality: int
+    max_fps: float | None
+    level: int = 0
+    last_step_time: float = field(default_factory=time)
+    sent_width: int = 0
+    sent_quality: int = 0
+    sent: deque = field(default_factory=deque)
+
+
+class BandwidthBudgeter:
+    """Keeps the combined bitrate of all camera feeds under a ceiling.
+
+    Every feed reports the bytes it sends. Each feed gets a share of the
+    ceiling, weighted towards the camera the driver selected. Feeds above
+    their share step down a ladder of lower quality, size and frame rate, and
+    step back up once they fall well below it.
+    """
+
+    def __init__(
+        self,
+        max_mbps: float = 0,
+        selected_weight: float = 3.0,
+        window: float = 2.0,
+        hold_time: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            max_mbps (float): The ceiling in megabits per second, 0 for no limit.
+            selected_weight (float): How many shares the selected camera's feeds get
+                relative to other feeds.
+            window (float): Seconds of traffic the bitrate is averaged over.
+            hold_time (float): Seconds a feed stays on a level before stepping again.
+        """
+        self.max_mbps = max_mbps
+        self.selected_weight = selected_weight
+        self.window = window
+        self.hold_time = hold_time
+        self.selected_camera: str | None = None
+        self.feeds: dict[int, _Feed] = {}
+        self.feed_ids = itertools.count()
+        self.lock = threading.Lock()
+
+    def set_max_mbps(self, max_mbps: float) -> None:
+        """
+        Changes the ceiling, 0 for no limit.
+        """
+        with self.lock:
+            self.max_mbps = max(float(max_mbps), 0.0)
+
+    def set_selected_camera(self, camera_name: str | None) -> None:
+        """
+        Gives the feeds of a camera priority, None to treat all feeds equally.
+        """
+        with self.lock:
+            self.selected_camera = camera_name
+
+    def register(
+        self,
+        camera_name: str,
+        width: int | None,
+        quality: int,
+        max_fps: float | None,
+    ) -> int:
+        """
+        Adds a client stream with the settings it asked for.
+
+        Args:
+            camera_name (str): The camera the stream shows.
+            width (int | None): The requested width, None for the default.
+            quality (int): The requested JPEG quality.
+            max_fps (float | None): The requested frame rate, None for the stream rate.
+
+        Returns:
+            int: The feed's ID for `record`, `get_settings` and `unregister`.
+        """
+        with self.lock:
+            feed_id = next(self.feed_ids)
+            self.feeds[feed_id] = _Feed(camera_name, width, quality, max_fps)
+            return feed_id
+
+    def unregister(self, feed_id: int) -> None:
+        """
+        Removes a client stream.
+        """
+        with self.lock:
+            self.feeds.pop(feed_id, None)
+
+    def record(self, feed_id: int, byte_count: int) -> None:
+        """
+        Records bytes sent on a feed and adapts its level to its share.
+
+        Args:
+            feed_id (int): The feed from `register`.
+            byte_count (int): The bytes just sent.
+        """
+        now = time()
+        with self.lock:
+            feed = self.feeds.get(feed_id)
+            if feed is None:
+                return
+            feed.sent.append((now, byte_count))
+            while feed.sent and feed.sent[0][0] < now - self.window:
+                feed.sent.popleft()
+            if not self.max_mbps or now - feed.last_step_time < self.hold_time:
+                return
+
+            feed_mbps = self._get_mbps(feed, now)
+            budget_mbps = self._get_budget_mbps(feed)
+            if feed_mbps > budget_mbps and feed.level + 1 < len(DEGRADATION_LEVELS):
+                feed.level += 1
+                feed.last_step_time = now
+            elif feed_mbps < budget_mbps * 0.6 and feed.level > 0:
+                feed.level -= 1
+                feed.last_step_time = now
+
+    def get_settings(
+        self, feed_id: int, source_width: int, stream_fps: float
+    ) -> tuple[int, int, float]:
+        """
+        Returns the width, quality and frame rate a feed should send its next frame at.
+
+        Args:
+            feed_id (int): The feed from `register`.
+            source_width (int): The feed's default width.
+            stream_fps (float): The server's stream rate limit.
+
+        Returns:
+            tuple[int, int, float]: The width, JPEG quality and frame rate.
+        """
+        with self.lock:
+            feed = self.feeds[feed_id]
+            level = DEGRADATION_LEVELS[feed.level if self.max_mbps else 0]
+            width = feed.width or source_width
+            fps = min(feed.max_fps or stream_fps, stream_fps)
+            feed.sent_width = max(int(width * level["scale"]), 1)
+            feed.sent_quality = min(feed.quality, level["quality"])
+            return (
+                feed.sent_width,
+                feed.sent_quality,
+                max(fps * level["fps_scale"], 0.5),
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Returns the ceiling, the total bitrate and every feed's bitrate and level.
+        """
+        now = time()
+        with self.lock:
+            feeds = [
+                {
+                    "camera": feed.camera_name,
+                    "selected": feed.camera_name == self.selected_camera,
+                    "mbps": round(self._get_mbps(feed, now), 3),
+                    "fps": sum(1 for sent_time, _ in feed.sent if sent_time >= now - 1),
+                    "width": feed.sent_width,
+                    "quality": feed.sent_quality,
+                    "level": feed.level,
+                }
+                for feed in self.feeds.values()
+            ]
+            return {
+                "max_mbps": self.max_mbps,
+                "total_mbps": round(sum(feed["mbps"] for feed in feeds), 3),
+                "selected_camera": self.selected_camera,
+                "feeds": feeds,
+            }
+
+    def _get_mbps(self, feed: _Feed, now: float) -> float:
+        """
+        Returns a feed's bitrate over the averaging window.
+        """
+        if not feed.sent:
+            return 0.0
+        elapsed = max(now - feed.sent[0][0], self.window / 4)
+        return sum(byte_count for _, byte_count in feed.sent) * 8 / elapsed / 1e6
+
+    def _get_weight(self, feed: _Feed) -> float:
+        """
+        Returns how many shares of the ceiling a feed gets.
+        """
+        return self.selected_weight if feed.camera_name == self.selected_camera else 1.0
+
+    def _get_budget_mbps(self, feed: _Feed) -> float:
+        """
+        Returns a feed's share of the ceiling.
+        """
+        total_weight = sum(
+            self._get_weight(other_feed) for other_feed in self.feeds.values()
+        )
+        return self.max_mbps * self._get_weight(feed) / total_weight
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+def pack_detections(
+    camera_name: str,
+    sequence_number: int,
+    frame_size: tuple[int, int],
+    detections: list[dict],
+    fps: float,
+) -> dict:
+    """
+    Convert a frame's detections into the compact message browsers draw overlays from.
+
+    Boxes are normalized to the upright frame, so the overlay fits the feed at
+    any stream width, and numbers are rounded to keep the JSON small.
+
+    Args:
+        camera_name (str): The camera the frame came from.
+        sequence_number (int): The frame's sequence number, so clients can drop
+            messages older than the last one they drew.
+        frame_size (tuple[int, int]): The (width, height) of the upright frame.
+        detections (list[dict]): The positioned detections of the frame.
+        fps (float): The detection rate of the camera.
+
+    Returns:
+        dict: The JSON serializable message.
+    """
+    width, height = frame_size
+    scale = np.array([width, height, width, height], dtype=float)
+    return {
+        "camera": camera_name,
+        "seq": int(sequence_number),
+        "fps": round(float(fps), 1),
+        "detections": [
+            {
+                "class": detection["class"],
+                "box": np.round(np.asarray(detection["box"]) / scale, 4).tolist(),
+                "confidence": round(float(detection["confidence"]), 3),
+                "distance": round(float(detection["distance"]), 3),
+                "yaw": round(float(detection["yaw_angle"]), 2),
+                "global_position": np.round(
+                    np.asarray(detection["global_position"], dtype=float), 3
+                ).tolist(),
+            }
+            for detection in detections
+        ],
+    }
+
+
+def pack_aggregated_detections(collected_detections: dict[str, list[dict]]) -> dict:
+    """
+    Convert the detections of all cameras into the compact JSON of the detection stream.
+
+    Args:
+        collected_detections (dict[str, list[dict]]): Detections by class name,
+            as the main loop publishes them to NetworkTables.
+
+    Returns:
+        dict: Per class, one entry per detection with rounded numbers.
+    """
+    return {
+        class_name: [
+            {
+                "confidence": round(float(detection["confidence"]), 3),
+                "distance": round(float(detection["distance"]), 3),
+                "yaw": round(float(detection["yaw_angle"]), 2),
+                "ratio": round(float(detection["ratio"]), 3),
+                "local_position": np.round(
+                    np.asarray(detection["local_position"], dtype=float), 3
+                ).tolist(),
+                "global_position": np.round(
+                    np.asarray(detection["global_position"], dtype=float), 3
+                ).tolist(),
+            }
+            for detection in detections
+        ]
+        for class_name, detections in collected_detections.items()
+    }
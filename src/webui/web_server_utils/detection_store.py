@@ -0,0 +1,80 @@
+import json
+import threading
+from time import time
+
+
+class DetectionStore:
+    """Holds the latest aggregated detections as a ready to send JSON message.
+
+    Every change bumps a sequence number and wakes every waiting client.
+    Publishing the same detections again keeps the sequence number, so
+    clients are only woken when something changed. Only the latest message
+    is kept, so a slow client skips straight to it.
+    """
+
+    def __init__(self) -> None:
+        self.sequence_number = 0
+        self.detections_json = "{}"
+        self.message = self._create_message(time())
+        self.condition = threading.Condition()
+
+    def _create_message(self, timestamp: float) -> str:
+        """
+        Returns the message of the current detections.
+        """
+        return (
+            f'{{"seq":{self.sequence_number},"timestamp":{timestamp:.3f},'
+            f'"detections":{self.detections_json}}}'
+        )
+
+    def publish(self, detections: dict) -> int:
+        """
+        Store new detections and wake the waiting clients if they changed.
+
+        Args:
+            detections (dict): The JSON serializable detections.
+
+        Returns:
+            int: The sequence number of the latest message.
+        """
+        detections_json = json.dumps(detections, separators=(",", ":"))
+        with self.condition:
+            if detections_json != self.detections_json:
+                self.sequence_number += 1
+                self.detections_json = detections_json
+                self.message = self._create_message(time())
+                self.condition.notify_all()
+            return self.sequence_number
+
+    def get_latest(self) -> tuple[int, str]:
+        """
+        Returns the latest (sequence number, message).
+        """
+        with self.condition:
+            return self.sequence_number, self.message
+
+    def wait_for_update(
+        self, since: int, timeout: float | None = None
+    ) -> tuple[int, str] | None:
+        """
+        Block until detections newer than `since` exist.
+
+        A `since` ahead of the store, e.g. from before a server restart, counts
+        as outdated, so the client gets the latest message right away.
+
+        Args:
+            since (int): The sequence number the caller already has.
+            timeout (float | None): Seconds to wait at most, None to wait forever.
+
+        Returns:
+            tuple[int, str] | None: The latest (sequence number, message), or None
+                on timeout.
+        """
+        with self.condition:
+            if since > self.sequence_number:
+                return self.sequence_number, self.message
+            if not self.condition.wait_for(
+                lambda: self.sequence_number > since, timeout
+            ):
+                return None
+            return self.sequence_number, self.message
@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+DEFAULT_QUALITY = 80
+MIN_WIDTH = 32
+
+
+def _create_turbo_jpeg() -> "TurboJPEG | None":
+    """
+    Load libjpeg-turbo through PyTurboJPEG when both are installed.
+
+    Returns:
+        TurboJPEG | None: The encoder, or None to fall back to OpenCV.
+    """
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):
+        return None
+
+
+class FrameEncoder:
+    """Encodes feed frames to JPEG on a small thread pool and caches the results.
+
+    Encodes are keyed by (camera, frame version, width, quality), so every
+    client asking for the same settings shares a single encode, including
+    clients that ask while the encode is still running.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 64) -> None:
+        """
+        Args:
+            max_workers (int): The number of encoder threads.
+            cache_size (int): The number of encodes kept. Older frame versions
+                fall out first, as they are never requested again.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="frame_encoder"
+        )
+        self.cache_size = cache_size
+        self.cache: OrderedDict[tuple, Future] = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.turbo_jpeg = _create_turbo_jpeg()
+
+    def encode(
+        self,
+        camera_name: str,
+        version: int,
+        image: np.ndarray,
+        width: int | None = None,
+        quality: int = DEFAULT_QUALITY,
+    ) -> bytes:
+        """
+        Returns a frame encoded as JPEG, encoding it only if no client did yet.
+
+        Args:
+            camera_name (str): The camera the frame belongs to.
+            version (int): The frame's version in the frame store.
+            image (np.ndarray): The BGR frame.
+            width (int | None): The width to downscale to, keeping the aspect
+                ratio; None or anything wider than the frame keeps its size.
+            quality (int): The JPEG quality from 1 to 100.
+
+        Returns:
+            bytes: The JPEG data.
+        """
+        return self.submit(camera_name, version, image, width, quality).result()
+
+    def submit(
+        self,
+        camera_name: str,
+        version: int,
+        image: np.ndarray,
+        width: int | None = None,
+        quality: int = DEFAULT_QUALITY,
+    ) -> Future:
+        """
+        Like `encode`, but returns the future of the JPEG data instead of waiting.
+
+        Returns:
+            Future: Resolves to the JPEG data as bytes.
+        """
+        if width is not None and width >= image.shape[1]:
+            width = None
+        key = (camera_name, version, width, quality)
+        with self.cache_lock:
+            future = self.cache.get(key)
+            if future is None:
+                future = self.executor.submit(self._encode, image, width, quality)
+                self.cache[key] = future
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return future
+
+    def _encode(self, image: np.ndarray, width: int | None, quality: int) -> bytes:
+        """
+        Downscale and encode a frame.
+
+        Args:
+            image (np.ndarray): The BGR frame.
+            width (int | None): The target width, None to keep the size.
+            quality (int): The JPEG quality from 1 to 100.
+
+        Returns:
+            bytes: The JPEG data.
+        """
+        if width is not None:
+            width = max(width, MIN_WIDTH)
+            height = max(round(image.shape[0] * width / image.shape[1]), 1)
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        if self.turbo_jpeg is not None:
+            return self.turbo_jpeg.encode(image, quality=quality)
+        _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes()
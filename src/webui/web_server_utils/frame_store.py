@@ -0,0 +1,132 @@
+import threading
+from time import time
+from typing import Any
+
+
+class FrameStore:
+    """Holds the latest frame of every camera feed with a version per camera.
+
+    Publishing a frame bumps its camera's version and wakes every waiting
+    client, so clients block until a newer frame exists instead of polling.
+    Only the latest frame is kept, so a slow client skips straight to it.
+
+    Clients register as subscribers of a camera, so producers can skip
+    annotating and encoding frames nobody is watching.
+    """
+
+    def __init__(self, default_frame: Any = None) -> None:
+        """
+        Args:
+            default_frame (Any): The frame of a camera nothing was published for yet.
+        """
+        self.default_frame = default_frame
+        self.frames: dict[str, Any] = {}
+        self.versions: dict[str, int] = {}
+        self.publish_times: dict[str, float] = {}
+        self.subscribers: dict[str, list[float | None]] = {}
+        self.condition = threading.Condition()
+
+    def publish(self, camera_name: str, frame: Any) -> int:
+        """
+        Store a new frame and wake the clients of its camera.
+
+        Args:
+            camera_name (str): The name of the camera.
+            frame (Any): The new frame.
+
+        Returns:
+            int: The new version of the camera's frame.
+        """
+        with self.condition:
+            self.frames[camera_name] = frame
+            self.versions[camera_name] = self.versions.get(camera_name, 0) + 1
+            self.publish_times[camera_name] = time()
+            self.condition.notify_all()
+            return self.versions[camera_name]
+
+    def get_frame(self, camera_name: str) -> tuple[int, Any]:
+        """
+        Returns the latest (version, frame) of a camera, version 0 being the default frame.
+        """
+        with self.condition:
+            return self.versions.get(camera_name, 0), self.frames.get(
+                camera_name, self.default_frame
+            )
+
+    def get_version(self, camera_name: str) -> int:
+        """
+        Returns the latest version of a camera's frame.
+        """
+        with self.condition:
+            return self.versions.get(camera_name, 0)
+
+    def wait_for_frame(
+        self, camera_name: str, last_version: int, timeout: float | None = None
+    ) -> tuple[int, Any] | None:
+        """
+        Block until a camera has a frame newer than `last_version`.
+
+        Args:
+            camera_name (str): The name of the camera.
+            last_version (int): The version the caller already has.
+            timeout (float | None): Seconds to wait at most, None to wait forever.
+
+        Returns:
+            tuple[int, Any] | None: The latest (version, frame), or None on timeout.
+        """
+        deadline = None if timeout is None else time() + timeout
+        with self.condition:
+            while self.versions.get(camera_name, 0) <= last_version:
+                remaining_time = None if deadline is None else deadline - time()
+                if remaining_time is not None and remaining_time <= 0:
+                    return None
+                self.condition.wait(remaining_time)
+            return self.versions[camera_name], self.frames[camera_name]
+
+    def subscribe(self, camera_name: str, max_fps: float | None = None) -> None:
+        """
+        Registers a client watching a camera.
+
+        Args:
+            camera_name (str): The name of the camera.
+            max_fps (float | None): The rate the client wants frames at, None for
+                as fast as the stream allows.
+        """
+        with self.condition:
+            self.subscribers.setdefault(camera_name, []).append(max_fps)
+
+    def unsubscribe(self, camera_name: str, max_fps: float | None = None) -> None:
+        """
+        Removes a client registered with `subscribe`, passing the same rate.
+        """
+        with self.condition:
+            subscribers = self.subscribers.get(camera_name, [])
+            if max_fps in subscribers:
+                subscribers.remove(max_fps)
+
+    def get_subscriber_count(self, camera_name: str) -> int:
+        """
+        Returns the number of clients watching a camera.
+        """
+        with self.condition:
+            return len(self.subscribers.get(camera_name, []))
+
+    def wants_frame(self, camera_name: str, max_fps: float) -> bool:
+        """
+        Check whether a new frame of a camera would be sent to anyone.
+
+        Args:
+            camera_name (str): The name of the camera.
+            max_fps (float): The highest rate frames are sent at.
+
+        Returns:
+            bool: True if a client is watching and the last frame is at least one
+                frame interval of the fastest client old.
+        """
+        with self.condition:
+            subscribers = self.subscribers.get(camera_name)
+            if not subscribers:
+                return False
+            if None not in subscribers:
+                max_fps = min(max(subscribers), max_fps)
+            return time() - self.publish_times.get(camera_name, 0.0) >= 1 / max_fps
@@ -0,0 +1,338 @@
+import threading
+from collections import deque
+from fractions import Fraction
+from time import sleep, time
+from typing import Callable, Generator
+
+import cv2
+import numpy as np
+
+from src.webui.web_server_utils.frame_store import FrameStore
+
+try:
+    import av
+except ImportError:
+    av = None
+
+# Constrained baseline, level 3.1: what `H264_MIME_TYPE` announces to the browser.
+H264_MIME_TYPE = 'video/mp4; codecs="avc1.42E01F"'
+FRAGMENT_BACKLOG = 120
+FRAME_WAIT_TIMEOUT = 1.0
+INIT_SEGMENT_TIMEOUT = 10.0
+ENCODER_RESTART_DELAY = 1.0
+MAX_ENCODER_RESTART_DELAY = 30.0
+MAX_ENCODER_FAILURES = 5
+
+
+def is_h264_available() -> bool:
+    """
+    Returns whether PyAV is installed, so H.264 feeds can be served.
+    """
+    return av is not None
+
+
+class _Mp4BoxWriter:
+    """A write-only file object that hands the muxer's output over box by box."""
+
+    def __init__(self, on_box: Callable[[bytes, bytes], None]) -> None:
+        """
+        Args:
+            on_box (Callable[[bytes, bytes], None]): Called with the type and data of
+                every complete top level MP4 box.
+        """
+        self.on_box = on_box
+        self.buffer = bytearray()
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= 8:
+            box_size = int.from_bytes(self.buffer[:4], "big")
+            if box_size == 1 and len(self.buffer) >= 16:
+                box_size = int.from_bytes(self.buffer[8:16], "big")
+            if box_size < 8 or len(self.buffer) < box_size:
+                break
+            box = bytes(self.buffer[:box_size])
+            del self.buffer[:box_size]
+            self.on_box(box[4:8], box)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+
+class H264Stream:
+    """Encodes one camera feed to H.264 fragmented MP4 shared by all its clients.
+
+    The encoder thread runs only while clients are connected. Every frame
+    becomes its own fragment for the lowest latency, and a keyframe is forced
+    whenever a client connects, so new clients start playing immediately
+    instead of waiting for the next group of pictures.
+
+    Clients belong to the encoding session they joined: when the encoder
+    stops or fails, their responses end, so the browser starts over with the
+    init segment of the next session.
+    """
+
+    def __init__(
+        self,
+        frame_store: FrameStore,
+        camera_name: str,
+        width: int,
+        log: Callable,
+        bitrate_kbps: int = 1000,
+        keyframe_interval: int = 120,
+    ) -> None:
+        """
+        Args:
+            frame_store (FrameStore): Where the camera's annotated frames are published.
+            camera_name (str): The camera to encode.
+            width (int): The encoded width; the height follows the first frame's aspect.
+            log (Callable): A callable logger function.
+            bitrate_kbps (int): The target bitrate of the encoder.
+            keyframe_interval (int): Frames between keyframes nobody asked for.
+        """
+        self.frame_store = frame_store
+        self.camera_name = camera_name
+        self.width = width
+        self.log = log
+        self.bitrate_kbps = bitrate_kbps
+        self.keyframe_interval = keyframe_interval
+
+        self.condition = threading.Condition()
+        self.client_count = 0
+        self.encoder_thread: threading.Thread | None = None
+        self.session = 0
+        self.fragment_index = 0
+        self.encoder_failures = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Forgets the previous encoding session, so the next one starts a new file.
+
+        The fragment index keeps counting, so it never goes back below the index
+        a client has already seen.
+        """
+        self.init_segment: bytes | None = None
+        self.init_boxes: list[bytes] = []
+        self.pending_moof: bytes | None = None
+        self.packet_keyframes: deque[bool] = deque()
+        self.fragments: deque[tuple[int, bytes, bool]] = deque(maxlen=FRAGMENT_BACKLOG)
+        self.keyframe_requested = True
+
+    def _on_box(self, box_type: bytes, box: bytes) -> None:
+        """
+        Collects the init segment and pairs every moof with its mdat into a fragment.
+        """
+        if box_type in (b"ftyp", b"moov"):
+            self.init_boxes.append(box)
+            if box_type == b"moov":
+                with self.condition:
+                    self.init_segment = b"".join(self.init_boxes)
+                    self.condition.notify_all()
+        elif box_type == b"moof":
+            self.pending_moof = box
+        elif box_type == b"mdat" and self.pending_moof is not None:
+            is_keyframe = (
+                self.packet_keyframes.popleft() if self.packet_keyframes else False
+            )
+            with self.condition:
+                self.encoder_failures = 0
+                self.fragment_index += 1
+                self.fragments.append(
+                    (self.fragment_index, self.pending_moof + box, is_keyframe)
+                )
+                self.condition.notify_all()
+            self.pending_moof = None
+
+    def _open_encoder(self, image: np.ndarray):
+        """
+        Opens the muxer and encoder for a frame size.
+
+        Args:
+            image (np.ndarray): The first frame, used for the aspect ratio.
+
+        Returns:
+            tuple: The output container and its video stream.
+        """
+        height = round(image.shape[0] * self.width / image.shape[1] / 2) * 2
+        container = av.open(
+            _Mp4BoxWriter(self._on_box),
+            mode="w",
+            format="mp4",
+            options={
+                "movflags": "empty_moov+default_base_moof+frag_keyframe",
+                "frag_duration": "1",
+            },
+        )
+        stream = container.add_stream("libx264", rate=30)
+        stream.width = self.width - self.width % 2
+        stream.height = height
+        stream.pix_fmt = "yuv420p"
+        stream.bit_rate = self.bitrate_kbps * 1000
+        stream.codec_context.time_base = Fraction(1, 1000)
+        stream.options = {
+            "preset": "ultrafast",
+            "tune": "zerolatency",
+            "profile": "baseline",
+            "level": "3.1",
+            "g": str(self.keyframe_interval),
+        }
+        return container, stream
+
+    def _encode_frames(self, delay: float = 0.0) -> None:
+        """
+        Encodes every new frame of the camera until the last client leaves.
+
+        Args:
+            delay (float): Seconds to wait before opening the camera, to back off
+                after a failed session.
+        """
+        sleep(delay)
+        self.frame_store.subscribe(self.camera_name)
+        container = None
+        failed = False
+        try:
+            version = 0
+            start_time = time()
+            while True:
+                with self.condition:
+                    if not self.client_count:
+                        return
+                new_frame = self.frame_store.wait_for_frame(
+                    self.camera_name, version, FRAME_WAIT_TIMEOUT
+                )
+                if new_frame is None:
+                    continue
+                version, image = new_frame
+                if container is None:
+                    container, stream = self._open_encoder(image)
+
+                image = cv2.resize(image, (stream.width, stream.height))
+                video_frame = av.VideoFrame.from_ndarray(image, format="bgr24")
+                video_frame.pts = int((time() - start_time) * 1000)
+                video_frame.time_base = Fraction(1, 1000)
+                with self.condition:
+                    if self.keyframe_requested:
+                        video_frame.pict_type = av.video.frame.PictureType.I
+                        self.keyframe_requested = False
+                for packet in stream.encode(video_frame):
+                    self.packet_keyframes.append(packet.is_keyframe)
+                    container.mux(packet)
+        except Exception as e:
+            failed = True
+            self.log(f"H.264 encoder of {self.camera_name} failed: {e}")
+        finally:
+            self.frame_store.unsubscribe(self.camera_name)
+            if container is not None:
+                try:
+                    container.close()
+                except Exception:
+                    pass
+            with self.condition:
+                self.session += 1
+                self._reset()
+                self.encoder_thread = None
+                if failed:
+                    self.encoder_failures += 1
+                if self.client_count and self.encoder_failures < MAX_ENCODER_FAILURES:
+                    # The encoder failed, or a client connected while it stopped.
+                    self._start_encoder()
+                elif self.encoder_failures >= MAX_ENCODER_FAILURES:
+                    self.log(
+                        f"H.264 encoder of {self.camera_name} failed "
+                        f"{self.encoder_failures} times in a row, giving up until "
+                        "the next client connects"
+                    )
+                self.condition.notify_all()
+
+    def _start_encoder(self) -> None:
+        """
+        Starts the encoder thread, backing off after failed sessions; the caller
+        holds the condition.
+        """
+        delay = 0.0
+        if self.encoder_failures:
+            delay = min(
+                ENCODER_RESTART_DELAY * 2 ** (self.encoder_failures - 1),
+                MAX_ENCODER_RESTART_DELAY,
+            )
+        self.encoder_thread = threading.Thread(
+            target=self._encode_frames, args=(delay,), daemon=True
+        )
+        self.encoder_thread.start()
+
+    def stream(self) -> Generator[bytes, None, None]:
+        """
+        Streams the init segment and then every fragment from the next keyframe on.
+
+        A client that falls further behind than the fragment backlog skips ahead
+        to a fresh keyframe. The stream ends when its encoding session ends, or
+        when no init segment arrived within `INIT_SEGMENT_TIMEOUT`. While nothing
+        is encoded, an empty chunk is yielded every `FRAME_WAIT_TIMEOUT`, so the
+        caller regains control and can notice a closed connection.
+
+        Yields:
+            bytes: Fragmented MP4 data, or b"" when nothing new arrived.
+        """
+        with self.condition:
+            self.client_count += 1
+            self.keyframe_requested = True
+            if self.encoder_thread is None:
+                if self.encoder_failures >= MAX_ENCODER_FAILURES:
+                    # A new client gets a new round of attempts.
+                    self.encoder_failures = 0
+                self._start_encoder()
+            last_index = self.fragment_index
+        try:
+            deadline = time() + INIT_SEGMENT_TIMEOUT
+            while True:
+                with self.condition:
+                    if self.init_segment is None:
+                        remaining = deadline - time()
+                        if self.encoder_thread is None or remaining <= 0:
+                            return
+                        self.condition.wait(min(remaining, FRAME_WAIT_TIMEOUT))
+                    init_segment = self.init_segment
+                    session = self.session
+                if init_segment is not None:
+                    break
+                yield b""
+            yield init_segment
+
+            waiting_for_keyframe = True
+            while True:
+                with self.condition:
+                    if self.fragment_index <= last_index and self.session == session:
+                        self.condition.wait(FRAME_WAIT_TIMEOUT)
+                    if self.session != session:
+                        return
+                    fragments = [
+                        fragment
+                        for fragment in self.fragments
+                        if fragment[0] > last_index
+                    ]
+                    if (
+                        fragments
+                        and fragments[0][0] != last_index + 1
+                        and not waiting_for_keyframe
+                    ):
+                        waiting_for_keyframe = True
+                        self.keyframe_requested = True
+                if not fragments:
+                    yield b""
+                    continue
+                last_index = fragments[-1][0]
+                for _, fragment, is_keyframe in fragments:
+                    if waiting_for_keyframe and not is_keyframe:
+                        continue
+                    waiting_for_keyframe = False
+                    yield fragment
+        finally:
+            with self.condition:
+                self.client_count -= 1